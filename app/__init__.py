@@ -4,13 +4,19 @@ from config import config_by_name
 from .extensions import db, migrate, jwt, cors
 from flasgger import Swagger
 from .routes import register_routes
+from .commands import register_commands
+from .services.autocomplete_service import autocomplete_index
+from .services.email_filter_service import email_filter
+from .utils.upsert import check_database_support
 
-def create_app():
+def create_app(config_overrides=None):
     app = Flask(__name__)
 
     # Charger la configuration en fonction de l'environnement
     env = os.getenv("FLASK_ENV", "development")  # Par défaut : développement
     app.config.from_object(config_by_name[env])
+    # Valeurs imposées par l'appelant (tests : base SQLite temporaire)
+    app.config.update(config_overrides or {})
 
     app.config['SWAGGER'] = {
         'title': 'API Documentation',
@@ -19,6 +25,7 @@ def create_app():
     }
     swagger = Swagger(app)
 
+    check_database_support(app)
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
@@ -26,5 +33,11 @@ def create_app():
     cors.init_app(app)
 
     register_routes(app)
+    register_commands(app)
+
+    # Index d'autocomplétion construit au démarrage
+    autocomplete_index.init_app(app)
+    # Filtre de Bloom des emails enregistrés (vérification d'email sans requête)
+    email_filter.init_app(app)
 
     return app
@@ -0,0 +1,131 @@
+import statistics
+import time
+import click
+from app.services.search_service import SearchService
+from app.services.catalog_import_service import CatalogImporter
+from app.services.recommendation_service import RecommendationService
+from app.services.recommendation_evaluation_service import RecommendationEvaluator
+from app.services.user_profile_service import user_profile_service
+from app.services.user_stats_service import user_stats_service
+from app.services.upload_service import upload_service
+from app.utils import recompute_movie_ratings, recompute_movie_like_counts
+
+
+def register_commands(app):
+    @app.cli.command('reindex-search')
+    def reindex_search():
+        """Reconstruit l'index de recherche plein texte des films"""
+        count = SearchService().rebuild_index()
+        click.echo(f"{count} films réindexés")
+
+    @app.cli.command('recompute-ratings')
+    def recompute_ratings():
+        """Recalcule les notes moyennes de tous les films à partir des avis"""
+        count = recompute_movie_ratings()
+        click.echo(f"{count} films recalculés")
+
+    @app.cli.command('recompute-like-counts')
+    def recompute_like_counts():
+        """Recalcule le nombre de likes de tous les films"""
+        count = recompute_movie_like_counts()
+        click.echo(f"{count} films recalculés")
+
+    @app.cli.command('import-catalog')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--format', 'file_format', type=click.Choice(['csv', 'jsonl']), default=None,
+                  help="Format du fichier (déduit de l'extension par défaut)")
+    @click.option('--batch-size', default=1000, show_default=True, help="Films insérés par lot")
+    def import_catalog(path, file_format, batch_size):
+        """Importe un catalogue de films depuis un fichier CSV ou JSONL"""
+        def progress(stats):
+            click.echo(f"{stats['imported']} films importés ({stats['rows_per_second']:.0f} lignes/s)")
+
+        stats = CatalogImporter(batch_size=batch_size).import_file(path, file_format, progress=progress)
+        click.echo(
+            f"Terminé : {stats['imported']} films importés, {stats['skipped']} ignorés "
+            f"en {stats['seconds']:.1f}s ({stats['rows_per_second']:.0f} lignes/s)"
+        )
+
+    @app.cli.command('bench-static')
+    @click.argument('url')
+    @click.option('--requests', 'count', default=50, show_default=True, help="Requêtes par mode")
+    @click.option('--range', 'byte_range', default='bytes=0-1048575', show_default=True,
+                  help="En-tête Range envoyé (vide pour le fichier entier)")
+    def bench_static(url, count, byte_range):
+        """Compare le temps passé dans le worker par requête selon STATIC_OFFLOAD_MODE"""
+        client = app.test_client()
+        headers = {'Range': byte_range} if byte_range else {}
+        previous_mode = app.config.get('STATIC_OFFLOAD_MODE')
+        try:
+            for mode in (None, 'x-sendfile', 'x-accel'):
+                app.config['STATIC_OFFLOAD_MODE'] = mode
+                timings = []
+                for _ in range(count):
+                    started = time.perf_counter()
+                    response = client.get(url, headers=headers)
+                    body = response.get_data()
+                    timings.append((time.perf_counter() - started) * 1000)
+                timings.sort()
+                click.echo(
+                    f"{mode or 'flask':<11} HTTP {response.status_code}  {len(body):>9} octets  "
+                    f"moyenne {statistics.mean(timings):7.2f} ms  "
+                    f"p50 {timings[len(timings) // 2]:7.2f} ms  "
+                    f"p99 {timings[min(len(timings) - 1, int(len(timings) * 0.99))]:7.2f} ms"
+                )
+        finally:
+            app.config['STATIC_OFFLOAD_MODE'] = previous_mode
+
+    @app.cli.command('refresh-neighbors')
+    @click.option('--all', 'all_users', is_flag=True, help="Recalcule tous les utilisateurs, pas seulement les marqués")
+    def refresh_neighbors(all_users):
+        """Recalcule les voisins précalculés des utilisateurs (table user_neighbors)"""
+        count = RecommendationService().refresh_user_neighbors(all_users=all_users)
+        click.echo(f"Voisins recalculés pour {count} utilisateurs")
+
+    @app.cli.command('rebuild-profiles')
+    def rebuild_profiles():
+        """Recalcule tous les profils de préférences (table user_profiles)"""
+        count = user_profile_service.rebuild_all()
+        click.echo(f"{count} profils recalculés")
+
+    @app.cli.command('purge-uploads')
+    def purge_uploads():
+        """Supprime les envois de vidéo abandonnés et les fichiers partiels orphelins"""
+        stats = upload_service.purge_stale()
+        click.echo(f"{stats['uploads']} envois expirés supprimés, {stats['files']} fichiers orphelins supprimés")
+
+    @app.cli.command('recompute-user-stats')
+    def recompute_user_stats():
+        """Recalcule les compteurs de tous les utilisateurs (table user_stats)"""
+        count = user_stats_service.recount_all()
+        click.echo(f"{count} utilisateurs recalculés")
+
+    @app.cli.command('evaluate-recommendations')
+    @click.option('--method', 'methods', multiple=True,
+                  type=click.Choice(sorted(RecommendationService.METHODS)),
+                  help="Méthode à évaluer (répétable ; toutes par défaut)")
+    @click.option('-k', 'k', default=10, show_default=True, help="Nombre de recommandations évaluées")
+    @click.option('--train-ratio', default=0.8, show_default=True, help="Part des événements servant d'historique")
+    @click.option('--min-rating', default=4.0, show_default=True, help="Note minimale d'un film pertinent")
+    @click.option('--max-users', default=None, type=int, help="Limite le nombre d'utilisateurs évalués")
+    def evaluate_recommendations(methods, k, train_ratio, min_rating, max_users):
+        """Compare qualité (precision, recall, NDCG, couverture) et coût des méthodes de recommandation"""
+        evaluator = RecommendationEvaluator(k=k, train_ratio=train_ratio, min_rating=min_rating,
+                                            max_users=max_users)
+        summary = evaluator.evaluate(list(methods) or None)
+        click.echo(
+            f"Coupure {summary['cutoff'] or '-'} : {summary['train_users']} utilisateurs en historique, "
+            f"{summary['evaluated_users']} évalués, {summary['movies']} films"
+        )
+
+        def cell(value, digits=4):
+            return '-' if value is None else f"{value:.{digits}f}"
+
+        for result in summary['results']:
+            click.echo(
+                f"{result['method']:<14} precision@{k} {cell(result[f'precision@{k}'])}  "
+                f"recall@{k} {cell(result[f'recall@{k}'])}  ndcg@{k} {cell(result[f'ndcg@{k}'])}  "
+                f"couverture {cell(result['coverage'])}  "
+                f"p50 {cell(result['latency_p50_ms'], 1)} ms  p99 {cell(result['latency_p99_ms'], 1)} ms  "
+                f"mémoire max {cell(result['peak_memory_mb'], 0)} Mo  erreurs {result['errors']}"
+            )
@@ -10,4 +10,8 @@ from .watchlist import Watchlist
 from .favorite import Favorite
 from .review import Review
 from .role import Role
-from .like import Like
\ No newline at end of file
+from .like import Like
+from .video_upload import VideoUpload
+from .user_neighbor import UserNeighbor, UserNeighborDirty
+from .user_profile import UserProfile
+from .user_stats import UserStats
\ No newline at end of file
@@ -1,16 +1,39 @@
 # Modèle Actor (Acteur)
 # Ce modèle stocke des informations sur les acteurs.
+from sqlalchemy import DDL, event
+from sqlalchemy.orm import validates
 from app.extensions import db
+from app.utils.text import name_key as normalize_name_key
 class Actor(db.Model):
     __tablename__ = 'actors'
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False)
+    name_key = db.Column(db.String(255), nullable=False)  # Nom normalisé pour la recherche et le dédoublonnage
     bio = db.Column(db.Text)  # Biographie de l'acteur
 
     # Relation many-to-many avec Movie
     movies = db.relationship('Movie', secondary='movie_actors', backref=db.backref('actors', lazy=True))
+
+    __table_args__ = (
+        # Non unique : deux personnes peuvent porter le même nom
+        db.Index('ix_actors_name_key', 'name_key'),
+        # Trigrammes (PostgreSQL) : servent la recherche par sous-chaîne (LIKE '%CLE%')
+        db.Index('ix_actors_name_key_trgm', 'name_key', postgresql_using='gin',
+                 postgresql_ops={'name_key': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+    )
+
+    @validates('name')
+    def _update_name_key(self, key, name):
+        self.name_key = normalize_name_key(name)
+        return name
+
+event.listen(
+    Actor.__table__, 'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
 # Table d'association pour la relation many-to-many entre Movie et Actor
 movie_actors = db.Table('movie_actors',
     db.Column('movie_id', db.Integer, db.ForeignKey('movies.id'), primary_key=True),
-    db.Column('actor_id', db.Integer, db.ForeignKey('actors.id'), primary_key=True)
+    db.Column('actor_id', db.Integer, db.ForeignKey('actors.id'), primary_key=True),
+    db.Index('ix_movie_actors_actor_id', 'actor_id')
 )
\ No newline at end of file
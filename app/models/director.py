@@ -1,11 +1,33 @@
 # Modèle Director (Réalisateur)
 # Ce modèle stocke des informations sur les réalisateurs.
+from sqlalchemy import DDL, event
+from sqlalchemy.orm import validates
 from app.extensions import db
+from app.utils.text import name_key as normalize_name_key
 class Director(db.Model):
     __tablename__ = 'directors'
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False)
+    name_key = db.Column(db.String(255), nullable=False)  # Nom normalisé pour la recherche et le dédoublonnage
     bio = db.Column(db.Text)  # Biographie du réalisateur
 
     # Relation one-to-many avec Movie
-    movies = db.relationship('Movie', backref=db.backref('director', lazy=True))
\ No newline at end of file
+    movies = db.relationship('Movie', backref=db.backref('director', lazy=True))
+
+    __table_args__ = (
+        # Non unique : deux personnes peuvent porter le même nom
+        db.Index('ix_directors_name_key', 'name_key'),
+        # Trigrammes (PostgreSQL) : servent la recherche par sous-chaîne (LIKE '%CLE%')
+        db.Index('ix_directors_name_key_trgm', 'name_key', postgresql_using='gin',
+                 postgresql_ops={'name_key': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+    )
+
+    @validates('name')
+    def _update_name_key(self, key, name):
+        self.name_key = normalize_name_key(name)
+        return name
+
+event.listen(
+    Director.__table__, 'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
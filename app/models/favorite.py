@@ -10,4 +10,9 @@ class Favorite(db.Model):
 
     # Relations
     user = db.relationship('User', backref=db.backref('favorites', lazy=True))
-    movie = db.relationship('Movie', backref=db.backref('favorites', lazy=True))
\ No newline at end of file
+    movie = db.relationship('Movie', backref=db.backref('favorites', lazy=True))
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'movie_id', name='unique_user_movie_favorite'),
+        db.Index('ix_favorites_movie_id', 'movie_id'),
+    )
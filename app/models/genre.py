@@ -1,17 +1,32 @@
 # Modèle Genre (Genre de film)
 # Ce modèle représente les genres de films.
+from sqlalchemy.orm import validates
 from app.extensions import db
+from app.utils.text import name_key as normalize_name_key
 class Genre(db.Model):
     __tablename__ = 'genres'
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), unique=True, nullable=False)
+    name_key = db.Column(db.String(100), nullable=False)  # Nom normalisé pour le dédoublonnage
 
     # Relation many-to-many avec Movie
     movies = db.relationship('Movie', secondary='movie_genres', backref=db.backref('genres', lazy=True))
+
+    __table_args__ = (
+        # varchar_pattern_ops : sert aussi les recherches par préfixe (LIKE 'CLE%')
+        db.Index('ix_genres_name_key', 'name_key', unique=True,
+                 postgresql_ops={'name_key': 'varchar_pattern_ops'}),
+    )
+
+    @validates('name')
+    def _update_name_key(self, key, name):
+        self.name_key = normalize_name_key(name)
+        return name
     
 
 # Table d'association pour la relation many-to-many entre Movie et Genre
 movie_genres = db.Table('movie_genres',
     db.Column('movie_id', db.Integer, db.ForeignKey('movies.id'), primary_key=True),
-    db.Column('genre_id', db.Integer, db.ForeignKey('genres.id'), primary_key=True)
+    db.Column('genre_id', db.Integer, db.ForeignKey('genres.id'), primary_key=True),
+    db.Index('ix_movie_genres_genre_id', 'genre_id')
 )
\ No newline at end of file
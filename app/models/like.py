@@ -9,6 +9,7 @@ class Like(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     movie_id = db.Column(db.Integer, db.ForeignKey('movies.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())  # Découpage temporel des évaluations
 
     # Relations
     user = db.relationship('User', backref=db.backref('likes', lazy=True))
@@ -16,4 +17,5 @@ class Like(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint('user_id', 'movie_id', name='unique_user_movie_like'),
+        db.Index('ix_likes_movie_id', 'movie_id'),
     )
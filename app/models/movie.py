@@ -1,17 +1,38 @@
 # Modèle Movie (Film)
 # Ce modèle représente les films dans votre base de données.
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from app.extensions import db
 class Movie(db.Model):
     __tablename__ = 'movies'
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
     release_year = db.Column(db.Integer)
-    rating = db.Column(db.Float)  # Note moyenne du film
+    rating = db.Column(db.Float)  # Note moyenne du film (rating_sum / rating_count, sinon catalog_rating)
+    catalog_rating = db.Column(db.Float)  # Note saisie à la création ou importée avec le catalogue
+    rating_sum = db.Column(db.Float, nullable=False, default=0, server_default='0')  # Somme des notes des avis
+    rating_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Nombre d'avis
+    like_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Nombre de likes
     description = db.Column(db.Text)  # Description du film
     poster_url = db.Column(db.String(500))  # URL de l'affiche du film
     video_file_path = db.Column(db.String(500))  # Chemin du fichier vidéo local
+    # Date de dernière modification (validateur des réponses HTTP conditionnelles) ;
+    # horodatage Python pour garder les microsecondes, y compris sous SQLite
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow,
+                           server_default=db.func.current_timestamp())
+
+    # Vecteur de recherche plein texte (PostgreSQL), chargé uniquement à la demande
+    search_vector = deferred(db.Column(db.Text().with_variant(TSVECTOR(), 'postgresql')))
 
 
     # Relation Many-to-One avec Director (un film a un seul réalisateur)
     director_id = db.Column(db.Integer, db.ForeignKey('directors.id'), nullable=False)
 
+    __table_args__ = (
+        db.Index('ix_movies_search_vector', 'search_vector', postgresql_using='gin'),
+        db.Index('ix_movies_director_id', 'director_id'),
+        db.Index('ix_movies_updated_at', 'updated_at'),
+        db.Index('ix_movies_like_count', 'like_count'),  # Films les plus likés (candidats des recommandations)
+    )
+
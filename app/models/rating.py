@@ -9,6 +9,7 @@ class Rating(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     movie_id = db.Column(db.Integer, db.ForeignKey('movies.id'), nullable=False)
     rating = db.Column(db.Float, nullable=True)  # Note attribuée par l'utilisateur (ex : 4.5)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())  # Découpage temporel des évaluations
 
     # Relations (facultatif mais recommandé)
     user = db.relationship('User', backref=db.backref('ratings', lazy=True))
@@ -16,4 +17,5 @@ class Rating(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint('user_id', 'movie_id', name='unique_user_movie_rating'),
+        db.Index('ix_ratings_movie_id', 'movie_id'),
     )
@@ -12,4 +12,8 @@ class Recommendation(db.Model):
 
     # Relations
     user = db.relationship('User', backref=db.backref('recommendations', lazy=True))
-    movie = db.relationship('Movie', backref=db.backref('recommendations', lazy=True))
\ No newline at end of file
+    movie = db.relationship('Movie', backref=db.backref('recommendations', lazy=True))
+
+    __table_args__ = (
+        db.Index('ix_recommendations_user_id_score', 'user_id', 'score'),
+    )
@@ -12,3 +12,8 @@ class Review(db.Model):
     # Relations
     user = db.relationship('User', backref=db.backref('reviews', lazy=True))
     movie = db.relationship('Movie', backref=db.backref('reviews', lazy=True))
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'movie_id', name='unique_user_movie_review'),
+        db.Index('ix_reviews_movie_id', 'movie_id'),
+    )
@@ -1,3 +1,5 @@
+from datetime import datetime
+from sqlalchemy.orm import validates
 from app.extensions import db
 from werkzeug.security import generate_password_hash, check_password_hash
 
@@ -10,6 +12,16 @@ class User(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(256), nullable=False)
     role_id = db.Column(db.Integer, db.ForeignKey('roles.id'), nullable=False)
+    # Incrémentée à chaque changement de rôle : invalide le rôle porté par les tokens déjà émis
+    role_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Date (UTC) de création ou de changement de l'email : rattrapage du filtre des emails des autres processus
+    email_changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    @validates('email')
+    def _mark_email_change(self, key, email):
+        if email != self.email:
+            self.email_changed_at = datetime.utcnow()
+        return email
 
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
@@ -0,0 +1,24 @@
+# Modèle UserNeighbor (Voisins d'un utilisateur)
+# Utilisateurs les plus similaires de chaque utilisateur, précalculés par le recalcul des recommandations.
+from app.extensions import db
+
+class UserNeighbor(db.Model):
+    __tablename__ = 'user_neighbors'
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    neighbor_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    score = db.Column(db.Float, nullable=False)  # Similarité cosinus entre les deux utilisateurs
+    computed_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+
+    __table_args__ = (
+        db.Index('ix_user_neighbors_user_id_score', 'user_id', 'score'),
+        db.Index('ix_user_neighbors_neighbor_id', 'neighbor_id'),
+    )
+
+
+# Utilisateurs dont les interactions ont changé depuis le dernier calcul des voisins
+class UserNeighborDirty(db.Model):
+    __tablename__ = 'user_neighbors_dirty'
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    marked_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    # Incrémenté à chaque marquage : le recalcul ne retire que les marquages inchangés depuis leur lecture
+    mark_count = db.Column(db.Integer, nullable=False, default=1, server_default='1')
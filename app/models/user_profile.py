@@ -0,0 +1,16 @@
+# Modèle UserProfile (Profil de préférences)
+# Préférences matérialisées d'un utilisateur, mises à jour à chaque note, like ou avis.
+from app.extensions import db
+
+class UserProfile(db.Model):
+    __tablename__ = 'user_profiles'
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    genre_weights = db.Column(db.JSON, nullable=False, default=dict)  # {genre: poids}
+    director_weights = db.Column(db.JSON, nullable=False, default=dict)  # {réalisateur: poids}
+    keyword_counts = db.Column(db.JSON, nullable=False, default=dict)  # {mot: occurrences}
+    movie_scores = db.Column(db.JSON, nullable=False, default=dict)  # {movie_id: score d'interaction}
+    # {movie_id: {'genres', 'director', 'keywords'}} ajoutés au profil par chaque film apprécié,
+    # retirés tels quels à la mise à jour suivante (NULL : profil antérieur, recalculé à la prochaine écriture)
+    movie_contributions = db.Column(db.JSON, default=dict)
+    interaction_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp())
@@ -0,0 +1,12 @@
+# Modèle UserStats (Compteurs d'un utilisateur)
+# Compteurs d'interactions tenus à jour dans la transaction de chaque note, like ou avis.
+from app.extensions import db
+
+class UserStats(db.Model):
+    __tablename__ = 'user_stats'
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    rating_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_sum = db.Column(db.Float, nullable=False, default=0, server_default='0')  # Somme des notes renseignées
+    like_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    review_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp())
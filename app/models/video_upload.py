@@ -0,0 +1,23 @@
+# Modèle VideoUpload (Envoi de vidéo)
+# Ce modèle suit l'état d'un envoi de vidéo par morceaux (reprise possible).
+from app.extensions import db
+
+class VideoUpload(db.Model):
+    __tablename__ = 'video_uploads'
+
+    id = db.Column(db.String(32), primary_key=True)  # Identifiant opaque (uuid hex)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    movie_id = db.Column(db.Integer, db.ForeignKey('movies.id'), nullable=True)  # Film à lier à la fin de l'envoi
+    filename = db.Column(db.String(255), nullable=False)  # Nom de fichier sécurisé
+    total_size = db.Column(db.BigInteger, nullable=False)  # Taille annoncée en octets
+    received_size = db.Column(db.BigInteger, nullable=False, default=0)  # Octets déjà écrits
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, completed
+    sha256 = db.Column(db.String(64))  # Empreinte du contenu, calculée au fil de l'envoi
+    claim_token = db.Column(db.String(32))  # Morceau ou finalisation en cours (réservation jusqu'à expiration)
+    video_path = db.Column(db.String(500))  # URL finale de la vidéo
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
+
+    # Relations
+    user = db.relationship('User', backref=db.backref('video_uploads', lazy=True))
+    movie = db.relationship('Movie', backref=db.backref('video_uploads', lazy=True))
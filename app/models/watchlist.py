@@ -10,4 +10,9 @@ class Watchlist(db.Model):
 
     # Relations
     user = db.relationship('User', backref=db.backref('watchlists', lazy=True))
-    movie = db.relationship('Movie', backref=db.backref('watchlists', lazy=True))
\ No newline at end of file
+    movie = db.relationship('Movie', backref=db.backref('watchlists', lazy=True))
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'movie_id', name='unique_user_movie_watchlist'),
+        db.Index('ix_watchlists_movie_id', 'movie_id'),
+    )
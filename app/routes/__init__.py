@@ -12,6 +12,9 @@ from .role import role_bp
 from .accesstatic import access_bp
 from .like import like_bp
 from .review import review_bp
+from .interaction import interaction_bp
+from .upload import upload_bp
+from .me import me_bp
 # Création d'un blueprint principal
 main_bp = Blueprint('main', __name__)
 
@@ -28,3 +31,6 @@ def register_routes(app):
     app.register_blueprint(access_bp)
     app.register_blueprint(like_bp)
     app.register_blueprint(review_bp)
+    app.register_blueprint(interaction_bp)
+    app.register_blueprint(upload_bp)
+    app.register_blueprint(me_bp)
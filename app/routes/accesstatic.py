@@ -1,20 +1,73 @@
-from flask import Flask, send_from_directory
+from flask import Flask, send_from_directory, current_app, abort
 from flask import Blueprint, request, jsonify
+from werkzeug.security import safe_join
+import mimetypes
 import os
+import re
+from app.services.poster_service import poster_service
 
 access_bp = Blueprint('access_movie', __name__, url_prefix='/')
 
+# Fichiers nommés avec un préfixe aléatoire ou une empreinte : leur contenu ne change jamais
+IMMUTABLE_NAME = re.compile(r'^[0-9a-f]{12,16}_')
+
+
+def send_static_asset(folder_name, filename, folder=None):
+    """
+    Sert un fichier de `folder` (par défaut static/<folder_name>) :
+    - ETag fort et Last-Modified, réponses 304 sur requête conditionnelle ;
+    - requêtes Range (206) pour la lecture et le déplacement dans les vidéos ;
+    - Cache-Control long et `immutable` pour les fichiers à nom unique ;
+    - en mode déporté (STATIC_OFFLOAD_MODE), seuls les en-têtes sont produits et
+      le proxy frontal (X-Sendfile ou X-Accel-Redirect) envoie les octets.
+    """
+    folder = os.path.abspath(folder or os.path.join('static', folder_name))
+    immutable = bool(IMMUTABLE_NAME.match(os.path.basename(filename)))
+    max_age = current_app.config['STATIC_IMMUTABLE_MAX_AGE'] if immutable \
+        else current_app.config['STATIC_DEFAULT_MAX_AGE']
+    mode = current_app.config.get('STATIC_OFFLOAD_MODE')
+
+    if not mode:
+        response = send_from_directory(folder, filename, max_age=max_age, conditional=True, etag=True)
+    else:
+        path = safe_join(folder, filename)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+
+        stat = os.stat(path)
+        response = current_app.response_class(
+            mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        )
+        if mode == 'x-accel':
+            prefix = current_app.config['STATIC_ACCEL_PREFIX'].rstrip('/')
+            response.headers['X-Accel-Redirect'] = f'{prefix}/{folder_name}/{filename}'
+        else:
+            response.headers['X-Sendfile'] = path
+        response.set_etag(f'{stat.st_mtime_ns:x}-{stat.st_size:x}')
+        response.last_modified = stat.st_mtime
+        response.cache_control.max_age = max_age
+        response.cache_control.public = True
+        # Le proxy gère lui-même les plages ; ici seulement If-None-Match / If-Modified-Since
+        response = response.make_conditional(request)
+
+    response.cache_control.public = True
+    # Annoncé aussi sur les réponses complètes : le lecteur sait qu'il peut se déplacer
+    response.accept_ranges = 'bytes'
+    if immutable:
+        response.cache_control.immutable = True
+    return response
+
 # Route pour servir les images (posters)
 @access_bp.route('/static/posters/<path:filename>')
 def serve_posters(filename):
-    # Spécifier le chemin absolu vers le dossier static/posters
-    posters_folder = os.path.join(os.getcwd(), 'static', 'posters')
-    return send_from_directory(posters_folder, filename)
+    # ?w=<largeur> : variante redimensionnée la plus proche (créée à la demande)
+    width = request.args.get('w', type=int)
+    if width and width > 0:
+        filename = poster_service.variant_for(filename, width) or filename
+    return send_static_asset('posters', filename)
 
 # Route pour servir les vidéos
 @access_bp.route('/static/videos/<path:filename>')
 def serve_videos(filename):
-    # Spécifier le chemin absolu vers le dossier static/videos
-    videos_folder = os.path.join(os.getcwd(), 'static', 'videos')
-    return send_from_directory(videos_folder, filename)
-
+    # Dossier configurable : celui où les envois par morceaux enregistrent les vidéos
+    return send_static_asset('videos', filename, current_app.config['VIDEO_UPLOAD_FOLDER'])
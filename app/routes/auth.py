@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from app.extensions import db
 from app.models.user import User
+from app.utils.security import role_claims, role_required
+from app.services.email_filter_service import email_filter
+from sqlalchemy.exc import IntegrityError
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from werkzeug.security import generate_password_hash, check_password_hash
 from typing import Dict, Tuple, Union, Optional
@@ -40,7 +43,7 @@ def check_email() -> Tuple[Dict[str, Union[bool, str]], int]:
     if not email:
         return jsonify({"error": "Paramètre email requis"}), 400
     
-    user_exists = User.query.filter_by(email=email).first() is not None
+    user_exists = email_filter.email_taken(email)
     
     if user_exists:
         return jsonify({
@@ -104,7 +107,7 @@ def register() -> Tuple[Dict[str, Union[str, int]], int]:
     if not username or not email or not password:
         return jsonify({"error": "Tous les champs sont requis"}), 400
 
-    if User.query.filter_by(email=email).first():
+    if email_filter.email_taken(email):
         return jsonify({"error": "Cet email est déjà utilisé"}), 400
 
     user = User(username=username, email=email)
@@ -112,7 +115,13 @@ def register() -> Tuple[Dict[str, Union[str, int]], int]:
     user.role_id = 1
 
     db.session.add(user)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Inscription concurrente (ou nom d'utilisateur déjà pris) : contrainte d'unicité
+        db.session.rollback()
+        return jsonify({"error": "Cet email ou ce nom d'utilisateur est déjà utilisé"}), 400
+    email_filter.add(email)
 
     return jsonify({"message": "Utilisateur créé avec succès", "id": user.id}), 201
 
@@ -172,7 +181,8 @@ def login() -> Tuple[Dict[str, Union[str, int]], int]:
     if not user or not user.check_password(password):
         return jsonify({"error": "Identifiants invalides"}), 401
 
-    access_token = create_access_token(identity=str(user.id))
+    # Le rôle voyage dans le token : les routes protégées n'ont pas à relire l'utilisateur
+    access_token = create_access_token(identity=str(user.id), additional_claims=role_claims(user))
     return jsonify({"message": "Connexion réussie", "token": access_token, "id": user.id, "role_id":user.role_id}), 200
 
 @auth_bp.route('/protected', methods=['GET'])
@@ -251,7 +261,7 @@ def update_profile() -> Tuple[Dict[str, str], int]:
     new_email = data.get('email', user.email)
     new_password = data.get('password')
 
-    if new_email != user.email and User.query.filter_by(email=new_email).first():
+    if new_email != user.email and email_filter.email_taken(new_email):
         return jsonify({"error": "Cet email est déjà utilisé"}), 400
 
     user.username = new_username
@@ -260,7 +270,12 @@ def update_profile() -> Tuple[Dict[str, str], int]:
     if new_password:
         user.set_password(new_password)
 
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"error": "Cet email ou ce nom d'utilisateur est déjà utilisé"}), 400
+    email_filter.add(new_email)
 
     return jsonify({"message": "Profil mis à jour avec succès"}), 200
 
@@ -321,4 +336,33 @@ def get_current_user() -> Tuple[Dict[str, Union[str, int]], int]:
         "username": user.username,
         "email": user.email,
         "role_id": user.role_id
-    }), 200
\ No newline at end of file
+    }), 200
+
+@auth_bp.route('/email-filter/stats', methods=['GET'])
+@role_required('admin')
+def email_filter_stats() -> Tuple[Dict[str, Union[bool, int, float, None]], int]:
+    """
+    Statistiques du filtre de Bloom des emails (admin seulement)
+    ---
+    tags:
+      - Authentification
+    security:
+      - JWT: []
+    responses:
+      200:
+        description: Taille, mémoire et taux de faux positifs (attendu et observé)
+        schema:
+          type: object
+          properties:
+            emails:
+              type: integer
+            memory_bytes:
+              type: integer
+            expected_false_positive_rate:
+              type: number
+            observed_false_positive_rate:
+              type: number
+      403:
+        description: Accès refusé (non admin)
+    """
+    return jsonify(email_filter.stats()), 200
@@ -1,8 +1,13 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.exc import IntegrityError
 from app.extensions import db
 from app.models.favorite import Favorite
 from app.models.user import User
 from app.models.movie import Movie
+from app.services.movie_list_service import favorite_service
+from app.utils.helpers import parse_movie_ids
+from app.utils.upsert import insert_on_conflict
 
 favorite_bp = Blueprint('favorite', __name__, url_prefix='/favorites')
 
@@ -14,9 +19,53 @@ def get_all_favorites():
 
 @favorite_bp.route('/<int:user_id>', methods=['GET'])
 def get_user_favorites(user_id):
-    """Récupérer les favoris d’un utilisateur spécifique"""
-    favorites = Favorite.query.filter_by(user_id=user_id).all()
-    return jsonify([{"id": f.id, "movie_id": f.movie_id} for f in favorites])
+    """Récupérer les favoris d’un utilisateur spécifique (paginés, avec les films)"""
+    page = request.args.get('page', 1, type=int)
+    per_page = min(
+        request.args.get('per_page', current_app.config['USER_LISTS_DEFAULT_PER_PAGE'], type=int),
+        current_app.config['USER_LISTS_MAX_PER_PAGE']
+    )
+
+    items, pagination = favorite_service.page(user_id, page, per_page)
+    return jsonify({"favorites": items, "pagination": pagination})
+
+@favorite_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def bulk_add_favorites():
+    """Ajouter plusieurs films à ses favoris ({"movie_ids": [...]}) en une transaction"""
+    user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+    try:
+        movie_ids = parse_movie_ids(data.get('movie_ids') if isinstance(data, dict) else None,
+                                    current_app.config['MOVIE_IDS_MAX_PER_REQUEST'])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        added, existing, unknown = favorite_service.add(user_id, movie_ids)
+        db.session.commit()
+    except IntegrityError:
+        # Film supprimé pendant l'ajout (les doublons sont ignorés par ON CONFLICT) : le lot peut être renvoyé
+        db.session.rollback()
+        return jsonify({"error": "Favoris modifiés pendant l'ajout, réessayez"}), 409
+
+    return jsonify({"added": added, "already_present": existing, "unknown": unknown})
+
+@favorite_bp.route('/bulk', methods=['DELETE'])
+@jwt_required()
+def bulk_remove_favorites():
+    """Retirer plusieurs films de ses favoris ({"movie_ids": [...]}) en une transaction"""
+    user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+    try:
+        movie_ids = parse_movie_ids(data.get('movie_ids') if isinstance(data, dict) else None,
+                                    current_app.config['MOVIE_IDS_MAX_PER_REQUEST'])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    removed, missing = favorite_service.remove(user_id, movie_ids)
+    db.session.commit()
+    return jsonify({"removed": removed, "not_present": missing})
 
 @favorite_bp.route('/', methods=['POST'])
 def add_favorite():
@@ -28,8 +77,15 @@ def add_favorite():
     if not user_id or not movie_id:
         return jsonify({"error": "user_id et movie_id sont requis"}), 400
 
-    favorite = Favorite(user_id=user_id, movie_id=movie_id)
-    db.session.add(favorite)
+    created = db.session.execute(insert_on_conflict(
+        Favorite,
+        {"user_id": user_id, "movie_id": movie_id},
+        index_elements=['user_id', 'movie_id']
+    ).returning(Favorite.__table__.c.id)).first()
+    if not created:
+        db.session.rollback()
+        return jsonify({"error": "Film déjà dans les favoris"}), 400
+
     db.session.commit()
     
     return jsonify({"message": "Favori ajouté avec succès"}), 201
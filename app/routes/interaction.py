@@ -0,0 +1,200 @@
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.extensions import db
+from app.models.like import Like
+from app.models.movie import Movie
+from app.models.watchlist import Watchlist
+from app.utils import save_ratings, touch_movies, update_movie_likes
+from app.services.interaction_events import interactions_recorded
+from app.utils.upsert import insert_on_conflict
+from typing import Any, Dict, List, Tuple, Union
+
+interaction_bp = Blueprint('interaction', __name__, url_prefix='/interactions')
+
+INTERACTION_TYPES = ('rating', 'like', 'watchlist')
+
+
+def _validate_item(item: Any) -> Union[Tuple[str, int, Any], str]:
+    """Retourne (type, movie_id, note) ou un message d'erreur"""
+    if not isinstance(item, dict):
+        return "Élément invalide"
+
+    interaction_type = item.get('type')
+    if interaction_type not in INTERACTION_TYPES:
+        return f"Type inconnu (attendu : {', '.join(INTERACTION_TYPES)})"
+
+    movie_id = item.get('movie_id')
+    if not isinstance(movie_id, int) or isinstance(movie_id, bool):
+        return "movie_id entier requis"
+
+    rating = None
+    if interaction_type == 'rating':
+        try:
+            rating = float(item.get('rating'))
+            if not (0 <= rating <= 5):
+                raise ValueError()
+        except (TypeError, ValueError):
+            return "La note doit être un nombre entre 0 et 5"
+
+    return interaction_type, movie_id, rating
+
+
+@interaction_bp.route('/batch', methods=['POST'])
+@jwt_required()
+def batch_interactions() -> Union[Dict[str, Any], Tuple[Dict[str, str], int]]:
+    """
+    Enregistre un lot d'interactions (notes, likes, ajouts à la watchlist) en une transaction
+    ---
+    tags:
+      - Interactions
+    security:
+      - JWT: []
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          required:
+            - interactions
+          properties:
+            interactions:
+              type: array
+              items:
+                type: object
+                required:
+                  - type
+                  - movie_id
+                properties:
+                  type:
+                    type: string
+                    enum: [rating, like, watchlist]
+                  movie_id:
+                    type: integer
+                  rating:
+                    type: number
+                    description: Note entre 0 et 5 (type rating uniquement)
+    responses:
+      200:
+        description: Statut de chaque élément, dans l'ordre d'envoi
+        schema:
+          type: object
+          properties:
+            results:
+              type: array
+              items:
+                type: object
+                properties:
+                  index:
+                    type: integer
+                  type:
+                    type: string
+                  movie_id:
+                    type: integer
+                  status:
+                    type: string
+                    enum: [saved, created, exists, error]
+                  error:
+                    type: string
+            applied:
+              type: integer
+            errors:
+              type: integer
+      400:
+        description: Lot manquant ou trop volumineux
+      500:
+        description: Erreur lors de l'enregistrement
+    """
+    user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+    items = data.get('interactions') if isinstance(data, dict) else None
+
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "Liste d'interactions requise"}), 400
+
+    max_size = current_app.config['INTERACTIONS_BATCH_MAX_SIZE']
+    if len(items) > max_size:
+        return jsonify({"error": f"Lot limité à {max_size} interactions"}), 400
+
+    # Validation en une passe, puis une seule requête pour vérifier les films
+    results: List[Dict[str, Any]] = []
+    valid = []
+    for index, item in enumerate(items):
+        parsed = _validate_item(item)
+        if isinstance(parsed, str):
+            results.append({"index": index, "status": "error", "error": parsed})
+            continue
+        interaction_type, movie_id, rating = parsed
+        results.append({"index": index, "type": interaction_type, "movie_id": movie_id})
+        valid.append((index, interaction_type, movie_id, rating))
+
+    movie_ids = {movie_id for _, _, movie_id, _ in valid}
+    existing_movies = {
+        movie_id for (movie_id,) in
+        db.session.query(Movie.id).filter(Movie.id.in_(movie_ids))
+    } if movie_ids else set()
+
+    ratings = {}
+    likes = set()
+    watchlist = set()
+    for index, interaction_type, movie_id, rating in valid:
+        if movie_id not in existing_movies:
+            results[index].update(status="error", error="Film introuvable")
+        elif interaction_type == 'rating':
+            ratings[movie_id] = rating  # la dernière note du lot l'emporte
+        elif interaction_type == 'like':
+            likes.add(movie_id)
+        else:
+            watchlist.add(movie_id)
+
+    try:
+        created_ratings, rating_sum = save_ratings(user_id, ratings) if ratings else (0, 0.0)
+
+        created_likes = set()
+        if likes:
+            created_likes = set(db.session.execute(insert_on_conflict(
+                Like,
+                [{"user_id": user_id, "movie_id": movie_id} for movie_id in likes],
+                index_elements=['user_id', 'movie_id']
+            ).returning(Like.__table__.c.movie_id)).scalars())
+
+        created_watchlist = set()
+        if watchlist:
+            created_watchlist = set(db.session.execute(insert_on_conflict(
+                Watchlist,
+                [{"user_id": user_id, "movie_id": movie_id} for movie_id in watchlist],
+                index_elements=['user_id', 'movie_id']
+            ).returning(Watchlist.__table__.c.movie_id)).scalars())
+
+        update_movie_likes(created_likes, 1)
+        # Notes et likes figurent dans les réponses mises en cache (films populaires)
+        touch_movies(set(ratings) | created_likes)
+        if ratings or created_likes:
+            interactions_recorded(
+                user_id, set(ratings) | created_likes,
+                rating_count=created_ratings, rating_sum=rating_sum, like_count=len(created_likes)
+            )
+        db.session.commit()
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Erreur lors de l'enregistrement: {str(e)}"}), 500
+
+    # Les doublons d'un même lot reçoivent le statut de l'élément appliqué
+    for result in results:
+        if result.get('status') == 'error':
+            continue
+        movie_id = result['movie_id']
+        if result['type'] == 'rating':
+            result['status'] = 'saved'
+        elif result['type'] == 'like':
+            result['status'] = 'created' if movie_id in created_likes else 'exists'
+        else:
+            result['status'] = 'created' if movie_id in created_watchlist else 'exists'
+
+    errors = sum(1 for result in results if result['status'] == 'error')
+    return jsonify({
+        "results": results,
+        "applied": len(results) - errors,
+        "errors": errors
+    })
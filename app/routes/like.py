@@ -1,9 +1,14 @@
 # app/routes/like.py
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
 from app.models.like import Like
+from app.models.movie import Movie
+from app.utils import touch_movies, update_movie_likes
+from app.utils.helpers import parse_movie_ids
+from app.services.interaction_events import interactions_recorded
+from app.utils.upsert import insert_on_conflict
 
 like_bp = Blueprint('like', __name__, url_prefix='/likes')
 
@@ -11,12 +16,19 @@ like_bp = Blueprint('like', __name__, url_prefix='/likes')
 @jwt_required()
 def like_movie(movie_id):
     user_id = get_jwt_identity()
-    existing = Like.query.filter_by(user_id=user_id, movie_id=movie_id).first()
-    if existing:
+    created = db.session.execute(insert_on_conflict(
+        Like,
+        {"user_id": int(user_id), "movie_id": movie_id},
+        index_elements=['user_id', 'movie_id']
+    ).returning(Like.__table__.c.id)).first()
+    if not created:
+        db.session.rollback()
         return jsonify({"message": "Déjà liké"}), 400
 
-    new_like = Like(user_id=user_id, movie_id=movie_id)
-    db.session.add(new_like)
+    # Compteur incrémenté seulement si le like vient d'être inséré
+    update_movie_likes([movie_id], 1)
+    touch_movies([movie_id])
+    interactions_recorded(int(user_id), [movie_id], like_count=1)
     db.session.commit()
     return jsonify({"message": "Film liké"}), 201
 
@@ -24,11 +36,17 @@ def like_movie(movie_id):
 @jwt_required()
 def unlike_movie(movie_id):
     user_id = get_jwt_identity()
-    like = Like.query.filter_by(user_id=user_id, movie_id=movie_id).first()
-    if not like:
+    # DELETE direct : deux suppressions concurrentes ne décrémentent le compteur qu'une fois
+    deleted = db.session.execute(
+        db.delete(Like).where(Like.user_id == int(user_id), Like.movie_id == movie_id)
+    ).rowcount
+    if not deleted:
+        db.session.rollback()
         return jsonify({"message": "Pas encore liké"}), 404
 
-    db.session.delete(like)
+    update_movie_likes([movie_id], -1)
+    touch_movies([movie_id])
+    interactions_recorded(int(user_id), [movie_id], like_count=-1)
     db.session.commit()
     return jsonify({"message": "Like supprimé"})
 
@@ -42,5 +60,19 @@ def check_like(movie_id):
 @like_bp.route('/<int:movie_id>/count', methods=['GET'])
 @jwt_required()
 def like_count(movie_id):
-    count = Like.query.filter_by(movie_id=movie_id).count()
-    return jsonify({"like_count": count})
\ No newline at end of file
+    count = db.session.query(Movie.like_count).filter(Movie.id == movie_id).scalar()
+    return jsonify({"like_count": count or 0})
+
+@like_bp.route('/counts', methods=['GET'])
+@jwt_required()
+def like_counts():
+    """Nombre de likes de plusieurs films (?movie_ids=1,2,3) en une requête"""
+    try:
+        movie_ids = parse_movie_ids(request.args.get('movie_ids'),
+                                    current_app.config['MOVIE_IDS_MAX_PER_REQUEST'])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    counts = dict(db.session.query(Movie.id, Movie.like_count).filter(Movie.id.in_(movie_ids)))
+    # Films inconnus absents de la réponse
+    return jsonify({"like_counts": {str(movie_id): counts[movie_id] for movie_id in movie_ids if movie_id in counts}})
\ No newline at end of file
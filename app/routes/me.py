@@ -0,0 +1,51 @@
+# app/routes/me.py
+
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.extensions import db
+from app.models.like import Like
+from app.models.watchlist import Watchlist
+from app.models.favorite import Favorite
+from app.models.rating import Rating
+from app.utils.helpers import parse_movie_ids
+
+me_bp = Blueprint('me', __name__, url_prefix='/me')
+
+@me_bp.route('/status', methods=['GET'])
+@jwt_required()
+def movie_statuses():
+    """
+    Like, watchlist, favori et note de l'utilisateur pour une page de films
+    (?movie_ids=1,2,3) : quatre requêtes sur les index (user_id, movie_id),
+    quel que soit le nombre de films.
+    """
+    user_id = int(get_jwt_identity())
+    try:
+        movie_ids = parse_movie_ids(request.args.get('movie_ids'),
+                                    current_app.config['MOVIE_IDS_MAX_PER_REQUEST'])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    def movies_of(model):
+        return {
+            movie_id for (movie_id,) in db.session.query(model.movie_id)
+            .filter(model.user_id == user_id, model.movie_id.in_(movie_ids))
+        }
+
+    liked = movies_of(Like)
+    in_watchlist = movies_of(Watchlist)
+    favorited = movies_of(Favorite)
+    ratings = dict(
+        db.session.query(Rating.movie_id, Rating.rating)
+        .filter(Rating.user_id == user_id, Rating.movie_id.in_(movie_ids))
+    )
+
+    return jsonify({"statuses": {
+        str(movie_id): {
+            "liked": movie_id in liked,
+            "in_watchlist": movie_id in in_watchlist,
+            "favorited": movie_id in favorited,
+            "rating": ratings.get(movie_id)
+        }
+        for movie_id in movie_ids
+    }})
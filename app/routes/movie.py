@@ -1,14 +1,23 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from app.extensions import db
 from app.models.actor import Actor
 from app.models.director import Director
 from app.models.genre import Genre
 from app.models.movie import Movie
+from app.services.search_service import SearchService
+from app.services.autocomplete_service import autocomplete_index
+from app.utils.helpers import serialize_movie
+from app.utils.http_cache import conditional_get, movie_version, catalog_version
+from app.utils.text import name_key
+from app.services.upload_service import unique_filename
+from app.services.poster_service import poster_service
 from typing import List, Dict, Any, Tuple, Union, Optional
 
 movie_bp = Blueprint('movie', __name__, url_prefix='/movies')
+search_service = SearchService()
 
 @movie_bp.route('/search', methods=['GET'])
+@conditional_get(catalog_version)
 def search_movies() -> Union[Dict[str, Any], Tuple[Dict[str, str], int]]:
     """
     Recherche des films selon différents critères
@@ -19,7 +28,7 @@ def search_movies() -> Union[Dict[str, Any], Tuple[Dict[str, str], int]]:
       - name: q
         in: query
         type: string
-        description: Terme de recherche (titre ou description)
+        description: Terme de recherche plein texte (titre, description, réalisateur, acteurs, genres)
       - name: genre
         in: query
         type: string
@@ -27,96 +36,153 @@ def search_movies() -> Union[Dict[str, Any], Tuple[Dict[str, str], int]]:
       - name: director
         in: query
         type: string
-        description: Nom du réalisateur à filtrer
+        description: Réalisateur à filtrer (début du nom, sans tenir compte des accents, espaces et majuscules)
       - name: actor
         in: query
         type: string
-        description: Nom de l'acteur à filtrer
+        description: Acteur à filtrer (début du nom, sans tenir compte des accents, espaces et majuscules)
+      - name: page
+        in: query
+        type: integer
+        default: 1
+        description: Numéro de page
+      - name: per_page
+        in: query
+        type: integer
+        default: 20
+        description: Nombre de films par page
     responses:
       200:
-        description: Liste des films correspondants
+        description: Liste paginée des films correspondants, triés par pertinence
         schema:
-          type: array
-          items:
-            type: object
-            properties:
-              id:
-                type: integer
-              title:
-                type: string
-              poster_url:
-                type: string
-              video_path:
-                type: string
-              release_year:
-                type: integer
-              rating:
-                type: number
-              director:
-                type: string
-              genres:
-                type: array
-                items:
-                  type: string
-              actors:
-                type: array
-                items:
-                  type: string
+          type: object
+          properties:
+            movies:
+              type: array
+              items:
+                type: object
+                properties:
+                  id:
+                    type: integer
+                  title:
+                    type: string
+                  poster_url:
+                    type: string
+                  video_path:
+                    type: string
+                  release_year:
+                    type: integer
+                  rating:
+                    type: number
+                  director:
+                    type: string
+                  genres:
+                    type: array
+                    items:
+                      type: string
+                  actors:
+                    type: array
+                    items:
+                      type: string
+            pagination:
+              type: object
+              properties:
+                total:
+                  type: integer
+                pages:
+                  type: integer
+                current_page:
+                  type: integer
+                per_page:
+                  type: integer
       500:
         description: Erreur serveur
     """
     try:
-        query = request.args.get('q', '').strip().lower()
-        genre = request.args.get('genre', '').strip().lower()
-        director = request.args.get('director', '').strip().lower()
-        actor = request.args.get('actor', '').strip().lower()
-        
-        movies_query = Movie.query
-        
-        if query:
-            movies_query = movies_query.filter(
-                db.or_(
-                    Movie.title.ilike(f'%{query}%'),
-                    Movie.description.ilike(f'%{query}%')
-                )
-            )
-        
-        if genre:
-            movies_query = movies_query.join(Movie.genres).filter(
-                db.func.lower(Genre.name).ilike(f'%{genre}%')
-            )
-        
-        if director:
-            movies_query = movies_query.join(Movie.director).filter(
-                db.func.lower(Director.name).ilike(f'%{director}%')
-            )
-        
-        if actor:
-            movies_query = movies_query.join(Movie.actors).filter(
-                db.func.lower(Actor.name).ilike(f'%{actor}%')
-            )
-        
-        movies = movies_query.distinct().all()
-        
-        results = []
-        for movie in movies:
-            results.append({
-                "id": movie.id,
-                "title": movie.title,
-                "poster_url": movie.poster_url,
-                "video_path": movie.video_file_path,
-                "release_year": movie.release_year,
-                "rating": movie.rating,
-                "director": movie.director.name if movie.director else None,
-                "genres": [genre.name for genre in movie.genres],
-                "actors": [actor.name for actor in movie.actors]
-            })
+        query = request.args.get('q', '').strip()
+        genre = request.args.get('genre', '').strip()
+        director = request.args.get('director', '').strip()
+        actor = request.args.get('actor', '').strip()
+
+        page = request.args.get('page', 1, type=int)
+        per_page = min(
+            request.args.get('per_page', current_app.config['SEARCH_DEFAULT_PER_PAGE'], type=int),
+            current_app.config['SEARCH_MAX_PER_PAGE']
+        )
+
+        paginated_movies = search_service.search(
+            query, genre=genre, director=director, actor=actor,
+            page=page, per_page=per_page
+        )
         
-        return jsonify(results)
+        return jsonify({
+            'movies': [serialize_movie(movie, with_actors=True) for movie in paginated_movies.items],
+            'pagination': {
+                'total': paginated_movies.total,
+                'pages': paginated_movies.pages,
+                'current_page': paginated_movies.page,
+                'per_page': paginated_movies.per_page
+            }
+        })
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@movie_bp.route('/autocomplete', methods=['GET'])
+def autocomplete() -> Union[Dict[str, Any], Tuple[Dict[str, str], int]]:
+    """
+    Suggestions instantanées (titres, acteurs, réalisateurs) pour la barre de recherche
+    ---
+    tags:
+      - Films
+    parameters:
+      - name: q
+        in: query
+        type: string
+        required: true
+        description: Début du texte saisi (insensible à la casse et aux accents)
+      - name: limit
+        in: query
+        type: integer
+        default: 8
+        description: Nombre maximum de suggestions
+      - name: types
+        in: query
+        type: string
+        description: Types à inclure, séparés par des virgules (movie, actor, director)
+    responses:
+      200:
+        description: Suggestions triées par pertinence
+        schema:
+          type: object
+          properties:
+            suggestions:
+              type: array
+              items:
+                type: object
+                properties:
+                  type:
+                    type: string
+                  id:
+                    type: integer
+                  label:
+                    type: string
+      400:
+        description: Paramètre q manquant
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"error": "Paramètre q requis"}), 400
+
+    limit = min(
+        request.args.get('limit', current_app.config['AUTOCOMPLETE_DEFAULT_LIMIT'], type=int),
+        current_app.config['AUTOCOMPLETE_MAX_LIMIT']
+    )
+    types = request.args.get('types')
+    kinds = {t.strip() for t in types.split(',') if t.strip()} if types else None
+
+    return jsonify({"suggestions": autocomplete_index.suggest(query, limit=limit, kinds=kinds)})
+
 @movie_bp.route('/', methods=['GET'])
 def get_all_movies() -> List[Dict[str, Union[int, str, None]]]:
     """
@@ -153,6 +219,7 @@ def get_all_movies() -> List[Dict[str, Union[int, str, None]]]:
     } for m in movies])
 
 @movie_bp.route('/<int:id>', methods=['GET'])
+@conditional_get(lambda id: movie_version(id))
 def get_movie(id: int) -> Union[Dict[str, Union[int, str, None]], Tuple[Dict[str, str], int]]:
     """
     Récupère un film spécifique
@@ -245,7 +312,10 @@ def create_movie() -> Tuple[Dict[str, Union[str, int]], int]:
 
     movie = Movie(title=title, genre_id=genre_id, director_id=director_id)
     db.session.add(movie)
+    db.session.flush()
+    search_service.index_movie(movie)
     db.session.commit()
+    autocomplete_index.index_movie(movie)
     
     return jsonify({"message": "Film ajouté avec succès", "id": movie.id}), 201
 
@@ -292,7 +362,12 @@ def update_movie(id: int) -> Union[Dict[str, str], Tuple[Dict[str, str], int]]:
     movie.genre_id = data.get('genre_id', movie.genre_id)
     movie.director_id = data.get('director_id', movie.director_id)
 
+    db.session.flush()
+    # La relation a pu être chargée avec l'ancien réalisateur : relue après le flush
+    db.session.expire(movie, ['director'])
+    search_service.index_movie(movie)
     db.session.commit()
+    autocomplete_index.index_movie(movie)
     return jsonify({"message": "Film mis à jour avec succès"})
 
 @movie_bp.route('/<int:id>', methods=['DELETE'])
@@ -318,8 +393,10 @@ def delete_movie(id: int) -> Union[Dict[str, str], Tuple[Dict[str, str], int]]:
     if not movie:
         return jsonify({"error": "Film non trouvé"}), 404
 
+    search_service.remove_movie(movie.id)
     db.session.delete(movie)
     db.session.commit()
+    autocomplete_index.remove('movie', id)
     return jsonify({"message": "Film supprimé avec succès"})
 
 @movie_bp.route('/full', methods=['POST'])
@@ -366,7 +443,7 @@ def create_full_movie() -> Tuple[Dict[str, Union[str, int]], int]:
       - name: video
         in: formData
         type: file
-        description: Fichier vidéo du film
+        description: Fichier vidéo du film (pour les gros fichiers, préférer l'envoi par morceaux /uploads/)
     responses:
       201:
         description: Film créé avec succès
@@ -383,7 +460,6 @@ def create_full_movie() -> Tuple[Dict[str, Union[str, int]], int]:
         description: Erreur serveur
     """
     try:
-        from werkzeug.utils import secure_filename
         import os
 
         title = request.form.get('title')
@@ -403,10 +479,11 @@ def create_full_movie() -> Tuple[Dict[str, Union[str, int]], int]:
         if poster_file:
             folder = 'static/posters'
             os.makedirs(folder, exist_ok=True)
-            filename = secure_filename(poster_file.filename)
+            filename = unique_filename(poster_file.filename)
             poster_path = os.path.join(folder, filename)
             poster_file.save(poster_path)
             poster_url = f'/static/posters/{filename}'
+            poster_service.generate_variants_async(filename)
 
         # Upload de la vidéo
         video_file = request.files.get('video')
@@ -414,25 +491,24 @@ def create_full_movie() -> Tuple[Dict[str, Union[str, int]], int]:
         if video_file:
             video_folder = 'static/videos'
             os.makedirs(video_folder, exist_ok=True)
-            video_filename = secure_filename(video_file.filename)
+            video_filename = unique_filename(video_file.filename)
             video_full_path = os.path.join(video_folder, video_filename)
             video_file.save(video_full_path)
             video_path = f'/static/videos/{video_filename}'
 
         # Réalisateur
-        director_key = director_name.replace(" ", "").upper()
-        director = Director.query.filter(
-            db.func.replace(db.func.upper(Director.name), " ", "") == director_key
-        ).first()
+        director = Director.query.filter_by(name_key=name_key(director_name)).order_by(Director.id).first()
         if not director:
             director = Director(name=director_name)
             db.session.add(director)
 
         # Film
+        rating = float(rating) if rating else None
         movie = Movie(
             title=title,
             release_year=int(release_year) if release_year else None,
-            rating=float(rating) if rating else None,
+            rating=rating,
+            catalog_rating=rating,
             description=description,
             poster_url=poster_url,
             video_file_path=video_path,
@@ -441,10 +517,7 @@ def create_full_movie() -> Tuple[Dict[str, Union[str, int]], int]:
 
         # Acteurs
         for actor_name in actor_names:
-            key = actor_name.replace(" ", "").upper()
-            actor = Actor.query.filter(
-                db.func.replace(db.func.upper(Actor.name), " ", "") == key
-            ).first()
+            actor = Actor.query.filter_by(name_key=name_key(actor_name)).order_by(Actor.id).first()
             if not actor:
                 actor = Actor(name=actor_name)
                 db.session.add(actor)
@@ -452,17 +525,17 @@ def create_full_movie() -> Tuple[Dict[str, Union[str, int]], int]:
 
         # Genres
         for genre_name in genre_names:
-            key = genre_name.replace(" ", "").upper()
-            genre = Genre.query.filter(
-                db.func.replace(db.func.upper(Genre.name), " ", "") == key
-            ).first()
+            genre = Genre.query.filter_by(name_key=name_key(genre_name)).first()
             if not genre:
                 genre = Genre(name=genre_name)
                 db.session.add(genre)
             movie.genres.append(genre)
 
         db.session.add(movie)
+        db.session.flush()
+        search_service.index_movie(movie)
         db.session.commit()
+        autocomplete_index.index_movie(movie)
 
         return jsonify({"message": "Film complet ajouté avec succès", "id": movie.id}), 201
 
@@ -1,7 +1,8 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
-from app.models.rating import Rating
+from app.utils import save_ratings, touch_movies
+from app.services.interaction_events import interactions_recorded
 
 rating_bp = Blueprint('rating', __name__, url_prefix='/ratings')
 
@@ -16,12 +17,25 @@ def add_rating():
     if not movie_id or rating is None:
         return jsonify({"error": "ID du film et note requis"}), 400
 
-    existing = Rating.query.filter_by(user_id=user_id, movie_id=movie_id).first()
-    if existing:
-        existing.rating = rating
-    else:
-        new_rating = Rating(user_id=user_id, movie_id=movie_id, rating=rating)
-        db.session.add(new_rating)
+    # Valeurs JSON converties comme le faisait la base ("5" accepté), booléens refusés
+    try:
+        if isinstance(movie_id, bool):
+            raise ValueError()
+        movie_id = int(movie_id)
+    except (TypeError, ValueError):
+        return jsonify({"error": "movie_id entier requis"}), 400
+    try:
+        if isinstance(rating, bool):
+            raise ValueError()
+        rating = float(rating)
+        if not (0 <= rating <= 5):
+            raise ValueError()
+    except (TypeError, ValueError):
+        return jsonify({"error": "La note doit être un nombre entre 0 et 5"}), 400
 
+    # Insertion ou remplacement sans course ; l'ancienne note sert aux compteurs
+    created, rating_sum = save_ratings(int(user_id), {movie_id: rating})
+    touch_movies([movie_id])
+    interactions_recorded(int(user_id), [movie_id], rating_count=created, rating_sum=rating_sum)
     db.session.commit()
     return jsonify({"message": "Note enregistrée"}), 200
@@ -1,12 +1,15 @@
 # routes/recommendation_routes.py
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models.like import Like
 from app.models.rating import Rating
 from app.models.review import Review
 from app.services.recommendation_service import RecommendationService
-from app.models import Movie, User
+from app.services.user_stats_service import user_stats_service
+from app.models import Movie
 from app.extensions import db
+from app.utils.helpers import serialize_movie, load_movie_cards, movie_card_options
+from app.utils.http_cache import conditional_get, catalog_version
+from app.utils.security import role_required
 from typing import List, Dict, Any, Tuple, Union, Optional
 
 recommendation_bp = Blueprint('recommendations', __name__, url_prefix='/recommendations')
@@ -77,7 +80,7 @@ def get_recommendations() -> Union[Dict[str, Any], Tuple[Dict[str, str], int]]:
       500:
         description: Erreur lors de la génération des recommandations
     """
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     method = request.args.get('method', 'hybrid')
     limit = int(request.args.get('limit', 10))
     
@@ -94,21 +97,11 @@ def get_recommendations() -> Union[Dict[str, Any], Tuple[Dict[str, str], int]]:
                     user_id, method, limit
                 )
         
-        recommended_movies = []
-        for movie_id, score in recommendations:
-            movie = Movie.query.get(movie_id)
-            if movie:
-                recommended_movies.append({
-                    'id': movie.id,
-                    'title': movie.title,
-                    'release_year': movie.release_year,
-                    'rating': movie.rating,
-                    'description': movie.description,
-                    'poster_url': movie.poster_url,
-                    'recommendation_score': round(score, 3),
-                    'director': movie.director.name if movie.director else None,
-                    'genres': [genre.name for genre in movie.genres]
-                })
+        scores = dict(recommendations)
+        recommended_movies = [
+            serialize_movie(movie, recommendation_score=round(scores[movie.id], 3))
+            for movie in load_movie_cards(movie_id for movie_id, _ in recommendations)
+        ]
         
         return jsonify({
             'recommendations': recommended_movies,
@@ -157,37 +150,21 @@ def get_similar_users() -> Union[Dict[str, Any], Tuple[Dict[str, str], int]]:
       500:
         description: Erreur lors du calcul des similarités
     """
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     limit = int(request.args.get('limit', 5))
     
     try:
-        user_movie_scores = recommendation_service.build_user_movie_matrix()
+        # Voisins précalculés par le traitement par lots (flask refresh-neighbors)
+        similar_users = recommendation_service.get_similar_users(user_id, limit)
         
-        if user_id not in user_movie_scores:
+        if not similar_users:
             return jsonify({'similar_users': [], 'message': 'Pas assez de données'})
         
-        target_user_scores = user_movie_scores[user_id]
-        similarities = {}
-        
-        for other_user_id, scores in user_movie_scores.items():
-            if other_user_id != user_id:
-                similarity = recommendation_service.calculate_user_similarity(
-                    target_user_scores, scores
-                )
-                if similarity > 0:
-                    similarities[other_user_id] = similarity
-        
-        similar_users = sorted(similarities.items(), key=lambda x: x[1], reverse=True)[:limit]
-        
-        result = []
-        for other_user_id, similarity in similar_users:
-            user = User.query.get(other_user_id)
-            if user:
-                result.append({
-                    'user_id': user.id,
-                    'username': user.username,
-                    'similarity_score': round(similarity, 3)
-                })
+        result = [{
+            'user_id': other_user_id,
+            'username': username,
+            'similarity_score': round(similarity, 3)
+        } for other_user_id, username, similarity in similar_users]
         
         return jsonify({'similar_users': result})
         
@@ -228,7 +205,7 @@ def get_user_preferences() -> Union[Dict[str, Any], Tuple[Dict[str, str], int]]:
       500:
         description: Erreur lors de l'analyse des préférences
     """
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     
     try:
         preferences = recommendation_service.get_user_preferences(user_id)
@@ -243,13 +220,14 @@ def get_user_preferences() -> Union[Dict[str, Any], Tuple[Dict[str, str], int]]:
         
         return jsonify({
             'preferences': formatted_preferences,
-            'total_interactions': len(recommendation_service.build_user_movie_matrix().get(user_id, {}))
+            'total_interactions': preferences['interaction_count']
         })
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @recommendation_bp.route('/popular', methods=['GET'])
+@conditional_get(catalog_version)
 def get_popular_movies() -> Union[Dict[str, Any], Tuple[Dict[str, str], int]]:
     """
     Récupère les films les plus populaires
@@ -317,11 +295,6 @@ def get_popular_movies() -> Union[Dict[str, Any], Tuple[Dict[str, str], int]]:
             func.count(Rating.id).label('rating_count')
         ).group_by(Rating.movie_id).subquery()
         
-        like_counts = db.session.query(
-            Like.movie_id,
-            func.count(Like.id).label('like_count')
-        ).group_by(Like.movie_id).subquery()
-        
         review_counts = db.session.query(
             Review.movie_id,
             func.count(Review.id).label('review_count')
@@ -329,40 +302,32 @@ def get_popular_movies() -> Union[Dict[str, Any], Tuple[Dict[str, str], int]]:
         
         popular_movies = db.session.query(Movie)\
             .outerjoin(avg_ratings, Movie.id == avg_ratings.c.movie_id)\
-            .outerjoin(like_counts, Movie.id == like_counts.c.movie_id)\
             .outerjoin(review_counts, Movie.id == review_counts.c.movie_id)\
             .add_columns(
                 avg_ratings.c.avg_rating,
                 avg_ratings.c.rating_count,
-                like_counts.c.like_count,
+                Movie.like_count,
                 review_counts.c.review_count
             )\
             .order_by(
                 (func.coalesce(avg_ratings.c.avg_rating, 0) * 0.4 +
-                 func.coalesce(like_counts.c.like_count, 0) * 0.3 +
+                 Movie.like_count * 0.3 +
                  func.coalesce(review_counts.c.review_count, 0) * 0.3).desc()
             )\
+            .options(*movie_card_options())\
             .limit(limit)\
             .all()
         
         result = []
         for movie_data in popular_movies:
             movie = movie_data[0]
-            result.append({
-                'id': movie.id,
-                'title': movie.title,
-                'release_year': movie.release_year,
-                'rating': movie.rating,
-                'description': movie.description,
-                'poster_url': movie.poster_url,
-                "video_path": movie.video_file_path,
-                'avg_user_rating': round(movie_data[1] or 0, 2),
-                'rating_count': movie_data[2] or 0,
-                'like_count': movie_data[3] or 0,
-                'review_count': movie_data[4] or 0,
-                'director': movie.director.name if movie.director else None,
-                'genres': [genre.name for genre in movie.genres]
-            })
+            result.append(serialize_movie(
+                movie,
+                avg_user_rating=round(movie_data[1] or 0, 2),
+                rating_count=movie_data[2] or 0,
+                like_count=movie_data[3] or 0,
+                review_count=movie_data[4] or 0
+            ))
         
         return jsonify({
             'popular_movies': result,
@@ -433,42 +398,47 @@ def get_recommendations_by_genre(genre_name: str) -> Union[Dict[str, Any], Tuple
     limit = int(request.args.get('limit', 10))
     
     try:
+        from sqlalchemy import func
         from app.models import Genre
         
         genre = Genre.query.filter_by(name=genre_name).first()
         if not genre:
             return jsonify({'error': 'Genre non trouvé'}), 404
         
-        movies_in_genre = []
-        for movie in genre.movies:
-            score = 0
-            ratings = Rating.query.filter_by(movie_id=movie.id).all()
-            likes = Like.query.filter_by(movie_id=movie.id).count()
-            reviews = Review.query.filter_by(movie_id=movie.id).count()
-            
-            if ratings:
-                avg_rating = sum(r.rating for r in ratings if r.rating) / len(ratings)
-                score = (avg_rating / 5.0) * 0.6 + (likes * 0.02) + (reviews * 0.01)
-            else:
-                score = (likes * 0.02) + (reviews * 0.01)
-            
-            movies_in_genre.append((movie, score))
+        rating_stats = db.session.query(
+            Rating.movie_id,
+            func.sum(Rating.rating).label('rating_sum'),
+            func.count(Rating.id).label('rating_count')
+        ).group_by(Rating.movie_id).subquery()
         
-        movies_in_genre.sort(key=lambda x: x[1], reverse=True)
+        review_counts = db.session.query(
+            Review.movie_id,
+            func.count(Review.id).label('review_count')
+        ).group_by(Review.movie_id).subquery()
         
-        result = []
-        for movie, score in movies_in_genre[:limit]:
-            result.append({
-                'id': movie.id,
-                'title': movie.title,
-                'release_year': movie.release_year,
-                'rating': movie.rating,
-                'description': movie.description,
-                'poster_url': movie.poster_url,
-                'popularity_score': round(score, 3),
-                'director': movie.director.name if movie.director else None,
-                'genres': [g.name for g in movie.genres]
-            })
+        popularity_score = (
+            db.case(
+                (rating_stats.c.rating_count > 0,
+                 func.coalesce(rating_stats.c.rating_sum, 0) / rating_stats.c.rating_count / 5.0 * 0.6),
+                else_=0
+            ) +
+            Movie.like_count * 0.02 +
+            func.coalesce(review_counts.c.review_count, 0) * 0.01
+        ).label('popularity_score')
+        
+        movies_in_genre = db.session.query(Movie, popularity_score)\
+            .filter(Movie.genres.any(Genre.id == genre.id))\
+            .outerjoin(rating_stats, Movie.id == rating_stats.c.movie_id)\
+            .outerjoin(review_counts, Movie.id == review_counts.c.movie_id)\
+            .options(*movie_card_options())\
+            .order_by(popularity_score.desc(), Movie.id)\
+            .limit(limit)\
+            .all()
+        
+        result = [
+            serialize_movie(movie, popularity_score=round(score or 0, 3))
+            for movie, score in movies_in_genre
+        ]
         
         return jsonify({
             'recommendations': result,
@@ -480,7 +450,7 @@ def get_recommendations_by_genre(genre_name: str) -> Union[Dict[str, Any], Tuple
         return jsonify({'error': str(e)}), 500
 
 @recommendation_bp.route('/admin/generate-all', methods=['POST'])
-@jwt_required()
+@role_required('admin')
 def generate_all_recommendations() -> Union[Dict[str, str], Tuple[Dict[str, str], int]]:
     """
     Génère les recommandations pour tous les utilisateurs (admin seulement)
@@ -502,12 +472,6 @@ def generate_all_recommendations() -> Union[Dict[str, str], Tuple[Dict[str, str]
       500:
         description: Erreur lors de la génération des recommandations
     """
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user or not user.is_admin:
-        return jsonify({'error': 'Accès refusé'}), 403
-    
     try:
         recommendation_service.generate_recommendations_for_all_users()
         return jsonify({'message': 'Recommandations générées pour tous les utilisateurs'})
@@ -544,22 +508,11 @@ def get_recommendation_stats() -> Union[Dict[str, Any], Tuple[Dict[str, str], in
       500:
         description: Erreur lors du calcul des statistiques
     """
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     
     try:
-        stats = {
-            'total_ratings': Rating.query.filter_by(user_id=user_id).count(),
-            'total_likes': Like.query.filter_by(user_id=user_id).count(),
-            'total_reviews': Review.query.filter_by(user_id=user_id).count(),
-            'avg_rating_given': 0
-        }
-        
-        user_ratings = Rating.query.filter_by(user_id=user_id).all()
-        if user_ratings:
-            total_rating = sum(r.rating for r in user_ratings if r.rating)
-            stats['avg_rating_given'] = round(total_rating / len(user_ratings), 2)
-        
-        return jsonify({'stats': stats})
+        # Compteurs tenus à jour à chaque écriture : une lecture par clé primaire
+        return jsonify({'stats': user_stats_service.get(user_id)})
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -589,6 +542,7 @@ def test_auth() -> Dict[str, Any]:
     return jsonify({"message": "Test réussi", "user_id": user_id})
 
 @recommendation_bp.route('/admin/stats', methods=['GET'])
+@role_required('admin')
 def get_global_stats() -> Union[Dict[str, Any], Tuple[Dict[str, str], int]]:
     """
     Récupère les statistiques globales pour l'administration
@@ -611,23 +565,17 @@ def get_global_stats() -> Union[Dict[str, Any], Tuple[Dict[str, str], int]]:
               type: integer
             avg_rating:
               type: number
+            computed_at:
+              type: string
+              description: Date du calcul (au plus GLOBAL_STATS_MAX_AGE secondes)
+      403:
+        description: Réservé aux administrateurs
       500:
         description: Erreur lors du calcul des statistiques
     """
     try:
-        from sqlalchemy import func
-
-        total_movies = db.session.query(func.count(Movie.id)).scalar()
-        total_reviews = db.session.query(func.count(Review.id)).scalar()
-        total_ratings = db.session.query(func.count(Rating.id)).scalar()
-        avg_rating = db.session.query(func.avg(Rating.rating)).scalar() or 0.0
-
-        return jsonify({
-            'total_movies': total_movies,
-            'total_reviews': total_reviews,
-            'total_ratings': total_ratings,
-            'avg_rating': round(avg_rating, 2)
-        })
+        # Instantané en mémoire : pas de parcours des tables à chaque rafraîchissement
+        return jsonify(user_stats_service.global_stats())
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
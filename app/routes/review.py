@@ -3,30 +3,13 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
 from app.models.review import Review
 from app.models.movie import Movie
+from app.utils import update_movie_rating, stored_review_rating
+from app.utils.http_cache import conditional_get, movie_version
+from app.services.interaction_events import interactions_recorded
 from typing import Any, Dict, List, Tuple, Union, Optional
 
 review_bp = Blueprint('review', __name__, url_prefix='/reviews')
 
-def update_movie_rating(movie_id: int) -> None:
-    """
-    Met à jour la note moyenne d'un film
-    Args:
-        movie_id: ID du film à mettre à jour
-    """
-    reviews = Review.query.filter_by(movie_id=movie_id).all()
-    movie = Movie.query.get(movie_id)
-
-    if not movie:
-        return
-
-    if reviews:
-        average_rating = sum([r.rating for r in reviews if r.rating is not None]) / len(reviews)
-        movie.rating = round(average_rating, 2)
-    else:
-        movie.rating = None
-
-    db.session.commit()
-
 @review_bp.route('/', methods=['POST'])
 @jwt_required()
 def add_review() -> Union[Dict[str, Any], Tuple[Dict[str, str], int]]:
@@ -105,10 +88,11 @@ def add_review() -> Union[Dict[str, Any], Tuple[Dict[str, str], int]]:
 
     review = Review(user_id=user_id, movie_id=movie_id, review_text=review_text, rating=rating)
     db.session.add(review)
+    db.session.flush()
+    update_movie_rating(movie_id, added=stored_review_rating(review.id))
+    interactions_recorded(int(user_id), [movie_id], review_count=1)
     db.session.commit()
 
-    update_movie_rating(movie_id)
-
     return jsonify({
         "message": "Avis ajouté",
         "review": {
@@ -121,6 +105,7 @@ def add_review() -> Union[Dict[str, Any], Tuple[Dict[str, str], int]]:
     }), 201
 
 @review_bp.route('/<int:movie_id>', methods=['GET'])
+@conditional_get(lambda movie_id: movie_version(movie_id))
 def get_movie_reviews(movie_id: int) -> Union[Dict[str, Any], Tuple[Dict[str, str], int]]:
     """
     Récupère tous les avis pour un film spécifique
@@ -241,12 +226,14 @@ def update_review(movie_id: int) -> Union[Dict[str, Any], Tuple[Dict[str, str],
     if not review:
         return jsonify({"error": "Vous n'avez pas encore laissé d'avis pour ce film"}), 404
 
+    previous_rating = review.rating
     review.review_text = review_text
     review.rating = rating
+    db.session.flush()
+    update_movie_rating(movie_id, added=stored_review_rating(review.id), removed=previous_rating)
+    interactions_recorded(int(user_id), [movie_id])
     db.session.commit()
 
-    update_movie_rating(movie_id)
-
     return jsonify({
         "message": "Avis mis à jour", 
         "new_review": review.review_text, 
@@ -281,11 +268,12 @@ def delete_review(movie_id: int) -> Union[Dict[str, str], Tuple[Dict[str, str],
     if not review:
         return jsonify({"error": "Vous n'avez pas encore laissé d'avis pour ce film"}), 404
 
+    previous_rating = review.rating
     db.session.delete(review)
+    update_movie_rating(movie_id, removed=previous_rating)
+    interactions_recorded(int(user_id), [movie_id], review_count=-1)
     db.session.commit()
 
-    update_movie_rating(movie_id)
-
     return jsonify({"message": "Avis supprimé"})
 
 @review_bp.route('/<int:movie_id>/me', methods=['GET'])
@@ -1,20 +1,16 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from app.extensions import db
+from app.models.role import Role
 from app.models.user import User
+from app.utils.security import role_required, role_cache
 
 role_bp = Blueprint('role', __name__, url_prefix='/roles')
 
 @role_bp.route('/assign', methods=['POST'])
-@jwt_required()
+@role_required('admin')
 def assign_role():
     """Assigner un rôle à un utilisateur (Admin uniquement)"""
-    current_user_id = get_jwt_identity()
-    current_user = User.query.get(current_user_id)
-
-    if not current_user or current_user.role != 'admin':
-        return jsonify({"error": "Accès refusé, admin requis"}), 403
-
     data = request.get_json()
     user_id = data.get('user_id')
     new_role = data.get('role')
@@ -22,12 +18,20 @@ def assign_role():
     if not user_id or not new_role:
         return jsonify({"error": "ID utilisateur et rôle requis"}), 400
 
+    role = Role.query.filter_by(name=new_role).first()
+    if not role:
+        return jsonify({"error": "Rôle inconnu"}), 400
+
     user = User.query.get(user_id)
     if not user:
         return jsonify({"error": "Utilisateur introuvable"}), 404
 
-    user.role = new_role
-    db.session.commit()
+    if user.role_id != role.id:
+        user.role_id = role.id
+        # Les tokens déjà émis pour cet utilisateur portent désormais un rôle périmé
+        user.role_version = User.role_version + 1
+        db.session.commit()
+        role_cache.remember(user.id, user.role_version, role.name)
 
     return jsonify({"message": f"Rôle mis à jour : {user.username} → {new_role}"}), 200
 
@@ -39,4 +43,4 @@ def get_user_role(user_id):
     if not user:
         return jsonify({"error": "Utilisateur introuvable"}), 404
 
-    return jsonify({"user_id": user.id, "username": user.username, "role": user.role})
+    return jsonify({"user_id": user.id, "username": user.username, "role": user.role.name if user.role else None})
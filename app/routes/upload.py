@@ -0,0 +1,191 @@
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.extensions import db
+from app.services.upload_service import upload_service, UploadError
+from typing import Any, Dict, Tuple, Union
+
+upload_bp = Blueprint('upload', __name__, url_prefix='/uploads')
+
+
+def _serialize_upload(upload) -> Dict[str, Any]:
+    return {
+        "upload_id": upload.id,
+        "filename": upload.filename,
+        "movie_id": upload.movie_id,
+        "total_size": upload.total_size,
+        "received_size": upload.received_size,
+        "status": upload.status,
+        "sha256": upload.sha256,
+        "video_path": upload.video_path
+    }
+
+
+def _error(e: UploadError) -> Tuple[Dict[str, Any], int]:
+    db.session.rollback()
+    return jsonify({"error": e.message, **e.details}), e.status
+
+
+@upload_bp.route('/', methods=['POST'])
+@jwt_required()
+def initiate_upload() -> Tuple[Dict[str, Any], int]:
+    """
+    Démarre un envoi de vidéo par morceaux
+    ---
+    tags:
+      - Envois
+    security:
+      - JWT: []
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          required:
+            - filename
+            - size
+          properties:
+            filename:
+              type: string
+              example: inception.mp4
+            size:
+              type: integer
+              description: Taille totale du fichier en octets
+            movie_id:
+              type: integer
+              description: Film auquel lier la vidéo une fois l'envoi terminé
+    responses:
+      201:
+        description: Envoi créé
+      400:
+        description: Données invalides
+      404:
+        description: Film non trouvé
+      413:
+        description: Fichier trop volumineux
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        upload = upload_service.initiate(
+            int(get_jwt_identity()), data.get('filename'), data.get('size'), data.get('movie_id')
+        )
+    except UploadError as e:
+        return _error(e)
+
+    return jsonify({
+        **_serialize_upload(upload),
+        "max_part_size": current_app.config['VIDEO_UPLOAD_MAX_PART_SIZE']
+    }), 201
+
+
+@upload_bp.route('/<upload_id>', methods=['GET'])
+@jwt_required()
+def get_upload(upload_id: str) -> Union[Dict[str, Any], Tuple[Dict[str, str], int]]:
+    """
+    État d'un envoi (position à partir de laquelle reprendre)
+    ---
+    tags:
+      - Envois
+    security:
+      - JWT: []
+    parameters:
+      - name: upload_id
+        in: path
+        type: string
+        required: true
+    responses:
+      200:
+        description: État de l'envoi
+      404:
+        description: Envoi introuvable
+    """
+    try:
+        upload = upload_service.get(upload_id, int(get_jwt_identity()))
+    except UploadError as e:
+        return _error(e)
+    return jsonify(_serialize_upload(upload))
+
+
+@upload_bp.route('/<upload_id>', methods=['PUT'])
+@jwt_required()
+def upload_part(upload_id: str) -> Union[Dict[str, Any], Tuple[Dict[str, Any], int]]:
+    """
+    Envoie un morceau (corps brut application/octet-stream)
+    ---
+    tags:
+      - Envois
+    security:
+      - JWT: []
+    consumes:
+      - application/octet-stream
+    parameters:
+      - name: upload_id
+        in: path
+        type: string
+        required: true
+      - name: offset
+        in: query
+        type: integer
+        required: true
+        description: Position du morceau, égale au nombre d'octets déjà reçus
+    responses:
+      200:
+        description: Morceau enregistré
+      404:
+        description: Envoi introuvable
+      409:
+        description: Position inattendue (expected_offset indique où reprendre)
+      413:
+        description: Morceau trop volumineux
+    """
+    offset = request.args.get('offset', type=int)
+    if offset is None:
+        return jsonify({"error": "Paramètre offset requis"}), 400
+
+    try:
+        upload = upload_service.append_part(
+            upload_id, int(get_jwt_identity()), offset, request.stream, request.content_length
+        )
+    except UploadError as e:
+        return _error(e)
+    return jsonify(_serialize_upload(upload))
+
+
+@upload_bp.route('/<upload_id>/complete', methods=['POST'])
+@jwt_required()
+def complete_upload(upload_id: str) -> Union[Dict[str, Any], Tuple[Dict[str, Any], int]]:
+    """
+    Finalise un envoi et lie la vidéo au film
+    ---
+    tags:
+      - Envois
+    security:
+      - JWT: []
+    parameters:
+      - name: upload_id
+        in: path
+        type: string
+        required: true
+      - name: body
+        in: body
+        required: false
+        schema:
+          type: object
+          properties:
+            movie_id:
+              type: integer
+              description: Film à lier (remplace celui donné à l'initialisation)
+    responses:
+      200:
+        description: Envoi finalisé
+      404:
+        description: Envoi ou film introuvable
+      409:
+        description: Envoi incomplet
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        upload = upload_service.complete(upload_id, int(get_jwt_identity()), data.get('movie_id'))
+    except UploadError as e:
+        return _error(e)
+    return jsonify(_serialize_upload(upload))
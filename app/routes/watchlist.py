@@ -1,7 +1,11 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.exc import IntegrityError
 from app.extensions import db
 from app.models.watchlist import Watchlist
+from app.services.movie_list_service import watchlist_service
+from app.utils.helpers import parse_movie_ids
+from app.utils.upsert import insert_on_conflict
 
 watchlist_bp = Blueprint('watchlist', __name__, url_prefix='/watchlist')
 
@@ -16,12 +20,15 @@ def add_to_watchlist():
     if not movie_id:
         return jsonify({"error": "ID du film requis"}), 400
 
-    existing_entry = Watchlist.query.filter_by(user_id=user_id, movie_id=movie_id).first()
-    if existing_entry:
+    created = db.session.execute(insert_on_conflict(
+        Watchlist,
+        {"user_id": int(user_id), "movie_id": movie_id},
+        index_elements=['user_id', 'movie_id']
+    ).returning(Watchlist.__table__.c.id)).first()
+    if not created:
+        db.session.rollback()
         return jsonify({"error": "Film déjà dans la watchlist"}), 400
 
-    entry = Watchlist(user_id=user_id, movie_id=movie_id)
-    db.session.add(entry)
     db.session.commit()
 
     return jsonify({"message": "Film ajouté à la watchlist"}), 201
@@ -29,14 +36,54 @@ def add_to_watchlist():
 @watchlist_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_watchlist():
-    """Voir sa watchlist"""
-    user_id = get_jwt_identity()
-    watchlist = Watchlist.query.filter_by(user_id=user_id).all()
+    """Voir sa watchlist (paginée, avec les films)"""
+    user_id = int(get_jwt_identity())
+    page = request.args.get('page', 1, type=int)
+    per_page = min(
+        request.args.get('per_page', current_app.config['USER_LISTS_DEFAULT_PER_PAGE'], type=int),
+        current_app.config['USER_LISTS_MAX_PER_PAGE']
+    )
+
+    items, pagination = watchlist_service.page(user_id, page, per_page)
+    return jsonify({"watchlist": items, "pagination": pagination})
+
+@watchlist_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def bulk_add_to_watchlist():
+    """Ajouter plusieurs films à sa watchlist ({"movie_ids": [...]}) en une transaction"""
+    user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+    try:
+        movie_ids = parse_movie_ids(data.get('movie_ids') if isinstance(data, dict) else None,
+                                    current_app.config['MOVIE_IDS_MAX_PER_REQUEST'])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    if not watchlist:
-        return jsonify({"message": "Votre watchlist est vide"}), 404
+    try:
+        added, existing, unknown = watchlist_service.add(user_id, movie_ids)
+        db.session.commit()
+    except IntegrityError:
+        # Film supprimé pendant l'ajout (les doublons sont ignorés par ON CONFLICT) : le lot peut être renvoyé
+        db.session.rollback()
+        return jsonify({"error": "Watchlist modifiée pendant l'ajout, réessayez"}), 409
 
-    return jsonify([{"movie_id": w.movie_id} for w in watchlist])
+    return jsonify({"added": added, "already_present": existing, "unknown": unknown})
+
+@watchlist_bp.route('/bulk', methods=['DELETE'])
+@jwt_required()
+def bulk_remove_from_watchlist():
+    """Retirer plusieurs films de sa watchlist ({"movie_ids": [...]}) en une transaction"""
+    user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+    try:
+        movie_ids = parse_movie_ids(data.get('movie_ids') if isinstance(data, dict) else None,
+                                    current_app.config['MOVIE_IDS_MAX_PER_REQUEST'])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    removed, missing = watchlist_service.remove(user_id, movie_ids)
+    db.session.commit()
+    return jsonify({"removed": removed, "not_present": missing})
 
 @watchlist_bp.route('/<int:movie_id>', methods=['DELETE'])
 @jwt_required()
@@ -0,0 +1,170 @@
+# service/autocomplete_service.py
+
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict
+from sqlalchemy.exc import SQLAlchemyError
+from app.extensions import db
+from app.models import Movie, Actor, Director
+from app.utils.text import normalize
+
+
+class AutocompleteIndex:
+    """
+    Index en mémoire (par processus) pour l'autocomplétion des titres de films,
+    des acteurs et des réalisateurs.
+
+    - index de préfixes : liste triée de (mot, clé), parcourue par bisection ;
+    - index de trigrammes : tolère les fautes de frappe et les sous-chaînes.
+
+    Les libellés sont normalisés (minuscules, sans accents) avant indexation.
+    """
+
+    PREFIX_SCAN_FACTOR = 20
+    TRIGRAM_THRESHOLD = 0.3
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries = {}  # (type, id) -> (libellé, libellé normalisé, trigrammes)
+        self._prefixes = []  # [(mot normalisé, type, id)] trié
+        self._trigrams = defaultdict(set)  # trigramme -> {(type, id)}
+
+    def init_app(self, app):
+        with app.app_context():
+            try:
+                self.build()
+            except SQLAlchemyError as e:
+                # Base absente ou non migrée : l'index se remplira au fil des écritures
+                app.logger.warning(f"Index d'autocomplétion non construit : {e}")
+                db.session.rollback()
+
+    @staticmethod
+    def _trigrams_of(normalized):
+        padded = f'  {normalized} '
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    @staticmethod
+    def _tokens_of(normalized):
+        tokens = set(normalized.split())
+        tokens.add(normalized)
+        return tokens
+
+    def build(self):
+        """Construit l'index à partir de la base (trois requêtes sur colonnes)"""
+        rows = [('movie', id, title) for id, title in db.session.query(Movie.id, Movie.title)]
+        rows += [('actor', id, name) for id, name in db.session.query(Actor.id, Actor.name)]
+        rows += [('director', id, name) for id, name in db.session.query(Director.id, Director.name)]
+
+        with self._lock:
+            self._entries = {}
+            self._prefixes = []
+            self._trigrams = defaultdict(set)
+            for kind, id, label in rows:
+                self._add(kind, id, label, sort=False)
+            self._prefixes.sort()
+
+    def _add(self, kind, id, label, sort=True):
+        key = (kind, id)
+        if key in self._entries:
+            self._remove(kind, id)
+
+        normalized = normalize(label)
+        if not normalized:
+            return
+
+        trigrams = self._trigrams_of(normalized)
+        self._entries[key] = (label, normalized, trigrams)
+        for token in self._tokens_of(normalized):
+            if sort:
+                insort(self._prefixes, (token, kind, id))
+            else:
+                self._prefixes.append((token, kind, id))
+        for trigram in trigrams:
+            self._trigrams[trigram].add(key)
+
+    def _remove(self, kind, id):
+        entry = self._entries.pop((kind, id), None)
+        if not entry:
+            return
+
+        _, normalized, trigrams = entry
+        for token in self._tokens_of(normalized):
+            index = bisect_left(self._prefixes, (token, kind, id))
+            if index < len(self._prefixes) and self._prefixes[index] == (token, kind, id):
+                del self._prefixes[index]
+        for trigram in trigrams:
+            keys = self._trigrams.get(trigram)
+            if keys:
+                keys.discard((kind, id))
+                if not keys:
+                    del self._trigrams[trigram]
+
+    def add(self, kind, id, label):
+        with self._lock:
+            self._add(kind, id, label)
+
+    def remove(self, kind, id):
+        with self._lock:
+            self._remove(kind, id)
+
+    def index_movie(self, movie):
+        """Ajoute ou met à jour un film, son réalisateur et ses acteurs"""
+        with self._lock:
+            self._add('movie', movie.id, movie.title)
+            if movie.director:
+                self._add('director', movie.director.id, movie.director.name)
+            for actor in movie.actors:
+                self._add('actor', actor.id, actor.name)
+
+    def suggest(self, text, limit=8, kinds=None):
+        """
+        Retourne les `limit` meilleures suggestions pour `text`.
+        Priorité : début du libellé, puis début d'un mot, puis similarité de trigrammes.
+        """
+        query = normalize(text)
+        if not query or limit <= 0:
+            return []
+
+        scores = {}
+        with self._lock:
+            index = bisect_left(self._prefixes, (query,))
+            scanned = 0
+            max_scan = limit * self.PREFIX_SCAN_FACTOR
+            while index < len(self._prefixes) and scanned < max_scan:
+                token, kind, id = self._prefixes[index]
+                if not token.startswith(query):
+                    break
+                index += 1
+                if kinds and kind not in kinds:
+                    continue
+                scanned += 1
+                key = (kind, id)
+                score = 3.0 if self._entries[key][1].startswith(query) else 2.0
+                scores[key] = max(scores.get(key, 0.0), score)
+
+            if len(query) >= 3 and len(scores) < limit:
+                query_trigrams = self._trigrams_of(query)
+                shared = defaultdict(int)
+                for trigram in query_trigrams:
+                    for key in self._trigrams.get(trigram, ()):
+                        shared[key] += 1
+                for key, count in shared.items():
+                    if key in scores or (kinds and key[0] not in kinds):
+                        continue
+                    entry_trigrams = self._entries[key][2]
+                    similarity = count / (len(query_trigrams) + len(entry_trigrams) - count)
+                    if similarity >= self.TRIGRAM_THRESHOLD:
+                        scores[key] = similarity
+
+            ranked = sorted(
+                scores.items(),
+                key=lambda item: (-item[1], len(self._entries[item[0]][1]), self._entries[item[0]][1])
+            )[:limit]
+
+            return [
+                {'type': kind, 'id': id, 'label': self._entries[(kind, id)][0]}
+                for (kind, id), _ in ranked
+            ]
+
+
+autocomplete_index = AutocompleteIndex()
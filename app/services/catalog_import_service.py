@@ -0,0 +1,193 @@
+# service/catalog_import_service.py
+
+import csv
+import json
+import os
+import time
+from app.extensions import db
+from app.models import Movie, Director, Actor, Genre
+from app.models.actor import movie_actors
+from app.models.genre import movie_genres
+from app.services.search_service import SearchService
+from app.utils.text import name_key
+
+
+class CatalogImporter:
+    """
+    Import en masse d'un catalogue de films (CSV ou JSONL).
+
+    Les réalisateurs, acteurs et genres existants sont chargés une seule fois
+    dans des dictionnaires {clé normalisée: id} ; les nouveaux noms, les films et
+    les tables d'association sont insérés par lots.
+
+    Champs reconnus : title, director, actors, genres, release_year, rating,
+    description, poster_url, video_path. En CSV, actors et genres sont séparés par '|'.
+    """
+
+    LIST_SEPARATOR = '|'
+
+    def __init__(self, batch_size=1000):
+        self.batch_size = batch_size
+        self.search_service = SearchService()
+        self.directors = {}
+        self.actors = {}
+        self.genres = {}
+
+    @staticmethod
+    def _load_keys(model):
+        # Homonymes : le plus ancien est retenu, comme dans create_full_movie
+        return dict(db.session.query(model.name_key, model.id).order_by(model.id.desc()))
+
+    def read_records(self, path, file_format=None):
+        """Lit le fichier en flux, un enregistrement à la fois"""
+        file_format = file_format or os.path.splitext(path)[1].lstrip('.').lower()
+        with open(path, encoding='utf-8', newline='') as handle:
+            if file_format == 'csv':
+                for row in csv.DictReader(handle):
+                    for field in ('actors', 'genres'):
+                        value = row.get(field) or ''
+                        row[field] = [v.strip() for v in value.split(self.LIST_SEPARATOR) if v.strip()]
+                    yield row
+            elif file_format in ('jsonl', 'ndjson'):
+                for line in handle:
+                    if line.strip():
+                        yield json.loads(line)
+            else:
+                raise ValueError(f"Format non supporté : {file_format} (csv ou jsonl)")
+
+    @staticmethod
+    def _number(value, cast):
+        if value in (None, ''):
+            return None
+        return cast(value)
+
+    def _resolve(self, model, cache, names):
+        """Crée en une instruction les noms absents du cache et complète celui-ci"""
+        missing = {}
+        for name in names:
+            key = name_key(name)
+            if key and key not in cache:
+                missing.setdefault(key, name)
+        if not missing:
+            return
+
+        table = model.__table__
+        inserted = db.session.execute(
+            db.insert(table).returning(table.c.id, sort_by_parameter_order=True),
+            [{'name': name, 'name_key': key} for key, name in missing.items()]
+        ).scalars().all()
+        cache.update(zip(missing.keys(), inserted))
+
+    def _flush_batch(self, records):
+        self._resolve(Director, self.directors, [r['director'] for r in records])
+        self._resolve(Actor, self.actors, [a for r in records for a in r['actors']])
+        self._resolve(Genre, self.genres, [g for r in records for g in r['genres']])
+
+        movies = Movie.__table__
+        movie_ids = db.session.execute(
+            db.insert(movies).returning(movies.c.id, sort_by_parameter_order=True),
+            [{
+                'title': r['title'],
+                'release_year': r['release_year'],
+                # Note affichée tant que le film n'a pas d'avis, conservée ensuite
+                'rating': r['rating'],
+                'catalog_rating': r['rating'],
+                'description': r['description'],
+                'poster_url': r['poster_url'],
+                'video_file_path': r['video_path'],
+                'director_id': self.directors[name_key(r['director'])]
+            } for r in records]
+        ).scalars().all()
+
+        actor_rows = set()
+        genre_rows = set()
+        for movie_id, record in zip(movie_ids, records):
+            actor_rows.update((movie_id, self.actors[name_key(a)]) for a in record['actors'])
+            genre_rows.update((movie_id, self.genres[name_key(g)]) for g in record['genres'])
+
+        if actor_rows:
+            db.session.execute(
+                db.insert(movie_actors),
+                [{'movie_id': m, 'actor_id': a} for m, a in actor_rows]
+            )
+        if genre_rows:
+            db.session.execute(
+                db.insert(movie_genres),
+                [{'movie_id': m, 'genre_id': g} for m, g in genre_rows]
+            )
+
+        self.search_service.index_movie_ids(movie_ids)
+        db.session.commit()
+
+    def _names(self, value):
+        if not value:
+            return []
+        if isinstance(value, str):
+            value = value.split(self.LIST_SEPARATOR)
+        if not isinstance(value, list) or not all(isinstance(name, str) for name in value):
+            raise ValueError("liste de noms attendue")
+        return [name.strip() for name in value if name.strip()]
+
+    def _parse(self, record):
+        title = (record.get('title') or '').strip()
+        director = (record.get('director') or '').strip()
+        if not title or not director:
+            raise ValueError("title et director sont requis")
+
+        actors = self._names(record.get('actors'))
+        genres = self._names(record.get('genres'))
+        # Un nom sans clé normalisée ne peut être ni retrouvé ni créé : enregistrement
+        # écarté ici plutôt qu'un échec du lot après les lots déjà validés
+        if not all(name_key(name) for name in [director, *actors, *genres]):
+            raise ValueError("nom sans caractère significatif")
+
+        return {
+            'title': title,
+            'director': director,
+            'actors': actors,
+            'genres': genres,
+            'release_year': self._number(record.get('release_year'), int),
+            'rating': self._number(record.get('rating'), float),
+            'description': record.get('description') or None,
+            'poster_url': record.get('poster_url') or None,
+            'video_path': record.get('video_path') or record.get('video_file_path') or None
+        }
+
+    def import_file(self, path, file_format=None, progress=None):
+        """
+        Importe le fichier et retourne les statistiques
+        {'imported', 'skipped', 'seconds', 'rows_per_second'}.
+        `progress(stats)` est appelé après chaque lot.
+        """
+        self.directors = self._load_keys(Director)
+        self.actors = self._load_keys(Actor)
+        self.genres = self._load_keys(Genre)
+
+        stats = {'imported': 0, 'skipped': 0, 'seconds': 0.0, 'rows_per_second': 0.0}
+        started = time.perf_counter()
+        batch = []
+
+        def flush():
+            self._flush_batch(batch)
+            stats['imported'] += len(batch)
+            batch.clear()
+            stats['seconds'] = time.perf_counter() - started
+            stats['rows_per_second'] = stats['imported'] / stats['seconds'] if stats['seconds'] else 0.0
+            if progress:
+                progress(stats)
+
+        for record in self.read_records(path, file_format):
+            try:
+                batch.append(self._parse(record))
+            except (TypeError, ValueError):
+                stats['skipped'] += 1
+                continue
+            if len(batch) >= self.batch_size:
+                flush()
+
+        if batch:
+            flush()
+
+        stats['seconds'] = time.perf_counter() - started
+        stats['rows_per_second'] = stats['imported'] / stats['seconds'] if stats['seconds'] else 0.0
+        return stats
@@ -0,0 +1,164 @@
+# service/email_filter_service.py
+
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
+from app.extensions import db
+from app.models.user import User
+
+
+class EmailBloomFilter:
+    """
+    Filtre de Bloom en mémoire (par processus) des emails enregistrés.
+
+    Une réponse négative signifie « email certainement libre » et évite la
+    requête ; une réponse positive est confirmée par la recherche indexée sur
+    users.email. Le filtre est construit au démarrage, complété à chaque
+    inscription ou changement d'email, et rattrape toutes les
+    EMAIL_FILTER_SYNC_SECONDS les emails créés ou changés par les autres
+    processus (index sur users.email_changed_at, avec SYNC_OVERLAP_SECONDS de
+    recouvrement pour les transactions validées en retard).
+
+    Un email enregistré par un autre processus peut donc être annoncé libre
+    pendant au plus EMAIL_FILTER_SYNC_SECONDS (l'unicité reste garantie par la
+    contrainte sur users.email). Les emails supprimés ou remplacés ne produisent
+    que des faux positifs, jusqu'à la prochaine reconstruction.
+    """
+
+    SYNC_OVERLAP_SECONDS = 60
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bits = bytearray()
+        self._size = 0  # nombre de bits
+        self._hashes = 0
+        self._capacity = 0
+        self._count = 0
+        self._synced_at = 0.0
+        self._synced_until = None  # date (UTC) des changements déjà intégrés
+        self._recent = {}  # user_id -> email_changed_at, dans la fenêtre de recouvrement
+        self._ready = False
+        self._stats = {'negatives': 0, 'positives': 0, 'false_positives': 0}
+
+    def init_app(self, app):
+        with app.app_context():
+            try:
+                self.build()
+            except SQLAlchemyError as e:
+                # Base absente ou non migrée : toutes les vérifications passent par la base
+                app.logger.warning(f"Filtre des emails non construit : {e}")
+                db.session.rollback()
+
+    @staticmethod
+    def _dimensions(capacity, error_rate):
+        """Taille optimale (bits) et nombre de hachages pour `capacity` éléments"""
+        size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        hashes = max(1, round(size / capacity * math.log(2)))
+        return size, hashes
+
+    def _positions(self, email):
+        # Double hachage : k positions dérivées de deux entiers de 64 bits
+        digest = hashlib.blake2b(email.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self._size for i in range(self._hashes)]
+
+    def _add(self, email):
+        for position in self._positions(email):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self._count += 1
+
+    def build(self):
+        """(Re)construit le filtre à partir de tous les emails, dimensionné avec de la marge"""
+        config = current_app.config
+        started = datetime.utcnow()
+        rows = db.session.query(User.id, User.email, User.email_changed_at).all()
+        capacity = max(config['EMAIL_FILTER_MIN_CAPACITY'], 2 * len(rows))
+        size, hashes = self._dimensions(capacity, config['EMAIL_FILTER_ERROR_RATE'])
+
+        with self._lock:
+            self._bits = bytearray((size + 7) // 8)
+            self._size = size
+            self._hashes = hashes
+            self._capacity = capacity
+            self._count = 0
+            for _, email, _ in rows:
+                self._add(email)
+            overlap = started - timedelta(seconds=self.SYNC_OVERLAP_SECONDS)
+            self._recent = {id: changed_at for id, _, changed_at in rows if changed_at >= overlap}
+            self._synced_until = started
+            self._synced_at = time.time()
+            self._ready = True
+
+    def _sync(self):
+        """Ajoute les emails créés ou changés depuis la dernière synchronisation"""
+        if time.time() - self._synced_at < current_app.config['EMAIL_FILTER_SYNC_SECONDS']:
+            return
+        started = datetime.utcnow()
+        since = self._synced_until - timedelta(seconds=self.SYNC_OVERLAP_SECONDS)
+        rows = db.session.query(User.id, User.email, User.email_changed_at)\
+            .filter(User.email_changed_at >= since).all()
+        with self._lock:
+            # Changements déjà vus lors du recouvrement précédent : pas comptés deux fois
+            for id, email, changed_at in rows:
+                if self._recent.get(id) != changed_at:
+                    self._add(email)
+            self._recent = {id: changed_at for id, _, changed_at in rows}
+            self._synced_until = started
+            self._synced_at = time.time()
+        if self._count > self._capacity:
+            self.build()
+
+    def add(self, email):
+        if not self._ready:
+            return
+        with self._lock:
+            self._add(email)
+        if self._count > self._capacity:
+            self.build()
+
+    def might_contain(self, email):
+        """False : email certainement absent ; True : présent ou faux positif"""
+        if not self._ready:
+            return True
+        self._sync()
+        with self._lock:
+            return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(email))
+
+    def email_taken(self, email):
+        """Vérifie qu'un email est utilisé, sans requête lorsque le filtre répond non"""
+        if not self.might_contain(email):
+            self._stats['negatives'] += 1
+            return False
+
+        taken = db.session.query(User.id).filter_by(email=email).first() is not None
+        self._stats['positives'] += 1
+        if not taken:
+            self._stats['false_positives'] += 1
+        return taken
+
+    def stats(self):
+        with self._lock:
+            # Taux théorique (1 - e^(-kn/m))^k pour le remplissage actuel
+            expected = (1 - math.exp(-self._hashes * self._count / self._size)) ** self._hashes \
+                if self._size else None
+            checked = self._stats['negatives'] + self._stats['false_positives']
+            return {
+                'ready': self._ready,
+                'emails': self._count,
+                'capacity': self._capacity,
+                'bits': self._size,
+                'hashes': self._hashes,
+                'memory_bytes': len(self._bits),
+                'expected_false_positive_rate': expected,
+                # Parmi les emails libres vérifiés, part qu'il a fallu confirmer en base
+                'observed_false_positive_rate': self._stats['false_positives'] / checked if checked else None,
+                **self._stats
+            }
+
+
+email_filter = EmailBloomFilter()
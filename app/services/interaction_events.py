@@ -0,0 +1,26 @@
+# service/interaction_events.py
+
+from app.models.user_neighbor import UserNeighborDirty
+from app.services.user_profile_service import user_profile_service
+from app.services.user_stats_service import user_stats_service
+from app.utils.upsert import insert_on_conflict
+from app.extensions import db
+
+
+def interactions_recorded(user_id, movie_ids, **counters):
+    """
+    Appelé par les routes qui écrivent des notes, likes ou avis, avant le commit :
+    les données dérivées des interactions sont mises à jour dans la même transaction.
+
+    `counters` porte les variations des compteurs de l'utilisateur
+    (rating_count, rating_sum, like_count, review_count).
+    """
+    # Voisins de l'utilisateur à recalculer au prochain passage du traitement par lots
+    db.session.execute(insert_on_conflict(
+        UserNeighborDirty, {'user_id': user_id, 'marked_at': db.func.current_timestamp(), 'mark_count': 1},
+        index_elements=['user_id'], update_fields=['marked_at'], increment_fields=['mark_count']
+    ))
+    # Profil de préférences mis à jour pour les seuls films concernés
+    user_profile_service.update(user_id, movie_ids)
+    # Compteurs de /recommendations/stats
+    user_stats_service.add(user_id, **counters)
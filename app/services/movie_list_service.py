@@ -0,0 +1,87 @@
+# service/movie_list_service.py
+
+from app.extensions import db
+from app.models import Movie, Watchlist, Favorite
+from app.utils.helpers import load_movie_cards, serialize_movie
+from app.utils.upsert import insert_on_conflict
+
+
+class MovieListService:
+    """
+    Listes de films d'un utilisateur (watchlist, favoris).
+
+    Une page est lue en un nombre fixe de requêtes (comptage, entrées, films
+    et leurs relations) et renvoyée avec les cartes des films. Les ajouts et
+    retraits groupés s'appliquent à toute une liste d'identifiants en une
+    transaction, sans aller-retour par film.
+    """
+
+    def __init__(self, model):
+        self.model = model
+
+    def page(self, user_id, page, per_page):
+        model = self.model
+        pagination = model.query.filter_by(user_id=user_id)\
+            .order_by(model.timestamp.desc(), model.id.desc())\
+            .paginate(page=page, per_page=per_page, error_out=False)
+
+        movies = {movie.id: movie for movie in load_movie_cards(entry.movie_id for entry in pagination.items)}
+        items = [
+            {
+                'id': entry.id,
+                'movie_id': entry.movie_id,
+                'added_at': entry.timestamp.isoformat() if entry.timestamp else None,
+                'movie': serialize_movie(movies[entry.movie_id]) if entry.movie_id in movies else None
+            }
+            for entry in pagination.items
+        ]
+        return items, {
+            'total': pagination.total,
+            'pages': pagination.pages,
+            'current_page': pagination.page,
+            'per_page': pagination.per_page
+        }
+
+    def _present(self, user_id, movie_ids):
+        model = self.model
+        return {
+            movie_id for (movie_id,) in db.session.query(model.movie_id)
+            .filter(model.user_id == user_id, model.movie_id.in_(movie_ids))
+        }
+
+    def add(self, user_id, movie_ids):
+        """
+        Ajoute les films absents de la liste (sans commit) ; retourne (ajoutés, déjà présents, inconnus).
+        INSERT ... ON CONFLICT DO NOTHING sur (user_id, movie_id) : un film ajouté en
+        parallèle par une autre requête est compté comme déjà présent.
+        """
+        known = {movie_id for (movie_id,) in db.session.query(Movie.id).filter(Movie.id.in_(movie_ids))}
+        inserted = set()
+        rows = [{'user_id': user_id, 'movie_id': movie_id} for movie_id in movie_ids if movie_id in known]
+        if rows:
+            inserted = set(db.session.execute(
+                insert_on_conflict(self.model, rows, index_elements=['user_id', 'movie_id'])
+                .returning(self.model.__table__.c.movie_id)
+            ).scalars())
+        return (
+            [movie_id for movie_id in movie_ids if movie_id in inserted],
+            [movie_id for movie_id in movie_ids if movie_id in known and movie_id not in inserted],
+            [movie_id for movie_id in movie_ids if movie_id not in known]
+        )
+
+    def remove(self, user_id, movie_ids):
+        """Retire les films de la liste (sans commit) ; retourne (retirés, absents)"""
+        present = self._present(user_id, movie_ids)
+        if present:
+            db.session.execute(
+                db.delete(self.model)
+                .where(self.model.user_id == user_id, self.model.movie_id.in_(present))
+            )
+        return (
+            [movie_id for movie_id in movie_ids if movie_id in present],
+            [movie_id for movie_id in movie_ids if movie_id not in present]
+        )
+
+
+watchlist_service = MovieListService(Watchlist)
+favorite_service = MovieListService(Favorite)
@@ -0,0 +1,158 @@
+# service/poster_service.py
+
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from werkzeug.security import safe_join
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow absent : les affiches sont servies en taille d'origine
+    Image = None
+
+# Les threads de génération n'ont pas de contexte d'application (pas de current_app.logger)
+logger = logging.getLogger(__name__)
+
+
+class PosterService:
+    """
+    Variantes redimensionnées des affiches (vignette, carte, détail).
+
+    Les variantes sont enregistrées à côté de l'original sous le nom
+    `<nom>.w<largeur><ext>` : générées en arrière-plan après l'envoi, ou à la
+    demande pour les affiches existantes. Leur taille totale est bornée par
+    POSTER_VARIANT_CACHE_MAX_BYTES ; les moins récemment servies (date d'accès)
+    sont supprimées en premier.
+    """
+
+    VARIANT_NAME = re.compile(r'\.w\d+\.[^.]+$')
+
+    def __init__(self):
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Créé au premier envoi : pas de threads pour les processus qui n'en envoient pas (CLI, tests)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='posters')
+            return self._executor
+
+    @staticmethod
+    def folder():
+        return os.path.join(os.getcwd(), 'static', 'posters')
+
+    @staticmethod
+    def variant_name(filename, width):
+        base, ext = os.path.splitext(filename)
+        return f'{base}.w{width}{ext}'
+
+    @staticmethod
+    def _settings():
+        config = current_app.config
+        return {
+            'widths': sorted(config['POSTER_VARIANT_WIDTHS']),
+            'quality': config['POSTER_VARIANT_QUALITY'],
+            'max_bytes': config['POSTER_VARIANT_CACHE_MAX_BYTES']
+        }
+
+    def _generate(self, folder, filename, width, quality):
+        """Crée une variante ; retourne son nom, ou None si l'original est déjà assez petit"""
+        source = safe_join(folder, filename)
+        target_name = self.variant_name(filename, width)
+        target = safe_join(folder, target_name)
+        if source is None or target is None:
+            raise ValueError(f"Nom de fichier hors du dossier des affiches : {filename}")
+        if os.path.exists(target):
+            return target_name
+
+        with Image.open(source) as image:
+            if image.width <= width:
+                return None
+            image_format = image.format
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.LANCZOS)
+            if image_format == 'JPEG' and resized.mode not in ('RGB', 'L'):
+                resized = resized.convert('RGB')
+
+            # Écriture dans un fichier temporaire puis renommage atomique
+            temporary = f'{target}.{threading.get_ident()}.tmp'
+            resized.save(temporary, format=image_format, quality=quality, optimize=True)
+            os.replace(temporary, target)
+        return target_name
+
+    def _evict(self, folder, max_bytes):
+        with self._lock:
+            variants = []
+            total = 0
+            for entry in os.scandir(folder):
+                if entry.is_file() and self.VARIANT_NAME.search(entry.name):
+                    stat = entry.stat()
+                    variants.append((stat.st_atime, stat.st_size, entry.path))
+                    total += stat.st_size
+
+            for _, size, path in sorted(variants):
+                if total <= max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except FileNotFoundError:
+                    pass
+
+    def _generate_all(self, folder, filename, settings):
+        try:
+            for width in settings['widths']:
+                self._generate(folder, filename, width, settings['quality'])
+            self._evict(folder, settings['max_bytes'])
+        except Exception as e:
+            logger.warning(f"Variantes de {filename} impossibles : {e}")
+
+    def generate_variants_async(self, filename):
+        """Planifie la génération de toutes les variantes d'une affiche envoyée"""
+        if Image is None:
+            return
+        self._get_executor().submit(self._generate_all, self.folder(), filename, self._settings())
+
+    def variant_for(self, filename, requested_width):
+        """
+        Nom du fichier à servir pour une largeur demandée : la plus petite variante
+        au moins aussi large, créée à la demande si besoin ; None pour l'original.
+        """
+        if Image is None or self.VARIANT_NAME.search(filename):
+            return None
+
+        settings = self._settings()
+        widths = [w for w in settings['widths'] if w >= requested_width]
+        if not widths:
+            return None
+
+        # Nom issu de l'URL : aucun chemin hors du dossier (« ../ », chemin absolu)
+        folder = self.folder()
+        source = safe_join(folder, filename)
+        if source is None or not os.path.isfile(source):
+            return None
+
+        width = widths[0]
+        name = self.variant_name(filename, width)
+        path = safe_join(folder, name)
+        if os.path.exists(path):
+            # Date d'accès mise à jour pour l'éviction (mtime inchangé : l'ETag reste stable)
+            os.utime(path, (time.time(), os.stat(path).st_mtime))
+            return name
+
+        try:
+            name = self._generate(folder, filename, width, settings['quality'])
+        except Exception as e:
+            current_app.logger.warning(f"Variante {width}px de {filename} impossible : {e}")
+            return None
+        if name:
+            self._evict(folder, settings['max_bytes'])
+        return name
+
+
+poster_service = PosterService()
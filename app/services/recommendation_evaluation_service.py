@@ -0,0 +1,186 @@
+# service/recommendation_evaluation_service.py
+
+import math
+import multiprocessing
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from app.extensions import db
+from app.models import Rating, Review, Like
+from app.services.recommendation_service import RecommendationService, RecommendationData, new_interaction
+
+try:
+    import resource
+except ImportError:  # Windows : mémoire maximale non disponible
+    resource = None
+
+
+class SnapshotRecommendationService(RecommendationService):
+    """Service de recommandation travaillant sur un instantané figé, sans accès à la base"""
+
+    def __init__(self, interactions, movies, pool_sizes=None):
+        super().__init__(pool_sizes)
+        self._data = RecommendationData(interactions, lambda: movies, self.score_interaction)
+
+    def load_data(self):
+        return self._data
+
+
+def _peak_memory_mb():
+    if resource is None:
+        return None
+    # ru_maxrss est exprimé en kilo-octets sous Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _percentile(values, percent):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def evaluate_method(method, interactions, movies, relevant, k, pool_sizes=None):
+    """
+    Exécuté dans un processus dédié : recommande `k` films à chaque utilisateur
+    de `relevant` et compare aux films appréciés après la date de coupure.
+    """
+    service = SnapshotRecommendationService(interactions, movies, pool_sizes)
+    latencies = []
+    precision = []
+    recall = []
+    ndcg = []
+    recommended = set()
+    errors = 0
+
+    for user_id, relevant_items in relevant.items():
+        started = time.perf_counter()
+        try:
+            recommendations = service.recommend(user_id, method, k, service.load_data())
+        except Exception:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+
+        movie_ids = [movie_id for movie_id, _ in recommendations][:k]
+        recommended.update(movie_ids)
+        hits = [1 if movie_id in relevant_items else 0 for movie_id in movie_ids]
+
+        precision.append(sum(hits) / k)
+        recall.append(sum(hits) / len(relevant_items))
+        dcg = sum(hit / math.log2(rank + 2) for rank, hit in enumerate(hits))
+        ideal = sum(1 / math.log2(rank + 2) for rank in range(min(k, len(relevant_items))))
+        ndcg.append(dcg / ideal)
+
+    def mean(values):
+        return sum(values) / len(values) if values else None
+
+    return {
+        'method': method,
+        'users': len(latencies),
+        'errors': errors,
+        f'precision@{k}': mean(precision),
+        f'recall@{k}': mean(recall),
+        f'ndcg@{k}': mean(ndcg),
+        'coverage': len(recommended) / len(movies) if movies else None,
+        'latency_p50_ms': _percentile([l * 1000 for l in latencies], 50),
+        'latency_p99_ms': _percentile([l * 1000 for l in latencies], 99),
+        'peak_memory_mb': _peak_memory_mb()
+    }
+
+
+class RecommendationEvaluator:
+    """
+    Évaluation hors ligne des méthodes de RecommendationService.
+
+    Les événements (notes, avis, likes) sont triés dans le temps ; les
+    `train_ratio` premiers servent d'historique, les suivants de vérité terrain :
+    un film est pertinent pour un utilisateur s'il l'a aimé (like, note ou avis
+    >= `min_rating`) après la coupure sans l'avoir vu avant. Chaque méthode
+    tourne dans son propre processus, ce qui isole sa mémoire maximale.
+    """
+
+    def __init__(self, k=10, train_ratio=0.8, min_rating=4, max_users=None):
+        self.k = k
+        self.train_ratio = train_ratio
+        self.min_rating = min_rating
+        self.max_users = max_users
+
+    @staticmethod
+    def load_events():
+        """[(date, type, id, user_id, movie_id, valeurs)] triés dans le temps (sans date en premier)"""
+        events = []
+        for id, user_id, movie_id, rating, created_at in db.session.query(
+                Rating.id, Rating.user_id, Rating.movie_id, Rating.rating, Rating.created_at):
+            events.append((created_at, 'rating', id, user_id, movie_id, {'rating': rating}))
+        for id, user_id, movie_id, rating, text, timestamp in db.session.query(
+                Review.id, Review.user_id, Review.movie_id, Review.rating, Review.review_text, Review.timestamp):
+            events.append((timestamp, 'review', id, user_id, movie_id,
+                           {'review_rating': rating, 'review_text': text}))
+        for id, user_id, movie_id, created_at in db.session.query(
+                Like.id, Like.user_id, Like.movie_id, Like.created_at):
+            events.append((created_at, 'like', id, user_id, movie_id, {'liked': True}))
+
+        events.sort(key=lambda e: (e[0] is not None, e[0] or datetime.min, e[1], e[2]))
+        return events
+
+    def _is_positive(self, values):
+        if values.get('liked'):
+            return True
+        rating = values.get('rating')
+        if rating is None:
+            rating = values.get('review_rating')
+        return rating is not None and rating >= self.min_rating
+
+    def split(self, events):
+        """Retourne (interactions d'entraînement, {user_id: films pertinents}, date de coupure)"""
+        cutoff = int(len(events) * self.train_ratio)
+        interactions = defaultdict(dict)
+        for _, _, _, user_id, movie_id, values in events[:cutoff]:
+            interactions[user_id].setdefault(movie_id, new_interaction()).update(values)
+
+        relevant = defaultdict(set)
+        for _, _, _, user_id, movie_id, values in events[cutoff:]:
+            if user_id in interactions and movie_id not in interactions[user_id] and self._is_positive(values):
+                relevant[user_id].add(movie_id)
+
+        users = sorted(relevant)
+        if self.max_users:
+            users = users[:self.max_users]
+        cutoff_date = events[cutoff][0] if cutoff < len(events) else None
+        return dict(interactions), {user_id: relevant[user_id] for user_id in users}, cutoff_date
+
+    def evaluate(self, methods=None):
+        methods = methods or list(RecommendationService.METHODS)
+        unknown = [method for method in methods if method not in RecommendationService.METHODS]
+        if unknown:
+            raise ValueError(f"Méthodes inconnues : {', '.join(unknown)}")
+
+        interactions, relevant, cutoff_date = self.split(self.load_events())
+        movies = RecommendationService().load_movies()
+        summary = {
+            'cutoff': cutoff_date.isoformat() if cutoff_date else None,
+            'train_users': len(interactions),
+            'evaluated_users': len(relevant),
+            'movies': len(movies),
+            'results': []
+        }
+        if not relevant:
+            return summary
+
+        pool_sizes = RecommendationService().get_pool_sizes()
+        # Un processus par méthode (spawn : pas d'état hérité du processus parent)
+        context = multiprocessing.get_context('spawn')
+        executors = [ProcessPoolExecutor(max_workers=1, mp_context=context) for _ in methods]
+        try:
+            futures = [
+                executor.submit(evaluate_method, method, interactions, movies, relevant, self.k, pool_sizes)
+                for executor, method in zip(executors, methods)
+            ]
+            summary['results'] = [future.result() for future in futures]
+        finally:
+            for executor in executors:
+                executor.shutdown()
+        return summary
@@ -3,38 +3,322 @@
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+import threading
+import time
 from collections import defaultdict
-from app.models import User, Movie, Rating, Review, Like, Recommendation
+from itertools import islice
+from flask import current_app, has_app_context
+from app.models import (User, Movie, Rating, Review, Like, Recommendation, UserNeighbor, UserNeighborDirty,
+                        Genre, Director)
+from app.models.genre import movie_genres
 from app.extensions import db
+from sqlalchemy import func
+from sqlalchemy.orm import aliased
+from app.utils.helpers import movie_card_options
 import pandas as pd
 
+
+def _chunks(values, size):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def new_interaction():
+    """Signaux d'un utilisateur sur un film (note, avis, like)"""
+    return {'rating': None, 'review_rating': None, 'review_text': None, 'liked': False}
+
+
+class RecommendationData:
+    """
+    Données d'un calcul de recommandations, chargées une seule fois et partagées
+    par les différentes méthodes (au lieu d'une requête par couple utilisateur/film) :
+    - interactions : {user_id: {movie_id: new_interaction()}}
+    - user_movie_scores : {user_id: {movie_id: score}} (scores strictement positifs)
+    - movies : {movie_id: {'genres', 'director', 'description'}}, chargé à la demande
+    """
+
+    def __init__(self, interactions, load_movies, score):
+        self.interactions = interactions
+        self.user_movie_scores = {}
+        for user_id, movies in interactions.items():
+            scores = {}
+            for movie_id, interaction in movies.items():
+                value = score(interaction)
+                if value > 0:
+                    scores[movie_id] = value
+            if scores:
+                self.user_movie_scores[user_id] = scores
+        self._load_movies = load_movies
+        self._movies = None
+        self._positive_reviews = None
+        self._movie_users = None
+        self._popular = None
+        self._movies_by_feature = {}
+
+    @property
+    def movies(self):
+        if self._movies is None:
+            self._movies = self._load_movies()
+        return self._movies
+
+    def positive_review_texts(self, movie_id):
+        """Textes des avis notés 4 ou plus pour un film"""
+        if self._positive_reviews is None:
+            self._positive_reviews = defaultdict(list)
+            for movies in self.interactions.values():
+                for other_movie_id, interaction in movies.items():
+                    rating = interaction['review_rating']
+                    if interaction['review_text'] and rating and rating >= 4:
+                        self._positive_reviews[other_movie_id].append(interaction['review_text'])
+        return self._positive_reviews.get(movie_id, [])
+
+    # Index des générateurs de candidats, construits au premier usage
+
+    @property
+    def movie_users(self):
+        """{movie_id: {user_id: score}}"""
+        if self._movie_users is None:
+            self._movie_users = defaultdict(dict)
+            for user_id, scores in self.user_movie_scores.items():
+                for movie_id, score in scores.items():
+                    self._movie_users[movie_id][user_id] = score
+        return self._movie_users
+
+    @property
+    def popular(self):
+        """Films ayant au moins une interaction, du plus au moins apprécié (somme des scores)"""
+        if self._popular is None:
+            popularity = {movie_id: sum(users.values()) for movie_id, users in self.movie_users.items()}
+            self._popular = sorted(popularity, key=lambda movie_id: (-popularity[movie_id], movie_id))
+        return self._popular
+
+    def movies_by(self, feature):
+        """{valeur: [movie_id]} pour 'genres' ou 'director', chaque liste triée par popularité"""
+        if feature not in self._movies_by_feature:
+            rank = {movie_id: position for position, movie_id in enumerate(self.popular)}
+            index = defaultdict(list)
+            for movie_id, movie in self.movies.items():
+                values = movie[feature] if feature == 'genres' else [movie[feature]]
+                for value in values:
+                    if value:
+                        index[value].append(movie_id)
+            for movie_ids in index.values():
+                movie_ids.sort(key=lambda movie_id: (rank.get(movie_id, len(rank)), movie_id))
+            self._movies_by_feature[feature] = index
+        return self._movies_by_feature[feature]
+
+
 class RecommendationService:
+
+    # Méthodes de recommandation disponibles : nom -> méthode (user_id, n_recommendations, data)
+    METHODS = {
+        'collaborative': 'collaborative_filtering_user_based',
+        'content': 'content_based_filtering',
+        'hybrid': 'candidate_pipeline_recommendation',
+        'hybrid_full': 'hybrid_recommendation'
+    }
+
+    # Générateurs de candidats du pipeline : nom -> méthode (user_id, préférences, taille, data)
+    CANDIDATE_GENERATORS = {
+        'popular': 'popular_candidates',
+        'genre': 'same_genre_candidates',
+        'director': 'same_director_candidates',
+        'co_liked': 'co_liked_candidates'
+    }
+    DEFAULT_POOL_SIZES = {'popular': 100, 'genre': 100, 'director': 50, 'co_liked': 150}
+
+    # Démarrage à froid : seuil d'interactions, taille et durée de vie de la liste de repli
+    COLD_START_THRESHOLD = 3
+    COLD_START_SIZE = 50
+    COLD_START_TTL = 600
+
+    # Nombre de voisins conservés par utilisateur (user_neighbors)
+    NEIGHBORS_K = 20
+
+    # Score au-delà duquel un film compte comme apprécié (préférences, co-likes)
+    LIKED_THRESHOLD = 0.6
+    # Utilisateurs parcourus au plus par film apprécié (co-likes), pour borner le coût
+    CO_LIKED_MAX_USERS = 200
+    # Genres / réalisateurs préférés parcourus au plus par générateur (les plus pondérés)
+    CANDIDATE_MAX_VALUES = 10
     
-    def __init__(self):
+    def __init__(self, pool_sizes=None):
         self.user_similarity_matrix = None
         self.movie_similarity_matrix = None
-    
-    def calculate_user_score(self, user_id, movie_id):
+        self.pool_sizes = pool_sizes
+        self._fallback_lock = threading.Lock()
+        self._fallback = (0.0, 0, None)  # (expiration, taille demandée, [(movie_id, score)])
+        self._profiles = None
+
+    @staticmethod
+    def _setting(name, default):
+        # Hors contexte d'application (processus d'évaluation) : valeurs par défaut
+        return current_app.config.get(name, default) if has_app_context() else default
+
+    def get_pool_sizes(self):
+        """Tailles des réserves de candidats : constructeur, sinon RECOMMENDATION_POOL_SIZES"""
+        if self.pool_sizes is not None:
+            return self.pool_sizes
+        return self._setting('RECOMMENDATION_POOL_SIZES', self.DEFAULT_POOL_SIZES)
+
+    # Démarrage à froid : utilisateurs sans historique suffisant
+
+    def interaction_count(self, user_id, limit=None, data=None):
+        """
+        Nombre d'interactions (notes, avis, likes) de l'utilisateur, plafonné à `limit` :
+        trois parcours d'index bornés en une requête, indépendants de la taille des tables.
+        """
+        if data is not None:
+            count = len(data.interactions.get(user_id, {}))
+            return min(count, limit) if limit else count
+
+        counts = []
+        for model in (Rating, Review, Like):
+            rows = db.select(model.id).where(model.user_id == user_id)
+            if limit:
+                rows = rows.limit(limit)
+            counts.append(db.select(func.count()).select_from(rows.subquery()).scalar_subquery())
+        count = db.session.execute(db.select(counts[0] + counts[1] + counts[2])).scalar()
+        return min(count, limit) if limit else count
+
+    def is_cold_start(self, user_id, data=None):
+        threshold = self._setting('RECOMMENDATION_COLD_START_THRESHOLD', self.COLD_START_THRESHOLD)
+        return self.interaction_count(user_id, threshold, data) < threshold
+
+    def _popular_fallback(self, size):
+        """Films populaires (même pondération que /recommendations/popular), scores ramenés à [0, 1]"""
+        avg_ratings = db.select(Rating.movie_id, func.avg(Rating.rating).label('avg_rating'))\
+            .group_by(Rating.movie_id).subquery()
+        review_counts = db.select(Review.movie_id, func.count(Review.id).label('review_count'))\
+            .group_by(Review.movie_id).subquery()
+        score = (func.coalesce(avg_ratings.c.avg_rating, 0) * 0.4 +
+                 Movie.like_count * 0.3 +
+                 func.coalesce(review_counts.c.review_count, 0) * 0.3)
+
+        rows = db.session.execute(
+            db.select(Movie.id, score)
+            .outerjoin(avg_ratings, Movie.id == avg_ratings.c.movie_id)
+            .outerjoin(review_counts, Movie.id == review_counts.c.movie_id)
+            .order_by(score.desc(), Movie.id)
+            .limit(size)
+        ).all()
+        top = float(rows[0][1] or 0) if rows else 0
+        return [(movie_id, float(value) / top if top else 0.0) for movie_id, value in rows]
+
+    @staticmethod
+    def seen_movie_ids(user_id):
+        """Films notés, commentés ou likés par l'utilisateur (une requête sur les index user_id)"""
+        seen = db.union(*(db.select(model.movie_id).where(model.user_id == user_id)
+                          for model in (Rating, Review, Like)))
+        return set(db.session.execute(seen).scalars())
+
+    def cold_start_recommendations(self, user_id, n_recommendations=10, data=None):
+        """
+        Liste de repli précalculée, servie depuis le cache (TTL) sans calcul de modèle,
+        privée des films déjà vus par l'utilisateur.
+        """
+        if data is not None:
+            seen = data.interactions.get(user_id, {})
+            popular = [movie_id for movie_id in data.popular if movie_id not in seen][:n_recommendations]
+            scores = {movie_id: sum(data.movie_users[movie_id].values()) for movie_id in popular}
+            top = scores[popular[0]] if popular else 0
+            return [(movie_id, scores[movie_id] / top if top else 0.0) for movie_id in popular]
+
+        seen = self.seen_movie_ids(user_id)
+        # Marge pour les films vus (moins que le seuil de démarrage à froid)
+        size = max(self._setting('RECOMMENDATION_COLD_START_SIZE', self.COLD_START_SIZE),
+                   n_recommendations + len(seen))
+        ttl = self._setting('RECOMMENDATION_COLD_START_TTL', self.COLD_START_TTL)
+        with self._fallback_lock:
+            expires_at, fetched, fallback = self._fallback
+            if fallback is None or time.time() >= expires_at or size > fetched:
+                fallback = self._popular_fallback(size)
+                self._fallback = (time.time() + ttl, size, fallback)
+        return [(movie_id, score) for movie_id, score in fallback if movie_id not in seen][:n_recommendations]
+
+    # Accès aux données : surchargés par l'évaluation hors ligne (instantané d'entraînement)
+
+    def load_interactions(self, user_ids=None, movie_ids=None):
+        """Interactions (toutes, ou des seuls utilisateurs / films donnés) en trois requêtes"""
+        interactions = defaultdict(dict)
+        if (user_ids is not None and not user_ids) or (movie_ids is not None and not movie_ids):
+            return interactions
+
+        def entry(user_id, movie_id):
+            return interactions[user_id].setdefault(movie_id, new_interaction())
+
+        def restrict(query, model):
+            if user_ids is not None:
+                query = query.filter(model.user_id.in_(list(user_ids)))
+            if movie_ids is not None:
+                query = query.filter(model.movie_id.in_(list(movie_ids)))
+            return query
+
+        for user_id, movie_id, rating in restrict(
+                db.session.query(Rating.user_id, Rating.movie_id, Rating.rating), Rating):
+            entry(user_id, movie_id)['rating'] = rating
+        for user_id, movie_id, rating, text in restrict(db.session.query(
+                Review.user_id, Review.movie_id, Review.rating, Review.review_text), Review):
+            interaction = entry(user_id, movie_id)
+            interaction['review_rating'] = rating
+            interaction['review_text'] = text
+        for user_id, movie_id in restrict(db.session.query(Like.user_id, Like.movie_id), Like):
+            entry(user_id, movie_id)['liked'] = True
+        return interactions
+
+    def load_movies(self, movie_ids=None):
+        """Genres, réalisateur et description de tous les films, ou des seuls films donnés"""
+        query = Movie.query.options(*movie_card_options())
+        if movie_ids is not None:
+            if not movie_ids:
+                return {}
+            query = query.filter(Movie.id.in_(list(movie_ids)))
+        return {
+            movie.id: {
+                'genres': [genre.name for genre in movie.genres],
+                'director': movie.director.name if movie.director else None,
+                'description': movie.description
+            }
+            for movie in query
+        }
+
+    def load_data(self):
+        return RecommendationData(self.load_interactions(), self.load_movies, self.score_interaction)
+
+    def score_interaction(self, interaction):
         score = 0.0
 
-        rating = Rating.query.filter_by(user_id=user_id, movie_id=movie_id).first()
-        if rating and rating.rating:
-            score += (rating.rating / 5.0) * 0.4
+        if interaction['rating']:
+            score += (interaction['rating'] / 5.0) * 0.4
 
-        review = Review.query.filter_by(user_id=user_id, movie_id=movie_id).first()
-        if review:
-            if review.rating:
-                score += (review.rating / 5.0) * 0.3
+        if interaction['review_text'] is not None:
+            if interaction['review_rating']:
+                score += (interaction['review_rating'] / 5.0) * 0.3
             else:
-                sentiment_score = self.analyze_review_sentiment(review.review_text)
+                sentiment_score = self.analyze_review_sentiment(interaction['review_text'])
                 score += sentiment_score * 0.3
 
-        like = Like.query.filter_by(user_id=user_id, movie_id=movie_id).first()
-        if like:
+        if interaction['liked']:
             score += 0.3
-        
+
         return min(score, 1.0)
     
+    def calculate_user_score(self, user_id, movie_id):
+        interaction = new_interaction()
+
+        rating = Rating.query.filter_by(user_id=user_id, movie_id=movie_id).first()
+        if rating:
+            interaction['rating'] = rating.rating
+
+        review = Review.query.filter_by(user_id=user_id, movie_id=movie_id).first()
+        if review:
+            interaction['review_rating'] = review.rating
+            interaction['review_text'] = review.review_text
+
+        interaction['liked'] = Like.query.filter_by(user_id=user_id, movie_id=movie_id).first() is not None
+        return self.score_interaction(interaction)
+    
     def analyze_review_sentiment(self, review_text):
         positive_words = ['excellent', 'génial', 'super', 'parfait', 'incroyable', 
                           'fantastique', 'merveilleux', 'brillant', 'magnifique']
@@ -50,20 +334,11 @@ class RecommendationService:
         
         return positive_count / (positive_count + negative_count)
     
-    def build_user_movie_matrix(self):
-        users = User.query.all()
-        movies = Movie.query.all()
-        user_movie_scores = defaultdict(dict)
-        
-        for user in users:
-            for movie in movies:
-                score = self.calculate_user_score(user.id, movie.id)
-                if score > 0:
-                    user_movie_scores[user.id][movie.id] = score
-        return user_movie_scores
+    def build_user_movie_matrix(self, data=None):
+        return (data or self.load_data()).user_movie_scores
     
-    def collaborative_filtering_user_based(self, target_user_id, n_recommendations=10):
-        user_movie_scores = self.build_user_movie_matrix()
+    def collaborative_filtering_user_based(self, target_user_id, n_recommendations=10, data=None):
+        user_movie_scores = self.build_user_movie_matrix(data)
         if target_user_id not in user_movie_scores:
             return []
         
@@ -109,70 +384,89 @@ class RecommendationService:
         
         return np.dot(scores1, scores2) / (np.linalg.norm(scores1) * np.linalg.norm(scores2))
     
-    def content_based_filtering(self, target_user_id, n_recommendations=10):
-        user_preferences = self.get_user_preferences(target_user_id)
+    def content_based_filtering(self, target_user_id, n_recommendations=10, data=None):
+        # Sans instantané fourni : profil matérialisé, seules les caractéristiques des films sont chargées
+        user_preferences = self.get_user_preferences(target_user_id, data)
         if not user_preferences:
             return []
         
-        user_movie_scores = self.build_user_movie_matrix()
-        seen_movies = set(user_movie_scores.get(target_user_id, {}).keys())
-        
-        all_movies = Movie.query.all()
-        unseen_movies = [movie for movie in all_movies if movie.id not in seen_movies]
+        seen_movies = set(user_preferences['movie_scores'])
+        movies = data.movies if data is not None else self.load_movies()
         
         recommendations = []
-        for movie in unseen_movies:
+        for movie_id, movie in movies.items():
+            if movie_id in seen_movies:
+                continue
             score = self.calculate_content_similarity(user_preferences, movie)
             if score > 0:
-                recommendations.append((movie.id, score))
+                recommendations.append((movie_id, score))
         
         recommendations.sort(key=lambda x: x[1], reverse=True)
         return recommendations[:n_recommendations]
     
-    def get_user_preferences(self, user_id):
+    @property
+    def profiles(self):
+        """Service des profils matérialisés, créé une fois par instance"""
+        if self._profiles is None:
+            # Import local : user_profile_service dépend de ce module
+            from app.services.user_profile_service import UserProfileService
+            self._profiles = UserProfileService(self)
+        return self._profiles
+
+    def load_user_profile(self, user_id):
+        """Profil matérialisé (table user_profiles), calculé en mémoire s'il n'existe pas encore"""
+        return self.profiles.get(user_id)
+
+    def get_user_preferences(self, user_id, data=None):
+        """
+        Préférences (genres, réalisateurs, mots-clés) et scores des films vus :
+        lues dans le profil matérialisé, ou calculées sur `data` si fourni.
+        """
+        if data is None:
+            return self.load_user_profile(user_id)
+
+        user_scores = data.user_movie_scores.get(user_id, {})
         preferences = {
             'genres': defaultdict(float),
             'directors': defaultdict(float),
-            'keywords': []
+            'keywords': [],
+            'movie_scores': user_scores,
+            'interaction_count': len(user_scores)
         }
         
-        user_movie_scores = self.build_user_movie_matrix()
-        user_scores = user_movie_scores.get(user_id, {})
-        
         for movie_id, score in user_scores.items():
-            if score > 0.6:
-                movie = Movie.query.get(movie_id)
+            if score > self.LIKED_THRESHOLD:
+                movie = data.movies.get(movie_id)
                 if movie:
-                    for genre in movie.genres:
-                        preferences['genres'][genre.name] += score
-                    if movie.director:
-                        preferences['directors'][movie.director.name] += score
-                    reviews = Review.query.filter_by(movie_id=movie_id).all()
-                    for review in reviews:
-                        if review.rating and review.rating >= 4:
-                            preferences['keywords'].extend(review.review_text.lower().split())
+                    for genre in movie['genres']:
+                        preferences['genres'][genre] += score
+                    if movie['director']:
+                        preferences['directors'][movie['director']] += score
+                    for review_text in data.positive_review_texts(movie_id):
+                        preferences['keywords'].extend(review_text.lower().split())
         
         return preferences
     
     def calculate_content_similarity(self, user_preferences, movie):
+        """`movie` : caractéristiques issues de load_movies() (genres, director, description)"""
         score = 0.0
         
         genre_score = 0.0
         total_genre_weight = sum(user_preferences['genres'].values())
         if total_genre_weight > 0:
-            for genre in movie.genres:
-                if genre.name in user_preferences['genres']:
-                    genre_score += user_preferences['genres'][genre.name] / total_genre_weight
+            for genre in movie['genres']:
+                if genre in user_preferences['genres']:
+                    genre_score += user_preferences['genres'][genre] / total_genre_weight
         score += genre_score * 0.5
         
-        if movie.director and movie.director.name in user_preferences['directors']:
-            director_score = user_preferences['directors'][movie.director.name]
+        if movie['director'] and movie['director'] in user_preferences['directors']:
+            director_score = user_preferences['directors'][movie['director']]
             total_director_weight = sum(user_preferences['directors'].values())
             score += (director_score / total_director_weight) * 0.3
         
-        if movie.description and user_preferences['keywords']:
+        if movie['description'] and user_preferences['keywords']:
             keyword_score = self.calculate_keyword_similarity(
-                movie.description, 
+                movie['description'], 
                 user_preferences['keywords']
             )
             score += keyword_score * 0.2
@@ -186,9 +480,10 @@ class RecommendationService:
         similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
         return similarity[0][0]  # entre 0 et 1
     
-    def hybrid_recommendation(self, user_id, n_recommendations=10):
-        collaborative_recs = self.collaborative_filtering_user_based(user_id, n_recommendations * 2)
-        content_recs = self.content_based_filtering(user_id, n_recommendations * 2)
+    def hybrid_recommendation(self, user_id, n_recommendations=10, data=None):
+        data = data or self.load_data()
+        collaborative_recs = self.collaborative_filtering_user_based(user_id, n_recommendations * 2, data)
+        content_recs = self.content_based_filtering(user_id, n_recommendations * 2, data)
         
         combined_scores = defaultdict(float)
         
@@ -206,6 +501,213 @@ class RecommendationService:
         
         return final_recommendations[:n_recommendations]
     
+    # Pipeline en deux étapes : génération de candidats bornée, puis notation des seuls candidats.
+    # Avec un instantané (`data`, évaluation hors ligne), les générateurs lisent ses index en mémoire ;
+    # sans instantané, ce sont des requêtes indexées limitées par la taille des réserves.
+
+    def _liked_movies(self, user_id, data):
+        scores = data.user_movie_scores.get(user_id, {})
+        return sorted(
+            (movie_id for movie_id, score in scores.items() if score > self.LIKED_THRESHOLD),
+            key=lambda movie_id: -scores[movie_id]
+        )
+
+    @staticmethod
+    def _take(movie_ids, size, seen, pool):
+        """Ajoute à `pool` au plus `size` films non vus de `movie_ids`"""
+        added = 0
+        for movie_id in movie_ids:
+            if added >= size:
+                break
+            if movie_id not in seen and movie_id not in pool:
+                pool.append(movie_id)
+                added += 1
+        return pool
+
+    @staticmethod
+    def _most_liked(query, limit, exclude):
+        """Les `limit` films de `query` les plus likés (index ix_movies_like_count), hors `exclude`"""
+        if exclude:
+            query = query.where(Movie.id.notin_(list(exclude)))
+        return db.session.execute(query.order_by(Movie.like_count.desc(), Movie.id).limit(limit)).scalars().all()
+
+    def popular_candidates(self, user_id, preferences, size, data=None):
+        seen = preferences['movie_scores']
+        if data is not None:
+            return self._take(data.popular, size, seen, [])
+        return self._most_liked(db.select(Movie.id), size, seen)
+
+    def _feature_candidates(self, preferences, size, data, feature):
+        seen = preferences['movie_scores']
+        weights = preferences['genres' if feature == 'genres' else 'directors']
+        values = sorted((value for value, weight in weights.items() if weight > 0),
+                        key=lambda value: (-weights[value], value))[:self.CANDIDATE_MAX_VALUES]
+
+        # Tour à tour dans chaque genre / réalisateur préféré, les plus populaires d'abord
+        pool = []
+        per_value = max(1, size // max(1, len(values)))
+        for value in values:
+            if data is not None:
+                self._take(data.movies_by(feature).get(value, []), per_value, seen, pool)
+            else:
+                if feature == 'genres':
+                    query = db.select(Movie.id)\
+                        .join(movie_genres, movie_genres.c.movie_id == Movie.id)\
+                        .join(Genre, Genre.id == movie_genres.c.genre_id)\
+                        .where(Genre.name == value)
+                else:
+                    query = db.select(Movie.id).join(Director, Director.id == Movie.director_id)\
+                        .where(Director.name == value)
+                pool.extend(self._most_liked(query, per_value, set(seen) | set(pool)))
+            if len(pool) >= size:
+                break
+        return pool[:size]
+
+    def same_genre_candidates(self, user_id, preferences, size, data=None):
+        return self._feature_candidates(preferences, size, data, 'genres')
+
+    def same_director_candidates(self, user_id, preferences, size, data=None):
+        return self._feature_candidates(preferences, size, data, 'director')
+
+    def co_liked_candidates(self, user_id, preferences, size, data=None):
+        """
+        Films appréciés par les utilisateurs qui ont apprécié les mêmes films. En base,
+        l'appréciation est le like : une requête sur les index des likes, limitée à
+        CO_LIKED_MAX_USERS utilisateurs au total.
+        """
+        seen = preferences['movie_scores']
+        if data is None:
+            own, others = aliased(Like), aliased(Like)
+            likers = db.select(others.user_id).distinct()\
+                .where(others.movie_id.in_(db.select(own.movie_id).where(own.user_id == user_id)),
+                       others.user_id != user_id)\
+                .limit(self.CO_LIKED_MAX_USERS)
+            co_count = func.count(Like.id)
+            query = db.select(Like.movie_id).where(Like.user_id.in_(likers))
+            if seen:
+                query = query.where(Like.movie_id.notin_(list(seen)))
+            return db.session.execute(
+                query.group_by(Like.movie_id).order_by(co_count.desc(), Like.movie_id).limit(size)
+            ).scalars().all()
+
+        co_counts = defaultdict(int)
+        for movie_id in self._liked_movies(user_id, data):
+            users = islice(data.movie_users.get(movie_id, {}).items(), self.CO_LIKED_MAX_USERS)
+            for other_user_id, score in users:
+                if other_user_id == user_id or score <= self.LIKED_THRESHOLD:
+                    continue
+                for other_movie_id, other_score in data.user_movie_scores[other_user_id].items():
+                    if other_score > self.LIKED_THRESHOLD and other_movie_id not in seen:
+                        co_counts[other_movie_id] += 1
+        ranked = sorted(co_counts, key=lambda movie_id: (-co_counts[movie_id], movie_id))
+        return ranked[:size]
+
+    def generate_candidates(self, user_id, preferences, data=None):
+        candidates = set()
+        for name, size in self.get_pool_sizes().items():
+            if size > 0 and name in self.CANDIDATE_GENERATORS:
+                generator = getattr(self, self.CANDIDATE_GENERATORS[name])
+                candidates.update(generator(user_id, preferences, size, data))
+        return candidates
+
+    def find_similar_users(self, user_id, data, limit=20):
+        """
+        Utilisateurs les plus similaires, cherchés parmi ceux qui ont au moins deux
+        films en commun (condition de calculate_user_similarity) plutôt que parmi tous.
+        """
+        target_scores = data.user_movie_scores.get(user_id)
+        if not target_scores:
+            return []
+
+        common = defaultdict(int)
+        for movie_id in target_scores:
+            for other_user_id in data.movie_users.get(movie_id, {}):
+                if other_user_id != user_id:
+                    common[other_user_id] += 1
+
+        similarities = {}
+        for other_user_id, count in common.items():
+            if count >= 2:
+                similarity = self.calculate_user_similarity(target_scores, data.user_movie_scores[other_user_id])
+                if similarity > 0:
+                    similarities[other_user_id] = float(similarity)
+        return sorted(similarities.items(), key=lambda x: x[1], reverse=True)[:limit]
+
+    def stored_neighbors(self, user_id):
+        """[(neighbor_id, score)] précalculés (user_neighbors), lus sur l'index (user_id, score)"""
+        k = self._setting('USER_NEIGHBORS_K', self.NEIGHBORS_K)
+        return db.session.execute(
+            db.select(UserNeighbor.neighbor_id, UserNeighbor.score)
+            .where(UserNeighbor.user_id == user_id)
+            .order_by(UserNeighbor.score.desc())
+            .limit(k)
+        ).all()
+
+    def score_collaborative(self, similar_users, candidates, data):
+        """Score collaboratif des seuls candidats, à partir des voisins de l'utilisateur"""
+        scores = {}
+        for movie_id in candidates:
+            total_score = 0.0
+            total_similarity = 0.0
+            for other_user_id, similarity in similar_users:
+                score = data.user_movie_scores.get(other_user_id, {}).get(movie_id)
+                if score is not None:
+                    total_score += score * similarity
+                    total_similarity += similarity
+            if total_similarity > 0:
+                scores[movie_id] = total_score / total_similarity
+        return scores
+
+    def score_content(self, user_preferences, candidates, data):
+        scores = {}
+        for movie_id in candidates:
+            movie = data.movies.get(movie_id)
+            if movie:
+                score = self.calculate_content_similarity(user_preferences, movie)
+                if score > 0:
+                    scores[movie_id] = score
+        return scores
+
+    def candidate_pipeline_recommendation(self, user_id, n_recommendations=10, data=None):
+        """
+        Hybride en deux étapes : les générateurs (populaires, même genre, même
+        réalisateur, co-likés) fournissent des réserves bornées, puis seuls ces
+        candidats sont notés par les scores collaboratif et de contenu (0.7 / 0.3).
+
+        Sans instantané fourni, aucune table n'est lue en entier : profil matérialisé,
+        générateurs limités par la taille des réserves, voisins précalculés, puis un
+        instantané réduit aux interactions de ces voisins sur les candidats pour la
+        notation. Le coût dépend de la taille des réserves, pas de celle du catalogue.
+        """
+        if data is None:
+            preferences = self.load_user_profile(user_id)
+            candidates = self.generate_candidates(user_id, preferences)
+            similar_users = self.stored_neighbors(user_id)
+            scoring = RecommendationData(
+                self.load_interactions([neighbor_id for neighbor_id, _ in similar_users], candidates),
+                lambda: self.load_movies(candidates),
+                self.score_interaction
+            )
+        else:
+            preferences = self.get_user_preferences(user_id, data)
+            candidates = self.generate_candidates(user_id, preferences, data)
+            similar_users = self.find_similar_users(user_id, data)
+            scoring = data
+        if not candidates:
+            return []
+
+        collaborative = self.score_collaborative(similar_users, candidates, scoring)
+        content = self.score_content(preferences, candidates, scoring)
+
+        combined_scores = {}
+        for movie_id in candidates:
+            score = collaborative.get(movie_id, 0.0) * 0.7 + content.get(movie_id, 0.0) * 0.3
+            if score > 0:
+                combined_scores[movie_id] = score
+
+        final_recommendations = sorted(combined_scores.items(), key=lambda x: x[1], reverse=True)
+        return final_recommendations[:n_recommendations]
+    
     def save_recommendations_to_db(self, user_id, recommendations):
         Recommendation.query.filter_by(user_id=user_id).delete()
         for movie_id, score in recommendations:
@@ -217,22 +719,96 @@ class RecommendationService:
             db.session.add(recommendation)
         db.session.commit()
     
-    def generate_recommendations_for_user(self, user_id, method='hybrid', n_recommendations=10):
-        if method == 'collaborative':
-            recommendations = self.collaborative_filtering_user_based(user_id, n_recommendations)
-        elif method == 'content':
-            recommendations = self.content_based_filtering(user_id, n_recommendations)
-        else:
-            recommendations = self.hybrid_recommendation(user_id, n_recommendations)
-        
+    def _run_method(self, user_id, method, n_recommendations, data):
+        method_name = self.METHODS.get(method, self.METHODS['hybrid'])
+        return getattr(self, method_name)(user_id, n_recommendations, data=data)
+
+    def recommend(self, user_id, method='hybrid', n_recommendations=10, data=None):
+        """
+        Recommandations d'une méthode de METHODS (hybrid si la méthode est inconnue) ;
+        liste de repli pour les utilisateurs sous le seuil de démarrage à froid.
+        """
+        if self.is_cold_start(user_id, data):
+            return self.cold_start_recommendations(user_id, n_recommendations, data)
+        return self._run_method(user_id, method, n_recommendations, data)
+
+    def generate_recommendations_for_user(self, user_id, method='hybrid', n_recommendations=10, data=None):
+        if self.is_cold_start(user_id, data):
+            # Non enregistrée : la liste de repli serait périmée dès les premières interactions
+            return self.cold_start_recommendations(user_id, n_recommendations, data)
+
+        recommendations = self._run_method(user_id, method, n_recommendations, data)
         self.save_recommendations_to_db(user_id, recommendations)
         return recommendations
     
+    # Voisins précalculés (table user_neighbors)
+
+    @staticmethod
+    def neighbor_marks():
+        """{user_id: mark_count} des utilisateurs marqués, à lire avant de charger les données"""
+        return dict(db.session.query(UserNeighborDirty.user_id, UserNeighborDirty.mark_count))
+
+    def refresh_user_neighbors(self, all_users=False, data=None, marks=None):
+        """
+        Recalcule les voisins des utilisateurs marqués (ou de tous), ainsi que ceux
+        des utilisateurs qui les comptent parmi leurs voisins, et retourne leur nombre.
+
+        Les marquages sont lus avant les données (`data` fourni doit avoir été chargé
+        après `marks`) ; un utilisateur marqué de nouveau pendant le calcul le reste.
+        Approximation : un utilisateur qui ne compte pas encore un utilisateur marqué
+        parmi ses voisins mais devrait désormais le compter n'est pas recalculé ; il
+        le sera à son propre prochain marquage ou par `flask refresh-neighbors --all`.
+        """
+        marks = self.neighbor_marks() if marks is None else marks
+        data = data or self.load_data()
+        dirty = list(marks)
+        if all_users:
+            affected = set(data.user_movie_scores) | set(dirty)
+            affected.update(user_id for (user_id,) in db.session.query(UserNeighbor.user_id).distinct())
+        else:
+            affected = set(dirty)
+            for chunk in _chunks(dirty, 500):
+                affected.update(
+                    user_id for (user_id,) in
+                    db.session.query(UserNeighbor.user_id).filter(UserNeighbor.neighbor_id.in_(chunk))
+                )
+
+        k = self._setting('USER_NEIGHBORS_K', self.NEIGHBORS_K)
+        for chunk in _chunks(sorted(affected), 500):
+            db.session.execute(db.delete(UserNeighbor).where(UserNeighbor.user_id.in_(chunk)))
+            rows = [
+                {'user_id': user_id, 'neighbor_id': neighbor_id, 'score': score}
+                for user_id in chunk
+                for neighbor_id, score in self.find_similar_users(user_id, data, k)
+            ]
+            if rows:
+                db.session.execute(db.insert(UserNeighbor), rows)
+
+        # Seuls les marquages inchangés depuis leur lecture sont retirés
+        for chunk in _chunks(marks.items(), 500):
+            db.session.execute(db.delete(UserNeighborDirty).where(
+                db.tuple_(UserNeighborDirty.user_id, UserNeighborDirty.mark_count).in_(chunk)
+            ))
+        db.session.commit()
+        return len(affected)
+
+    def get_similar_users(self, user_id, limit=5):
+        """[(user_id, username, score)] depuis user_neighbors : une lecture indexée jointe aux utilisateurs"""
+        return db.session.query(UserNeighbor.neighbor_id, User.username, UserNeighbor.score)\
+            .join(User, User.id == UserNeighbor.neighbor_id)\
+            .filter(UserNeighbor.user_id == user_id)\
+            .order_by(UserNeighbor.score.desc())\
+            .limit(limit).all()
+
     def generate_recommendations_for_all_users(self):
         users = User.query.all()
+        # Interactions chargées une fois pour tous les utilisateurs, après lecture des marquages
+        marks = self.neighbor_marks()
+        data = self.load_data()
+        self.refresh_user_neighbors(data=data, marks=marks)
         for user in users:
             try:
-                self.generate_recommendations_for_user(user.id)
+                self.generate_recommendations_for_user(user.id, data=data)
                 print(f"Recommandations générées pour l'utilisateur {user.id}")
             except Exception as e:
                 print(f"Erreur pour l'utilisateur {user.id}: {e}")
@@ -0,0 +1,211 @@
+# service/search_service.py
+
+import re
+from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from app.extensions import db
+from app.models import Movie, Genre, Director, Actor
+from app.utils.helpers import movie_card_options
+from app.utils.text import name_key
+
+
+class SearchService:
+    """
+    Recherche plein texte sur le catalogue de films.
+
+    - PostgreSQL : colonne `movies.search_vector` (tsvector, index GIN) et
+      classement par pertinence avec `ts_rank_cd`.
+    - SQLite : table virtuelle FTS5 `movies_fts` (utilisée pour les tests).
+    - Autres moteurs : repli sur ILIKE.
+    """
+
+    FTS_TABLE = 'movies_fts'
+
+    def _dialect(self):
+        return db.engine.dialect.name
+
+    def _config(self):
+        return db.cast(current_app.config.get('SEARCH_TS_CONFIG', 'simple'), REGCONFIG)
+
+    @staticmethod
+    def _people(movie):
+        names = []
+        if movie.director:
+            names.append(movie.director.name)
+        names.extend(actor.name for actor in movie.actors)
+        names.extend(genre.name for genre in movie.genres)
+        return ' '.join(names)
+
+    def _ensure_fts(self):
+        # Vérifiée à chaque usage, sans état mémorisé : la table peut avoir été
+        # supprimée ou recréée par un autre processus, ou la base changée.
+        # Lorsqu'elle existe, l'instruction ne fait que consulter le schéma.
+        db.session.execute(db.text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.FTS_TABLE} "
+            "USING fts5(title, description, people, tokenize='unicode61 remove_diacritics 2')"
+        ))
+
+    def index_movie(self, movie):
+        """
+        Met à jour l'index de recherche d'un film (sans commit).
+        Le film doit avoir été flush pour disposer d'un identifiant.
+        """
+        dialect = self._dialect()
+        people = self._people(movie)
+
+        if dialect == 'postgresql':
+            config = self._config()
+            vector = (
+                func.setweight(func.to_tsvector(config, movie.title or ''), 'A')
+                .op('||')(func.setweight(func.to_tsvector(config, people), 'B'))
+                .op('||')(func.setweight(func.to_tsvector(config, movie.description or ''), 'C'))
+            )
+            db.session.execute(
+                db.update(Movie).where(Movie.id == movie.id).values(search_vector=vector)
+            )
+        elif dialect == 'sqlite':
+            self._ensure_fts()
+            db.session.execute(
+                db.text(
+                    f"INSERT OR REPLACE INTO {self.FTS_TABLE}(rowid, title, description, people) "
+                    "VALUES (:id, :title, :description, :people)"
+                ),
+                {
+                    'id': movie.id,
+                    'title': movie.title or '',
+                    'description': movie.description or '',
+                    'people': people
+                }
+            )
+
+    def index_movie_ids(self, movie_ids):
+        """
+        Indexe un ensemble de films en une instruction ensembliste (sans commit),
+        pour les imports en masse et la reconstruction complète.
+        """
+        movie_ids = list(movie_ids)
+        if not movie_ids:
+            return
+
+        dialect = self._dialect()
+        if dialect == 'postgresql':
+            statement = db.text("""
+                UPDATE movies AS m SET search_vector =
+                    setweight(to_tsvector(CAST(:config AS regconfig), coalesce(m.title, '')), 'A') ||
+                    setweight(to_tsvector(CAST(:config AS regconfig),
+                        coalesce(d.name, '') || ' ' ||
+                        coalesce((SELECT string_agg(a.name, ' ') FROM movie_actors ma
+                                  JOIN actors a ON a.id = ma.actor_id WHERE ma.movie_id = m.id), '') || ' ' ||
+                        coalesce((SELECT string_agg(g.name, ' ') FROM movie_genres mg
+                                  JOIN genres g ON g.id = mg.genre_id WHERE mg.movie_id = m.id), '')
+                    ), 'B') ||
+                    setweight(to_tsvector(CAST(:config AS regconfig), coalesce(m.description, '')), 'C')
+                FROM directors AS d
+                WHERE d.id = m.director_id AND m.id IN :ids
+            """)
+        elif dialect == 'sqlite':
+            self._ensure_fts()
+            statement = db.text(f"""
+                INSERT OR REPLACE INTO {self.FTS_TABLE}(rowid, title, description, people)
+                SELECT m.id, coalesce(m.title, ''), coalesce(m.description, ''),
+                       coalesce(d.name, '') || ' ' ||
+                       coalesce((SELECT group_concat(a.name, ' ') FROM movie_actors ma
+                                 JOIN actors a ON a.id = ma.actor_id WHERE ma.movie_id = m.id), '') || ' ' ||
+                       coalesce((SELECT group_concat(g.name, ' ') FROM movie_genres mg
+                                 JOIN genres g ON g.id = mg.genre_id WHERE mg.movie_id = m.id), '')
+                FROM movies AS m LEFT JOIN directors AS d ON d.id = m.director_id
+                WHERE m.id IN :ids
+            """)
+        else:
+            return
+
+        params = {'ids': movie_ids}
+        if dialect == 'postgresql':
+            params['config'] = current_app.config.get('SEARCH_TS_CONFIG', 'simple')
+        db.session.execute(statement.bindparams(db.bindparam('ids', expanding=True)), params)
+
+    def remove_movie(self, movie_id):
+        """Retire un film de l'index (sans commit)"""
+        if self._dialect() == 'sqlite':
+            self._ensure_fts()
+            db.session.execute(
+                db.text(f"DELETE FROM {self.FTS_TABLE} WHERE rowid = :id"),
+                {'id': movie_id}
+            )
+
+    def rebuild_index(self):
+        """Réindexe tout le catalogue et retourne le nombre de films traités"""
+        if self._dialect() == 'sqlite':
+            self._ensure_fts()
+            db.session.execute(db.text(f"DELETE FROM {self.FTS_TABLE}"))
+
+        movie_ids = [movie_id for (movie_id,) in db.session.query(Movie.id).order_by(Movie.id)]
+        for start in range(0, len(movie_ids), 1000):
+            self.index_movie_ids(movie_ids[start:start + 1000])
+        db.session.commit()
+        return len(movie_ids)
+
+    @staticmethod
+    def _fts5_query(text):
+        # Chaque mot devient un préfixe entre guillemets : la syntaxe FTS5
+        # saisie par l'utilisateur n'est jamais interprétée.
+        tokens = re.findall(r'\w+', text, flags=re.UNICODE)
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    def search(self, text='', genre='', director='', actor='', page=1, per_page=20):
+        """
+        Recherche paginée, triée par pertinence lorsque `text` est fourni.
+        Retourne un objet Pagination de Flask-SQLAlchemy.
+        """
+        movies_query = Movie.query.options(*movie_card_options(with_actors=True))
+        order_by = [Movie.id]
+
+        if text:
+            dialect = self._dialect()
+            if dialect == 'postgresql':
+                ts_query = func.websearch_to_tsquery(self._config(), text)
+                movies_query = movies_query.filter(Movie.search_vector.op('@@')(ts_query))
+                order_by = [func.ts_rank_cd(Movie.search_vector, ts_query).desc(), Movie.id]
+            elif dialect == 'sqlite':
+                self._ensure_fts()
+                fts_query = self._fts5_query(text)
+                if not fts_query:
+                    return movies_query.filter(db.false()).paginate(
+                        page=page, per_page=per_page, error_out=False
+                    )
+                matches = db.select(
+                    db.literal_column('rowid').label('movie_id'),
+                    db.literal_column('rank').label('rank')
+                ).select_from(db.table(self.FTS_TABLE)).where(
+                    db.text(f"{self.FTS_TABLE} MATCH :fts_query").bindparams(fts_query=fts_query)
+                ).subquery()
+                movies_query = movies_query.join(matches, Movie.id == matches.c.movie_id)
+                order_by = [matches.c.rank, Movie.id]
+            else:
+                movies_query = movies_query.filter(
+                    db.or_(
+                        Movie.title.ilike(f'%{text}%'),
+                        Movie.description.ilike(f'%{text}%')
+                    )
+                )
+
+        # EXISTS plutôt que des jointures : pas de doublons, donc pas de DISTINCT
+        if genre:
+            movies_query = movies_query.filter(Movie.genres.any(Genre.name.ilike(f'%{genre}%')))
+
+        # Sous-chaîne de la clé normalisée (sans accents ni espaces) : « renoir »
+        # trouve « Jean Renoir » ; servie par l'index de trigrammes sous PostgreSQL
+        if director:
+            movies_query = movies_query.filter(
+                Movie.director.has(Director.name_key.contains(name_key(director), autoescape=True))
+            )
+
+        if actor:
+            movies_query = movies_query.filter(
+                Movie.actors.any(Actor.name_key.contains(name_key(actor), autoescape=True))
+            )
+
+        return movies_query.order_by(*order_by).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
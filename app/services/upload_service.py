@@ -0,0 +1,286 @@
+# service/upload_service.py
+
+import hashlib
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from flask import current_app
+from werkzeug.utils import secure_filename
+from app.extensions import db
+from app.models import Movie, VideoUpload
+
+
+def unique_filename(filename):
+    """Nom de fichier sécurisé préfixé d'un identifiant aléatoire (pas de collision)"""
+    return f"{uuid.uuid4().hex[:12]}_{secure_filename(filename) or 'fichier'}"
+
+
+class UploadError(Exception):
+    def __init__(self, message, status=400, **details):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.details = details
+
+
+class UploadService:
+    """
+    Envoi de vidéos par morceaux : initialisation, ajout de morceaux, finalisation.
+
+    Chaque morceau est recopié par blocs depuis le flux de la requête directement
+    dans `<dossier vidéos>/<upload_id>.part`, sans passer par request.files.
+    L'empreinte SHA-256 est calculée au fil de l'eau ; si le processus a perdu
+    son état (redémarrage, autre worker), elle est recalculée depuis le fichier partiel.
+
+    Aucun verrou de ligne n'est tenu pendant la copie : un morceau réserve l'envoi
+    (`claim_token`, transaction courte) puis avance la position en vérifiant sa
+    réservation. Une réservation abandonnée expire après VIDEO_UPLOAD_CLAIM_TIMEOUT.
+    Les envois inactifs depuis VIDEO_UPLOAD_EXPIRY sont supprimés par `purge_stale`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hashes = {}  # upload_id -> (octets hachés, objet sha256)
+
+    @staticmethod
+    def _folder():
+        folder = current_app.config['VIDEO_UPLOAD_FOLDER']
+        os.makedirs(folder, exist_ok=True)
+        return folder
+
+    def _part_path(self, upload):
+        return os.path.join(self._folder(), f'{upload.id}.part')
+
+    def _hasher(self, upload, path):
+        """Retourne l'objet sha256 correspondant aux `received_size` premiers octets"""
+        with self._lock:
+            state = self._hashes.pop(upload.id, None)
+        if state and state[0] == upload.received_size:
+            return state[1]
+
+        hasher = hashlib.sha256()
+        remaining = upload.received_size
+        chunk_size = current_app.config['VIDEO_UPLOAD_CHUNK_SIZE']
+        if remaining:
+            with open(path, 'rb') as handle:
+                while remaining:
+                    chunk = handle.read(min(chunk_size, remaining))
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+                    remaining -= len(chunk)
+        return hasher
+
+    def initiate(self, user_id, filename, total_size, movie_id=None):
+        if (not filename or not isinstance(total_size, int) or isinstance(total_size, bool)
+                or total_size <= 0):
+            raise UploadError("Nom de fichier et taille (octets) requis")
+
+        max_size = current_app.config['VIDEO_UPLOAD_MAX_SIZE']
+        if total_size > max_size:
+            raise UploadError(f"Taille maximale autorisée : {max_size} octets", 413)
+
+        if movie_id is not None and not db.session.get(Movie, movie_id):
+            raise UploadError("Film non trouvé", 404)
+
+        upload = VideoUpload(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            movie_id=movie_id,
+            filename=secure_filename(filename) or 'video',
+            total_size=total_size,
+            received_size=0,
+            updated_at=datetime.utcnow()
+        )
+        db.session.add(upload)
+        open(self._part_path(upload), 'wb').close()
+        db.session.commit()
+        return upload
+
+    def get(self, upload_id, user_id):
+        upload = VideoUpload.query.filter_by(id=upload_id, user_id=user_id).first()
+        if not upload:
+            raise UploadError("Envoi introuvable", 404)
+        return upload
+
+    def _claim(self, upload):
+        """
+        Réserve l'envoi tel qu'il vient d'être lu (même position, aucune réservation
+        active) et valide aussitôt. Retourne le jeton, ou None si un autre l'a pris.
+        """
+        token = uuid.uuid4().hex
+        now = datetime.utcnow()
+        expired = now - timedelta(seconds=current_app.config['VIDEO_UPLOAD_CLAIM_TIMEOUT'])
+        claimed = db.session.execute(
+            db.update(VideoUpload)
+            .where(
+                VideoUpload.id == upload.id,
+                VideoUpload.status == 'pending',
+                VideoUpload.received_size == upload.received_size,
+                db.or_(VideoUpload.claim_token.is_(None), VideoUpload.updated_at < expired)
+            )
+            .values(claim_token=token, updated_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        return token if claimed else None
+
+    def _settle(self, upload_id, token, **values):
+        """Applique `values` et libère la réservation si elle est toujours détenue"""
+        settled = db.session.execute(
+            db.update(VideoUpload)
+            .where(VideoUpload.id == upload_id, VideoUpload.claim_token == token)
+            .values(claim_token=None, updated_at=datetime.utcnow(), **values)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        return bool(settled)
+
+    @staticmethod
+    def _check_position(upload, offset):
+        if upload.status != 'pending':
+            raise UploadError("Envoi déjà finalisé", 409)
+        if offset != upload.received_size:
+            raise UploadError("Position inattendue", 409, expected_offset=upload.received_size)
+
+    def append_part(self, upload_id, user_id, offset, stream, content_length=None):
+        """
+        Écrit un morceau à la position `offset`, qui doit être égale au nombre
+        d'octets déjà reçus (sinon 409 avec la position attendue pour reprendre).
+        """
+        upload = self.get(upload_id, user_id)
+        self._check_position(upload, offset)
+
+        max_part = current_app.config['VIDEO_UPLOAD_MAX_PART_SIZE']
+        limit = min(max_part, upload.total_size - upload.received_size)
+        if content_length is not None and content_length > limit:
+            raise UploadError(f"Morceau trop volumineux (maximum {limit} octets)", 413)
+
+        path = self._part_path(upload)
+        hasher = self._hasher(upload, path)
+        token = self._claim(upload)
+        if not token:
+            # Position avancée entre-temps, ou autre morceau en cours
+            db.session.refresh(upload)
+            self._check_position(upload, offset)
+            raise UploadError("Un morceau est déjà en cours d'envoi", 409, expected_offset=offset)
+
+        chunk_size = current_app.config['VIDEO_UPLOAD_CHUNK_SIZE']
+        written = 0
+        try:
+            with open(path, 'r+b') as handle:
+                # Un morceau interrompu précédemment est écrasé
+                handle.seek(offset)
+                handle.truncate()
+                while True:
+                    chunk = stream.read(chunk_size)
+                    if not chunk:
+                        break
+                    written += len(chunk)
+                    if written > limit:
+                        handle.truncate(offset)
+                        raise UploadError(f"Morceau trop volumineux (maximum {limit} octets)", 413)
+                    handle.write(chunk)
+                    hasher.update(chunk)
+        except BaseException:
+            self._settle(upload_id, token)
+            db.session.commit()
+            raise
+
+        if not self._settle(upload_id, token, received_size=offset + written):
+            db.session.commit()
+            raise UploadError("Réservation expirée, morceau à renvoyer", 409, expected_offset=offset)
+        db.session.commit()
+
+        with self._lock:
+            self._hashes[upload_id] = (offset + written, hasher)
+        return self.get(upload_id, user_id)
+
+    def _final_path(self, upload):
+        return os.path.join(self._folder(), os.path.basename(upload.video_path))
+
+    def _move(self, upload):
+        """Déplace le fichier partiel d'un envoi finalisé ; sans effet si c'est déjà fait"""
+        part_path = self._part_path(upload)
+        if os.path.exists(part_path):
+            os.replace(part_path, self._final_path(upload))
+
+    def complete(self, upload_id, user_id, movie_id=None):
+        """
+        Vérifie la taille, finalise l'empreinte, valide l'envoi puis renomme le
+        fichier. Un appel répété termine un renommage interrompu.
+        """
+        upload = self.get(upload_id, user_id)
+        if upload.status == 'completed':
+            self._move(upload)
+            return upload
+        if upload.received_size != upload.total_size:
+            raise UploadError("Envoi incomplet", 409, expected_offset=upload.received_size)
+
+        movie_id = movie_id or upload.movie_id
+        if movie_id and not db.session.get(Movie, movie_id):
+            raise UploadError("Film non trouvé", 404)
+
+        part_path = self._part_path(upload)
+        hasher = self._hasher(upload, part_path)
+        token = self._claim(upload)
+        if not token:
+            db.session.refresh(upload)
+            if upload.status == 'completed':
+                self._move(upload)
+                return upload
+            raise UploadError("Envoi en cours de modification", 409, expected_offset=upload.received_size)
+
+        digest = hasher.hexdigest()
+        video_path = f'/static/videos/{digest[:16]}_{upload.filename}'
+        if not self._settle(upload_id, token, sha256=digest, status='completed',
+                            movie_id=movie_id, video_path=video_path):
+            db.session.commit()
+            raise UploadError("Réservation expirée, finalisation à relancer", 409)
+        if movie_id:
+            db.session.get(Movie, movie_id).video_file_path = video_path
+        # Validé avant le renommage : en cas d'échec, un nouvel appel le termine
+        db.session.commit()
+
+        with self._lock:
+            self._hashes.pop(upload_id, None)
+        upload = self.get(upload_id, user_id)
+        self._move(upload)
+        return upload
+
+    def purge_stale(self):
+        """
+        Supprime les envois non finalisés inactifs depuis VIDEO_UPLOAD_EXPIRY et
+        les fichiers partiels sans envoi ; termine les renommages interrompus.
+        Retourne {'uploads': lignes supprimées, 'files': fichiers supprimés}.
+        """
+        max_age = current_app.config['VIDEO_UPLOAD_EXPIRY']
+        expired = datetime.utcnow() - timedelta(seconds=max_age)
+        stale = db.session.execute(
+            db.delete(VideoUpload)
+            .where(VideoUpload.status == 'pending', VideoUpload.updated_at < expired)
+            .returning(VideoUpload.id)
+        ).scalars().all()
+        db.session.commit()
+
+        folder = self._folder()
+        parts = {name[:-len('.part')]: os.path.join(folder, name)
+                 for name in os.listdir(folder) if name.endswith('.part')}
+        known = {
+            upload.id: upload for upload in
+            VideoUpload.query.filter(VideoUpload.id.in_(parts))
+        } if parts else {}
+
+        removed = 0
+        for upload_id, path in parts.items():
+            upload = known.get(upload_id)
+            if upload is not None and upload.status == 'completed':
+                self._move(upload)
+            elif upload is None and os.path.getmtime(path) < time.time() - max_age:
+                os.remove(path)
+                removed += 1
+        return {'uploads': len(stale), 'files': removed}
+
+
+upload_service = UploadService()
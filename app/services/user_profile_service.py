@@ -0,0 +1,201 @@
+# service/user_profile_service.py
+
+from collections import Counter, defaultdict
+from app.extensions import db
+from app.models import Movie, Rating, Review, Like, UserProfile
+from app.services.recommendation_service import RecommendationService, new_interaction
+from app.utils.helpers import movie_card_options
+from app.utils.upsert import insert_on_conflict
+
+
+class UserProfileService:
+    """
+    Profils de préférences matérialisés (table user_profiles).
+
+    Un profil contient les mêmes informations que get_user_preferences :
+    poids des genres et réalisateurs des films appréciés (score > LIKED_THRESHOLD),
+    occurrences des mots des avis positifs de ces films, ainsi que le score de
+    chaque film vu. Il est mis à jour de façon incrémentale pour les seuls films
+    touchés par une écriture : la contribution enregistrée du film (celle ajoutée
+    la dernière fois) est retirée, la nouvelle ajoutée. `flask rebuild-profiles`
+    recalcule tout (par exemple pour intégrer les avis laissés ensuite par
+    d'autres utilisateurs ou les genres modifiés).
+    """
+
+    def __init__(self, recommendation_service=None):
+        self.recommendations = recommendation_service or RecommendationService()
+
+    @staticmethod
+    def _interactions(user_id, movie_ids=None):
+        """{movie_id: interaction} de l'utilisateur (trois lectures indexées sur user_id)"""
+        interactions = defaultdict(new_interaction)
+
+        def restrict(query, model):
+            query = query.filter(model.user_id == user_id)
+            return query.filter(model.movie_id.in_(movie_ids)) if movie_ids is not None else query
+
+        for movie_id, rating in restrict(db.session.query(Rating.movie_id, Rating.rating), Rating):
+            interactions[movie_id]['rating'] = rating
+        for movie_id, rating, text in restrict(
+                db.session.query(Review.movie_id, Review.rating, Review.review_text), Review):
+            interactions[movie_id]['review_rating'] = rating
+            interactions[movie_id]['review_text'] = text
+        for (movie_id,) in restrict(db.session.query(Like.movie_id), Like):
+            interactions[movie_id]['liked'] = True
+        return interactions
+
+    @staticmethod
+    def _movie_features(movie_ids):
+        """Genres, réalisateur et occurrences des mots des avis positifs des films donnés"""
+        movie_ids = list(movie_ids)
+        if not movie_ids:
+            return {}
+
+        features = {
+            movie.id: {
+                'genres': [genre.name for genre in movie.genres],
+                'director': movie.director.name if movie.director else None,
+                'keywords': Counter()
+            }
+            for movie in Movie.query.options(*movie_card_options()).filter(Movie.id.in_(movie_ids))
+        }
+        for movie_id, text in db.session.query(Review.movie_id, Review.review_text)\
+                .filter(Review.movie_id.in_(movie_ids), Review.rating >= 4):
+            if movie_id in features:
+                features[movie_id]['keywords'].update(text.lower().split())
+        return features
+
+    @staticmethod
+    def _apply(profile, score, features, sign):
+        for genre in features['genres']:
+            profile['genres'][genre] += sign * score
+        if features['director']:
+            profile['directors'][features['director']] += sign * score
+        for keyword, count in features['keywords'].items():
+            profile['keywords'][keyword] += sign * count
+
+    def _add(self, profile, movie_id, score, features):
+        """Ajoute le film au profil et enregistre sa contribution s'il est apprécié"""
+        profile['movie_scores'][movie_id] = score
+        if score > self.recommendations.LIKED_THRESHOLD and features:
+            self._apply(profile, score, features, 1)
+            profile['contributions'][movie_id] = features
+
+    def _remove(self, profile, movie_id):
+        """Retire exactement ce que le film avait ajouté au profil"""
+        score = profile['movie_scores'].pop(movie_id, 0.0)
+        features = profile['contributions'].pop(movie_id, None)
+        if features:
+            self._apply(profile, score, features, -1)
+
+    @staticmethod
+    def _empty():
+        return {
+            'genres': defaultdict(float),
+            'directors': defaultdict(float),
+            'keywords': defaultdict(int),
+            'movie_scores': {},
+            'contributions': {}
+        }
+
+    def _save(self, user_id, profile):
+        # Les poids revenus à zéro (contributions retirées, aux arrondis près) sont supprimés
+        row = {
+            'user_id': user_id,
+            'genre_weights': {k: v for k, v in profile['genres'].items() if abs(v) > 1e-9},
+            'director_weights': {k: v for k, v in profile['directors'].items() if abs(v) > 1e-9},
+            'keyword_counts': {k: v for k, v in profile['keywords'].items() if v != 0},
+            'movie_scores': {str(k): v for k, v in profile['movie_scores'].items()},
+            'movie_contributions': {str(k): v for k, v in profile['contributions'].items()},
+            'interaction_count': len(profile['movie_scores']),
+            'updated_at': db.func.current_timestamp()
+        }
+        db.session.execute(insert_on_conflict(
+            UserProfile, row, index_elements=['user_id'],
+            update_fields=[field for field in row if field != 'user_id']
+        ))
+
+    def _build(self, user_id):
+        """Profil complet d'un utilisateur, calculé à partir de ses interactions"""
+        profile = self._empty()
+        scores = {}
+        for movie_id, interaction in self._interactions(user_id).items():
+            score = self.recommendations.score_interaction(interaction)
+            if score > 0:
+                scores[movie_id] = score
+
+        features = self._movie_features(scores)
+        for movie_id, score in scores.items():
+            self._add(profile, movie_id, score, features.get(movie_id))
+        return profile
+
+    def rebuild(self, user_id):
+        """Recalcule entièrement le profil d'un utilisateur (sans commit)"""
+        profile = self._build(user_id)
+        self._save(user_id, profile)
+        return profile
+
+    def update(self, user_id, movie_ids):
+        """Met à jour le profil pour les films dont les interactions viennent de changer (sans commit)"""
+        stored = db.session.get(UserProfile, user_id)
+        if stored is None or stored.movie_contributions is None:
+            return self.rebuild(user_id)
+
+        profile = self._empty()
+        profile['genres'].update(stored.genre_weights or {})
+        profile['directors'].update(stored.director_weights or {})
+        profile['keywords'].update(stored.keyword_counts or {})
+        profile['movie_scores'] = {int(k): v for k, v in (stored.movie_scores or {}).items()}
+        profile['contributions'] = {int(k): v for k, v in stored.movie_contributions.items()}
+
+        movie_ids = set(movie_ids)
+        interactions = self._interactions(user_id, movie_ids)
+        features = self._movie_features(movie_ids)
+        for movie_id in movie_ids:
+            self._remove(profile, movie_id)
+
+            score = self.recommendations.score_interaction(interactions[movie_id]) \
+                if movie_id in interactions else 0.0
+            if score > 0:
+                self._add(profile, movie_id, score, features.get(movie_id))
+
+        self._save(user_id, profile)
+        return profile
+
+    def get(self, user_id):
+        """
+        Préférences au format de get_user_preferences (keywords en liste), plus
+        movie_scores et interaction_count. Lecture seule : un profil manquant est
+        calculé en mémoire, puis enregistré à la prochaine écriture de l'utilisateur
+        ou par `flask rebuild-profiles`.
+        """
+        stored = db.session.get(UserProfile, user_id)
+        if stored is None:
+            profile = self._build(user_id)
+            genres, directors = profile['genres'], profile['directors']
+            keywords, movie_scores = profile['keywords'], profile['movie_scores']
+        else:
+            genres, directors = stored.genre_weights or {}, stored.director_weights or {}
+            keywords = stored.keyword_counts or {}
+            movie_scores = {int(k): v for k, v in (stored.movie_scores or {}).items()}
+
+        return {
+            'genres': defaultdict(float, genres),
+            'directors': defaultdict(float, directors),
+            'keywords': [word for word, count in keywords.items() for _ in range(max(0, count))],
+            'movie_scores': movie_scores,
+            'interaction_count': len(movie_scores)
+        }
+
+    def rebuild_all(self):
+        """Recalcule les profils existants et ceux de tous les utilisateurs ayant des interactions"""
+        user_ids = {user_id for (user_id,) in db.session.query(UserProfile.user_id)}
+        for model in (Rating, Review, Like):
+            user_ids.update(user_id for (user_id,) in db.session.query(model.user_id).distinct())
+        for user_id in user_ids:
+            self.rebuild(user_id)
+        db.session.commit()
+        return len(user_ids)
+
+
+user_profile_service = UserProfileService()
@@ -0,0 +1,122 @@
+# service/user_stats_service.py
+
+import threading
+import time
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import func
+from app.extensions import db
+from app.models import Movie, Rating, Review, Like, User, UserStats
+from app.utils.upsert import insert_on_conflict
+
+
+class UserStatsService:
+    """
+    Compteurs par utilisateur (table user_stats) pour /recommendations/stats.
+
+    Chaque écriture applique ses variations (note ajoutée, écart entre nouvelle
+    et ancienne note, like ± 1, avis ± 1) par un INSERT ... ON CONFLICT qui
+    incrémente la ligne dans la même transaction : le coût ne dépend pas du
+    nombre d'interactions de l'utilisateur et la lecture se réduit à une clé
+    primaire. Le recalcul complet (`recount`) ne sert qu'au rattrapage et à la
+    réparation (commande `flask recompute-user-stats`).
+
+    Les statistiques globales (/recommendations/admin/stats) sont un instantané
+    par processus, recalculé au plus toutes les GLOBAL_STATS_MAX_AGE secondes.
+    """
+
+    def __init__(self):
+        self._global_lock = threading.Lock()
+        self._global = (0.0, None)  # (expiration, statistiques)
+
+    @staticmethod
+    def _aggregates(user_id):
+        def scalar(column, model):
+            return db.select(column).where(model.user_id == user_id).scalar_subquery()
+
+        return {
+            'rating_count': scalar(func.count(Rating.id), Rating),
+            'rating_sum': scalar(func.coalesce(func.sum(Rating.rating), 0), Rating),
+            'like_count': scalar(func.count(Like.id), Like),
+            'review_count': scalar(func.count(Review.id), Review)
+        }
+
+    def add(self, user_id, rating_count=0, rating_sum=0.0, like_count=0, review_count=0):
+        """Applique les variations d'une écriture aux compteurs de l'utilisateur (sans commit)"""
+        if not (rating_count or rating_sum or like_count or review_count):
+            return
+        row = {
+            'user_id': user_id,
+            'rating_count': rating_count,
+            'rating_sum': rating_sum,
+            'like_count': like_count,
+            'review_count': review_count,
+            'updated_at': func.current_timestamp()
+        }
+        db.session.execute(insert_on_conflict(
+            UserStats, row, index_elements=['user_id'],
+            update_fields=['updated_at'],
+            increment_fields=['rating_count', 'rating_sum', 'like_count', 'review_count']
+        ))
+
+    def recount(self, user_id):
+        """Recalcule entièrement les compteurs de l'utilisateur (sans commit) ; rattrapage et réparation"""
+        row = {'user_id': user_id, **self._aggregates(user_id), 'updated_at': func.current_timestamp()}
+        db.session.execute(insert_on_conflict(
+            UserStats, row, index_elements=['user_id'],
+            update_fields=[field for field in row if field != 'user_id']
+        ))
+
+    def recount_all(self):
+        """Recalcule les compteurs de tous les utilisateurs"""
+        user_ids = db.session.execute(db.select(User.id)).scalars().all()
+        for user_id in user_ids:
+            self.recount(user_id)
+        db.session.commit()
+        return len(user_ids)
+
+    def get(self, user_id):
+        stats = db.session.get(UserStats, user_id)
+        if stats is None:
+            # Utilisateur sans ligne (aucune écriture depuis la migration) : agrégats
+            # calculés à la volée, sans rien écrire pendant une lecture
+            stats = db.session.execute(db.select(*(
+                value.label(field) for field, value in self._aggregates(user_id).items()
+            ))).one()
+
+        return {
+            'total_ratings': stats.rating_count,
+            'total_likes': stats.like_count,
+            'total_reviews': stats.review_count,
+            'avg_rating_given': round(stats.rating_sum / stats.rating_count, 2) if stats.rating_count else 0
+        }
+
+    @staticmethod
+    def _compute_global():
+        """Les quatre agrégats en une seule requête"""
+        row = db.session.execute(db.select(
+            db.select(func.count(Movie.id)).scalar_subquery().label('total_movies'),
+            db.select(func.count(Review.id)).scalar_subquery().label('total_reviews'),
+            db.select(func.count(Rating.id)).scalar_subquery().label('total_ratings'),
+            db.select(func.avg(Rating.rating)).scalar_subquery().label('avg_rating')
+        )).one()
+        return {
+            'total_movies': row.total_movies,
+            'total_reviews': row.total_reviews,
+            'total_ratings': row.total_ratings,
+            'avg_rating': round(row.avg_rating or 0.0, 2),
+            'computed_at': datetime.utcnow().isoformat()
+        }
+
+    def global_stats(self):
+        max_age = current_app.config['GLOBAL_STATS_MAX_AGE']
+        # Un seul calcul à la fois : les requêtes concurrentes attendent l'instantané
+        with self._global_lock:
+            expires_at, stats = self._global
+            if stats is None or time.time() >= expires_at:
+                stats = self._compute_global()
+                self._global = (time.time() + max_age, stats)
+        return stats
+
+
+user_stats_service = UserStatsService()
@@ -1,21 +1,164 @@
+from datetime import datetime
+from sqlalchemy import func
 from app.models.movie import Movie
 from app.models.review import Review
+from app.models.like import Like
+from app.models.rating import Rating
+from app.utils.upsert import insert_on_conflict
 from app.extensions import db
 
 
-def update_movie_rating(movie_id):
-    reviews = Review.query.filter_by(movie_id=movie_id).all()
-    movie = Movie.query.get(movie_id)
+def _average(rating_sum, rating_count):
+    # Moyenne arrondie à 2 décimales ; sans avis, note du catalogue
+    return db.case(
+        (rating_count > 0, func.round(db.cast(rating_sum, db.Numeric) / rating_count, 2)),
+        else_=Movie.catalog_rating
+    )
 
-    if not movie:
+
+def stored_review_rating(review_id):
+    """Note d'un avis telle qu'enregistrée en base (la colonne est entière)"""
+    return db.select(Review.rating).where(Review.id == review_id).scalar_subquery()
+
+
+def update_movie_rating(movie_id, added=None, removed=None):
+    """
+    Met à jour la note moyenne d'un film de manière incrémentale :
+    ajoute la note `added` et/ou retire la note `removed` des agrégats
+    (rating_sum, rating_count) en une seule instruction UPDATE.
+    Aucun commit : l'appelant valide avec l'écriture de l'avis.
+    """
+    rating_sum = Movie.rating_sum
+    rating_count = Movie.rating_count
+
+    if added is not None:
+        rating_sum = rating_sum + added
+        rating_count = rating_count + 1
+    if removed is not None:
+        rating_sum = rating_sum - removed
+        rating_count = rating_count - 1
+
+    db.session.execute(
+        db.update(Movie)
+        .where(Movie.id == movie_id)
+        .values(
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            rating=_average(rating_sum, rating_count)
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def save_ratings(user_id, ratings):
+    """
+    Enregistre les notes {movie_id: note} d'un utilisateur (sans commit) et
+    retourne (nombre de nouvelles notes, variation de la somme des notes)
+    pour ses compteurs.
+
+    Les nouvelles notes sont insérées en une instruction ; pour les autres, les
+    anciennes valeurs sont lues verrouillées (FOR UPDATE sous PostgreSQL, base
+    déjà verrouillée en écriture sous SQLite) puis remplacées : deux envois
+    simultanés ne comptent pas deux fois la même variation.
+    """
+    created = set(db.session.execute(insert_on_conflict(
+        Rating,
+        [{"user_id": user_id, "movie_id": movie_id, "rating": rating} for movie_id, rating in ratings.items()],
+        index_elements=['user_id', 'movie_id']
+    ).returning(Rating.__table__.c.movie_id)).scalars())
+    rating_sum = sum(ratings[movie_id] or 0 for movie_id in created)
+
+    updated = {movie_id: rating for movie_id, rating in ratings.items() if movie_id not in created}
+    if updated:
+        previous = db.session.execute(
+            db.select(Rating.movie_id, Rating.rating)
+            .where(Rating.user_id == user_id, Rating.movie_id.in_(updated))
+            .with_for_update()
+        ).all()
+        db.session.execute(
+            db.update(Rating)
+            .where(Rating.user_id == user_id, Rating.movie_id.in_(updated))
+            .values(rating=db.case(updated, value=Rating.movie_id))
+            .execution_options(synchronize_session=False)
+        )
+        rating_sum += sum((updated[movie_id] or 0) - (rating or 0) for movie_id, rating in previous)
+
+    return len(created), rating_sum
+
+
+def update_movie_likes(movie_ids, delta):
+    """
+    Ajoute `delta` au compteur de likes des films donnés, en une seule
+    instruction UPDATE (pas de lecture préalable). Aucun commit.
+    """
+    movie_ids = list(movie_ids)
+    if not movie_ids or not delta:
+        return
+    db.session.execute(
+        db.update(Movie)
+        .where(Movie.id.in_(movie_ids))
+        .values(like_count=Movie.like_count + delta)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def touch_movies(movie_ids):
+    """
+    Marque des films comme modifiés (updated_at) lorsque des données affichées
+    avec eux changent ailleurs (notes, likes). Aucun commit.
+    """
+    movie_ids = list(movie_ids)
+    if not movie_ids:
         return
+    db.session.execute(
+        db.update(Movie)
+        .where(Movie.id.in_(movie_ids))
+        .values(updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def recompute_movie_ratings():
+    """
+    Recalcule les agrégats de note de tous les films à partir des avis
+    (UPDATE ... FROM sur un agrégat unique) et retourne le nombre de films mis à jour.
+    """
+    aggregates = db.select(
+        Review.movie_id,
+        func.coalesce(func.sum(Review.rating), 0).label('rating_sum'),
+        func.count(Review.id).label('rating_count')
+    ).group_by(Review.movie_id).subquery()
+
+    result = db.session.execute(
+        db.update(Movie)
+        .where(Movie.id == aggregates.c.movie_id)
+        .values(
+            rating_sum=aggregates.c.rating_sum,
+            rating_count=aggregates.c.rating_count,
+            rating=_average(aggregates.c.rating_sum, aggregates.c.rating_count)
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    # Films dont tous les avis ont disparu : retour à la note du catalogue
+    db.session.execute(
+        db.update(Movie)
+        .where(Movie.rating_count != 0, ~db.exists().where(Review.movie_id == Movie.id))
+        .values(rating_sum=0, rating_count=0, rating=Movie.catalog_rating)
+        .execution_options(synchronize_session=False)
+    )
+
+    db.session.commit()
+    return result.rowcount
 
-    # Si des avis existent
-    if reviews:
-        # Calcule la moyenne des notes
-        average_rating = sum([r.rating for r in reviews if r.rating is not None]) / len(reviews)
-        movie.rating = round(average_rating, 2)  # arrondi à 2 décimales
-    else:
-        movie.rating = None  # Aucun avis = pas de note
 
-    db.session.commit()
\ No newline at end of file
+def recompute_movie_like_counts():
+    """Recalcule le compteur de likes de tous les films et retourne le nombre de films mis à jour"""
+    like_counts = db.select(func.count(Like.id)).where(Like.movie_id == Movie.id).scalar_subquery()
+    result = db.session.execute(
+        db.update(Movie)
+        .values(like_count=like_counts)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount
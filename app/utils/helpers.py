@@ -0,0 +1,66 @@
+from sqlalchemy.orm import selectinload
+from app.models.movie import Movie
+
+
+def movie_card_options(with_actors=False):
+    """
+    Options de chargement pour sérialiser une liste de films :
+    une requête par relation, quelle que soit la taille de la page.
+    """
+    options = [selectinload(Movie.director), selectinload(Movie.genres)]
+    if with_actors:
+        options.append(selectinload(Movie.actors))
+    return options
+
+
+def load_movie_cards(movie_ids, with_actors=False):
+    """Charge les films demandés en conservant l'ordre de `movie_ids`"""
+    movie_ids = list(movie_ids)
+    if not movie_ids:
+        return []
+
+    movies = Movie.query.options(*movie_card_options(with_actors))\
+        .filter(Movie.id.in_(movie_ids)).all()
+    movies_by_id = {movie.id: movie for movie in movies}
+    return [movies_by_id[movie_id] for movie_id in movie_ids if movie_id in movies_by_id]
+
+
+def parse_movie_ids(value, max_count):
+    """
+    Liste d'identifiants d'un paramètre « 1,2,3 » ou d'une liste JSON d'entiers
+    (ordre conservé, doublons retirés).
+    Lève ValueError si la liste est vide, invalide ou dépasse `max_count`.
+    """
+    if isinstance(value, list):
+        if not all(isinstance(item, int) and not isinstance(item, bool) for item in value):
+            raise ValueError("movie_ids doit être une liste d'entiers")
+        movie_ids = list(dict.fromkeys(value))
+    else:
+        try:
+            movie_ids = list(dict.fromkeys(int(part) for part in (value or '').split(',') if part.strip()))
+        except ValueError:
+            raise ValueError("movie_ids doit être une liste d'entiers séparés par des virgules")
+    if not movie_ids:
+        raise ValueError("movie_ids requis")
+    if len(movie_ids) > max_count:
+        raise ValueError(f"{max_count} films au maximum")
+    return movie_ids
+
+
+def serialize_movie(movie, with_actors=False, **extra):
+    """Représentation JSON commune d'un film (carte de liste)"""
+    data = {
+        'id': movie.id,
+        'title': movie.title,
+        'release_year': movie.release_year,
+        'rating': movie.rating,
+        'description': movie.description,
+        'poster_url': movie.poster_url,
+        'video_path': movie.video_file_path,
+        'director': movie.director.name if movie.director else None,
+        'genres': [genre.name for genre in movie.genres]
+    }
+    if with_actors:
+        data['actors'] = [actor.name for actor in movie.actors]
+    data.update(extra)
+    return data
@@ -0,0 +1,109 @@
+from datetime import datetime
+from functools import wraps
+import hashlib
+from flask import current_app, make_response, request
+from sqlalchemy import event, func, inspect
+from werkzeug.http import is_resource_modified
+from app.extensions import db
+from app.models import Actor, Director, Genre, Movie, Review, User
+from app.models.actor import movie_actors
+from app.models.genre import movie_genres
+
+
+def conditional_get(validator):
+    """
+    Décorateur de requête GET conditionnelle.
+
+    `validator(*args, **kwargs)` reçoit les arguments de la vue et retourne la
+    version à partir d'une requête peu coûteuse, ou None pour laisser la vue
+    répondre normalement (ressource absente par exemple).
+    Si le client possède déjà cette version (If-None-Match), une réponse 304 est
+    envoyée sans exécuter la vue ni sérialiser le corps.
+
+    Seul l'ETag sert à la revalidation : Last-Modified, à la seconde près,
+    laisserait passer pour inchangée une modification faite dans la même seconde.
+    Il n'est donc pas envoyé et If-Modified-Since est ignoré.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            validators = validator(*args, **kwargs)
+            if validators is None:
+                return view(*args, **kwargs)
+
+            etag = hashlib.sha1(f'{request.endpoint}:{validators}'.encode('utf-8')).hexdigest()[:32]
+
+            if not is_resource_modified(request.environ, etag=etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            # ETag faible : le corps JSON est équivalent, pas forcément identique à l'octet près
+            response.set_etag(etag, weak=True)
+            # Le client garde la réponse mais revalide à chaque utilisation
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
+
+
+def movie_version(movie_id):
+    """Validateur d'un film (et de ses avis, qui mettent à jour ses agrégats)"""
+    updated_at = db.session.query(Movie.updated_at).filter(Movie.id == movie_id).scalar()
+    if updated_at is None:
+        return None
+    return f'{movie_id}:{updated_at.isoformat()}'
+
+
+def catalog_version():
+    """
+    Validateur du catalogue entier : nombre de films et dernière modification
+    (un seul parcours de l'index ix_movies_updated_at). Les paramètres de la
+    requête font partie de l'URL, donc de la clé de cache du client.
+    Les données affichées avec les films mais stockées ailleurs les marquent
+    comme modifiés (voir `_touch_dependent_movies`).
+    """
+    count, updated_at = db.session.query(func.count(Movie.id), func.max(Movie.updated_at)).one()
+    return f'{count}:{updated_at.isoformat() if updated_at else ""}'
+
+
+def _changed(obj, *attributes):
+    state = inspect(obj)
+    return any(state.attrs[attribute].history.has_changes() for attribute in attributes)
+
+
+@event.listens_for(db.session, 'before_flush')
+def _touch_dependent_movies(session, flush_context, instances):
+    """
+    Les films sont servis avec les noms de leurs réalisateur, acteurs et genres,
+    et leurs avis avec le pseudonyme de l'auteur : toute modification de ces
+    données, ou de la composition d'un film, met à jour `updated_at` des films
+    concernés dans la même transaction, donc leur ETag et celui du catalogue.
+    """
+    now = datetime.utcnow()
+    movies = Movie.__table__
+    conditions = []
+    for obj in session.dirty:
+        if isinstance(obj, Movie):
+            if _changed(obj, 'actors', 'genres'):
+                obj.updated_at = now
+        elif isinstance(obj, Director) and _changed(obj, 'name'):
+            conditions.append(movies.c.director_id == obj.id)
+        elif isinstance(obj, Actor) and _changed(obj, 'name'):
+            conditions.append(movies.c.id.in_(
+                db.select(movie_actors.c.movie_id).where(movie_actors.c.actor_id == obj.id)
+            ))
+        elif isinstance(obj, Genre) and _changed(obj, 'name'):
+            conditions.append(movies.c.id.in_(
+                db.select(movie_genres.c.movie_id).where(movie_genres.c.genre_id == obj.id)
+            ))
+        elif isinstance(obj, User) and _changed(obj, 'username'):
+            conditions.append(movies.c.id.in_(
+                db.select(Review.__table__.c.movie_id).where(Review.__table__.c.user_id == obj.id)
+            ))
+
+    if conditions:
+        # Instruction Core : pas d'autoflush pendant le flush en cours
+        session.execute(movies.update().where(db.or_(*conditions)).values(updated_at=now))
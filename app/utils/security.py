@@ -0,0 +1,94 @@
+from functools import wraps
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, jsonify
+from flask_jwt_extended import jwt_required, get_jwt
+from app.extensions import db
+from app.models.role import Role
+from app.models.user import User
+
+
+def role_claims(user):
+    """Claims ajoutés au token à la connexion : nom du rôle et version du rôle"""
+    return {
+        'role': user.role.name if user.role else None,
+        'role_version': user.role_version
+    }
+
+
+class RoleClaimsCache:
+    """
+    Rôle courant d'un utilisateur à partir des claims de son token, selon la même
+    règle pour tous les rôles : le rôle du token fait foi tant que sa version est
+    au moins celle connue de ce processus. La version est relue en base (clé
+    primaire) si elle est inconnue ou plus ancienne que ROLE_CLAIMS_MAX_AGE
+    secondes ; un token plus ancien qu'elle reçoit le rôle lu en base.
+
+    Fenêtre de révocation : un changement de rôle s'applique aussitôt dans le
+    processus qui l'a fait, et au plus ROLE_CLAIMS_MAX_AGE secondes plus tard
+    dans les autres.
+
+    Au plus ROLE_CLAIMS_CACHE_SIZE utilisateurs sont retenus (les moins
+    récemment vus sont oubliés).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._known = OrderedDict()  # user_id -> (role_version, role, vérifié à)
+
+    def remember(self, user_id, role_version, role):
+        max_size = current_app.config['ROLE_CLAIMS_CACHE_SIZE']
+        with self._lock:
+            self._known[user_id] = (role_version, role, time.time())
+            self._known.move_to_end(user_id)
+            while len(self._known) > max_size:
+                self._known.popitem(last=False)
+
+    def _load(self, user_id):
+        """(version, rôle) lus en base et retenus"""
+        row = db.session.query(User.role_version, Role.name)\
+            .outerjoin(Role, User.role_id == Role.id)\
+            .filter(User.id == user_id).first()
+        version, role = (row.role_version, row.name) if row else (None, None)
+        self.remember(user_id, version, role)
+        return version, role
+
+    def _known_version(self, user_id):
+        max_age = current_app.config['ROLE_CLAIMS_MAX_AGE']
+        with self._lock:
+            known = self._known.get(user_id)
+            if known and time.time() - known[2] < max_age:
+                self._known.move_to_end(user_id)
+                return known[0], known[1]
+        return self._load(user_id)
+
+    def current_role(self, claims):
+        user_id = int(claims['sub'])
+        token_version = claims.get('role_version')
+        token_role = claims.get('role')
+
+        # Token émis sans claims de rôle : la base fait foi
+        if token_version is None:
+            return self._load(user_id)[1]
+
+        version, role = self._known_version(user_id)
+        if version is not None and token_version >= version:
+            return token_role
+        return role
+
+
+role_cache = RoleClaimsCache()
+
+
+def role_required(*roles):
+    """Autorise la vue aux seuls porteurs d'un token dont le rôle figure dans `roles`"""
+    def decorator(view):
+        @wraps(view)
+        @jwt_required()
+        def wrapper(*args, **kwargs):
+            if role_cache.current_role(get_jwt()) not in roles:
+                return jsonify({"error": "Accès refusé"}), 403
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
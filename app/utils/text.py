@@ -0,0 +1,24 @@
+import re
+import unicodedata
+
+
+def strip_accents(value):
+    """Supprime les accents : 'Amélie' -> 'Amelie'"""
+    decomposed = unicodedata.normalize('NFKD', value)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def normalize(value):
+    """Minuscules, sans accents, ponctuation remplacée par des espaces simples"""
+    if not value:
+        return ''
+    value = strip_accents(value).lower()
+    return ' '.join(re.findall(r'\w+', value, flags=re.UNICODE))
+
+
+def name_key(value):
+    """
+    Clé de dédoublonnage des noms (réalisateurs, acteurs, genres) :
+    sans accents, sans espaces, en majuscules. 'Amélie  Nothomb' -> 'AMELIENOTHOMB'
+    """
+    return re.sub(r'\s+', '', strip_accents(value or '')).upper()
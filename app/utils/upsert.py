@@ -0,0 +1,46 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from app.extensions import db
+
+# Moteurs disposant d'INSERT ... ON CONFLICT
+INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert
+}
+
+
+def check_database_support(app):
+    """
+    Refuse au démarrage un moteur sans INSERT ... ON CONFLICT : les écritures
+    (notes, likes, watchlist, compteurs) reposent toutes dessus.
+    """
+    uri = app.config.get('SQLALCHEMY_DATABASE_URI')
+    if not uri:
+        return
+    backend = make_url(uri).get_backend_name()
+    if backend not in INSERTS:
+        raise RuntimeError(
+            f"Moteur de base non supporté : {backend} (attendu : {', '.join(INSERTS)})"
+        )
+
+
+def insert_on_conflict(model, rows, index_elements, update_fields=None, increment_fields=None):
+    """
+    Construit un INSERT ... ON CONFLICT adapté au moteur (PostgreSQL ou SQLite).
+
+    - sans `update_fields` ni `increment_fields` : ON CONFLICT DO NOTHING ;
+    - avec `update_fields` : ON CONFLICT DO UPDATE de ces colonnes avec les valeurs proposées ;
+    - avec `increment_fields` : les valeurs proposées sont ajoutées à celles de la
+      ligne existante (compteurs mis à jour sans lecture préalable).
+
+    `rows` est une ligne (dict) ou une liste de lignes ; `index_elements` doit
+    correspondre à une contrainte d'unicité existante.
+    """
+    # Moteur vérifié au démarrage par check_database_support
+    statement = INSERTS[db.engine.dialect.name](model.__table__).values(rows)
+    if update_fields or increment_fields:
+        table = model.__table__
+        set_ = {field: statement.excluded[field] for field in update_fields or ()}
+        set_.update({field: table.c[field] + statement.excluded[field] for field in increment_fields or ()})
+        return statement.on_conflict_do_update(index_elements=index_elements, set_=set_)
+    return statement.on_conflict_do_nothing(index_elements=index_elements)
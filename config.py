@@ -12,10 +12,76 @@ class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "default_secret_key")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "default_jwt_secret")
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(days=7) 
+    # Durée (secondes) pendant laquelle la version de rôle lue en base est retenue, soit le délai
+    # maximal d'application d'un changement de rôle dans les autres processus (immédiat dans celui
+    # qui l'a fait), et nombre maximal d'utilisateurs retenus par processus
+    ROLE_CLAIMS_MAX_AGE = int(os.getenv('ROLE_CLAIMS_MAX_AGE', 30))
+    ROLE_CLAIMS_CACHE_SIZE = int(os.getenv('ROLE_CLAIMS_CACHE_SIZE', 10000))
 
     # Chargement de l'URL de la base de données depuis les variables d'environnement
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL')
 
+    # Recherche plein texte (configuration PostgreSQL utilisée par to_tsvector)
+    SEARCH_TS_CONFIG = os.getenv('SEARCH_TS_CONFIG', 'simple')
+    SEARCH_DEFAULT_PER_PAGE = int(os.getenv('SEARCH_DEFAULT_PER_PAGE', 20))
+    SEARCH_MAX_PER_PAGE = int(os.getenv('SEARCH_MAX_PER_PAGE', 100))
+
+    # Autocomplétion (index en mémoire)
+    AUTOCOMPLETE_DEFAULT_LIMIT = int(os.getenv('AUTOCOMPLETE_DEFAULT_LIMIT', 8))
+    AUTOCOMPLETE_MAX_LIMIT = int(os.getenv('AUTOCOMPLETE_MAX_LIMIT', 20))
+
+    # Taille maximale d'un lot POST /interactions/batch
+    INTERACTIONS_BATCH_MAX_SIZE = int(os.getenv('INTERACTIONS_BATCH_MAX_SIZE', 500))
+    # Nombre maximal de films d'une lecture groupée (?movie_ids=1,2,3)
+    MOVIE_IDS_MAX_PER_REQUEST = int(os.getenv('MOVIE_IDS_MAX_PER_REQUEST', 100))
+    # Pagination de la watchlist et des favoris
+    USER_LISTS_DEFAULT_PER_PAGE = int(os.getenv('USER_LISTS_DEFAULT_PER_PAGE', 20))
+    USER_LISTS_MAX_PER_PAGE = int(os.getenv('USER_LISTS_MAX_PER_PAGE', 100))
+
+    # Recommandations hybrides : taille de la réserve de chaque générateur de candidats
+    RECOMMENDATION_POOL_SIZES = {
+        'popular': int(os.getenv('RECOMMENDATION_POOL_POPULAR', 100)),
+        'genre': int(os.getenv('RECOMMENDATION_POOL_GENRE', 100)),
+        'director': int(os.getenv('RECOMMENDATION_POOL_DIRECTOR', 50)),
+        'co_liked': int(os.getenv('RECOMMENDATION_POOL_CO_LIKED', 150))
+    }
+    # Démarrage à froid : en dessous de ce nombre d'interactions, liste de films populaires mise en cache
+    RECOMMENDATION_COLD_START_THRESHOLD = int(os.getenv('RECOMMENDATION_COLD_START_THRESHOLD', 3))
+    RECOMMENDATION_COLD_START_SIZE = int(os.getenv('RECOMMENDATION_COLD_START_SIZE', 50))
+    RECOMMENDATION_COLD_START_TTL = int(os.getenv('RECOMMENDATION_COLD_START_TTL', 600))
+    # Nombre de voisins précalculés par utilisateur (/recommendations/similar-users)
+    USER_NEIGHBORS_K = int(os.getenv('USER_NEIGHBORS_K', 20))
+    # Ancienneté maximale (secondes) des statistiques globales de /recommendations/admin/stats
+    GLOBAL_STATS_MAX_AGE = int(os.getenv('GLOBAL_STATS_MAX_AGE', 60))
+
+    # Envoi de vidéos par morceaux (tailles en octets)
+    VIDEO_UPLOAD_FOLDER = os.getenv('VIDEO_UPLOAD_FOLDER', 'static/videos')
+    VIDEO_UPLOAD_MAX_SIZE = int(os.getenv('VIDEO_UPLOAD_MAX_SIZE', 20 * 1024 ** 3))
+    VIDEO_UPLOAD_MAX_PART_SIZE = int(os.getenv('VIDEO_UPLOAD_MAX_PART_SIZE', 64 * 1024 ** 2))
+    VIDEO_UPLOAD_CHUNK_SIZE = int(os.getenv('VIDEO_UPLOAD_CHUNK_SIZE', 1024 ** 2))
+    # Durée (secondes) pendant laquelle un morceau en cours réserve l'envoi ; doit
+    # dépasser le temps d'envoi d'un morceau de taille maximale
+    VIDEO_UPLOAD_CLAIM_TIMEOUT = int(os.getenv('VIDEO_UPLOAD_CLAIM_TIMEOUT', 15 * 60))
+    # Envois non finalisés supprimés (ligne et fichier partiel) après ce délai d'inactivité
+    VIDEO_UPLOAD_EXPIRY = int(os.getenv('VIDEO_UPLOAD_EXPIRY', 24 * 3600))
+
+    # Fichiers statiques (affiches, vidéos)
+    # STATIC_OFFLOAD_MODE : vide (servi par Flask), 'x-sendfile' (Apache) ou 'x-accel' (Nginx)
+    STATIC_OFFLOAD_MODE = os.getenv('STATIC_OFFLOAD_MODE') or None
+    STATIC_ACCEL_PREFIX = os.getenv('STATIC_ACCEL_PREFIX', '/protected')  # location interne Nginx
+    STATIC_IMMUTABLE_MAX_AGE = int(os.getenv('STATIC_IMMUTABLE_MAX_AGE', 365 * 24 * 3600))
+    STATIC_DEFAULT_MAX_AGE = int(os.getenv('STATIC_DEFAULT_MAX_AGE', 3600))
+
+    # Variantes redimensionnées des affiches (largeurs en pixels : vignette, carte, détail)
+    POSTER_VARIANT_WIDTHS = [int(w) for w in os.getenv('POSTER_VARIANT_WIDTHS', '160,342,780').split(',')]
+    POSTER_VARIANT_QUALITY = int(os.getenv('POSTER_VARIANT_QUALITY', 85))
+    POSTER_VARIANT_CACHE_MAX_BYTES = int(os.getenv('POSTER_VARIANT_CACHE_MAX_BYTES', 512 * 1024 ** 2))
+
+    # Filtre de Bloom des emails (taux de faux positifs visé, taille minimale, rattrapage des autres processus)
+    EMAIL_FILTER_ERROR_RATE = float(os.getenv('EMAIL_FILTER_ERROR_RATE', 0.01))
+    EMAIL_FILTER_MIN_CAPACITY = int(os.getenv('EMAIL_FILTER_MIN_CAPACITY', 10000))
+    EMAIL_FILTER_SYNC_SECONDS = int(os.getenv('EMAIL_FILTER_SYNC_SECONDS', 30))
+
 class DevelopmentConfig(Config):
     """Configuration pour le développement."""
     DEBUG = True
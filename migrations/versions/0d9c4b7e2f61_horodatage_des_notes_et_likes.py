@@ -0,0 +1,33 @@
+"""horodatage des notes et likes
+
+Revision ID: 0d9c4b7e2f61
+Revises: 7b3e5f1c9a20
+Create Date: 2026-10-19 18:05:27.118402
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0d9c4b7e2f61'
+down_revision = '7b3e5f1c9a20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Les lignes existantes restent sans date (considérées comme les plus anciennes)
+    with op.batch_alter_table('ratings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(), nullable=True))
+
+    with op.batch_alter_table('likes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('likes', schema=None) as batch_op:
+        batch_op.drop_column('created_at')
+
+    with op.batch_alter_table('ratings', schema=None) as batch_op:
+        batch_op.drop_column('created_at')
@@ -0,0 +1,26 @@
+"""index des films les plus likés
+
+Revision ID: 1b7d4e9a6c35
+Revises: 8f1e6b3d2a74
+Create Date: 2026-10-20 09:12:44.318207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1b7d4e9a6c35'
+down_revision = '8f1e6b3d2a74'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.create_index('ix_movies_like_count', ['like_count'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.drop_index('ix_movies_like_count')
@@ -0,0 +1,27 @@
+"""contributions des films aux profils
+
+Revision ID: 2c8f5a0e7d19
+Revises: 6e3a9c1d7b48
+Create Date: 2026-10-20 11:05:12.641873
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2c8f5a0e7d19'
+down_revision = '6e3a9c1d7b48'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Profils existants : NULL, recalculés entièrement à la prochaine écriture de l'utilisateur
+    with op.batch_alter_table('user_profiles', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('movie_contributions', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('user_profiles', schema=None) as batch_op:
+        batch_op.drop_column('movie_contributions')
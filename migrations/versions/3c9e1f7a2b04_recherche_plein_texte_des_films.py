@@ -0,0 +1,71 @@
+"""recherche plein texte des films
+
+Revision ID: 3c9e1f7a2b04
+Revises: 27f3a211efa1
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9e1f7a2b04'
+down_revision = '27f3a211efa1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('search_vector', sa.Text().with_variant(postgresql.TSVECTOR(), 'postgresql'), nullable=True))
+
+    if bind.dialect.name == 'postgresql':
+        # Remplissage initial (configuration 'simple', cf. SEARCH_TS_CONFIG)
+        op.execute("""
+            UPDATE movies AS m SET search_vector =
+                setweight(to_tsvector('simple', coalesce(m.title, '')), 'A') ||
+                setweight(to_tsvector('simple',
+                    coalesce(d.name, '') || ' ' ||
+                    coalesce((SELECT string_agg(a.name, ' ') FROM movie_actors ma
+                              JOIN actors a ON a.id = ma.actor_id WHERE ma.movie_id = m.id), '') || ' ' ||
+                    coalesce((SELECT string_agg(g.name, ' ') FROM movie_genres mg
+                              JOIN genres g ON g.id = mg.genre_id WHERE mg.movie_id = m.id), '')
+                ), 'B') ||
+                setweight(to_tsvector('simple', coalesce(m.description, '')), 'C')
+            FROM directors AS d
+            WHERE d.id = m.director_id
+        """)
+        op.create_index('ix_movies_search_vector', 'movies', ['search_vector'], unique=False, postgresql_using='gin')
+    else:
+        op.create_index('ix_movies_search_vector', 'movies', ['search_vector'], unique=False)
+
+    if bind.dialect.name == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts "
+            "USING fts5(title, description, people, tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute("""
+            INSERT INTO movies_fts(rowid, title, description, people)
+            SELECT m.id, coalesce(m.title, ''), coalesce(m.description, ''),
+                   coalesce(d.name, '') || ' ' ||
+                   coalesce((SELECT group_concat(a.name, ' ') FROM movie_actors ma
+                             JOIN actors a ON a.id = ma.actor_id WHERE ma.movie_id = m.id), '') || ' ' ||
+                   coalesce((SELECT group_concat(g.name, ' ') FROM movie_genres mg
+                             JOIN genres g ON g.id = mg.genre_id WHERE mg.movie_id = m.id), '')
+            FROM movies AS m LEFT JOIN directors AS d ON d.id = m.director_id
+        """)
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS movies_fts")
+
+    op.drop_index('ix_movies_search_vector', table_name='movies')
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.drop_column('search_vector')
@@ -0,0 +1,38 @@
+"""unicité des favoris
+
+Revision ID: 4a9e2b7c5f03
+Revises: 2c8f5a0e7d19
+Create Date: 2026-10-20 11:48:26.205719
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4a9e2b7c5f03'
+down_revision = '2c8f5a0e7d19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Suppression des doublons avant la contrainte d'unicité (on garde le plus récent)
+    op.execute("""
+        DELETE FROM favorites WHERE id NOT IN (
+            SELECT max_id FROM (
+                SELECT MAX(id) AS max_id FROM favorites GROUP BY user_id, movie_id
+            ) AS latest
+        )
+    """)
+
+    # La contrainte d'unicité remplace l'index (user_id, movie_id)
+    with op.batch_alter_table('favorites', schema=None) as batch_op:
+        batch_op.drop_index('ix_favorites_user_id_movie_id')
+        batch_op.create_unique_constraint('unique_user_movie_favorite', ['user_id', 'movie_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('favorites', schema=None) as batch_op:
+        batch_op.drop_constraint('unique_user_movie_favorite', type_='unique')
+        batch_op.create_index('ix_favorites_user_id_movie_id', ['user_id', 'movie_id'], unique=False)
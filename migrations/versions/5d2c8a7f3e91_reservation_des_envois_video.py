@@ -0,0 +1,26 @@
+"""reservation des envois video
+
+Revision ID: 5d2c8a7f3e91
+Revises: 9e4a7c2f1b60
+Create Date: 2026-10-19 23:12:47.318205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2c8a7f3e91'
+down_revision = '9e4a7c2f1b60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('video_uploads', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('claim_token', sa.String(length=32), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('video_uploads', schema=None) as batch_op:
+        batch_op.drop_column('claim_token')
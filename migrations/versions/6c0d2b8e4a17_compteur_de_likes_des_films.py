@@ -0,0 +1,32 @@
+"""compteur de likes des films
+
+Revision ID: 6c0d2b8e4a17
+Revises: 2e7f9a1c5d38
+Create Date: 2026-10-19 21:12:40.318574
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6c0d2b8e4a17'
+down_revision = '2e7f9a1c5d38'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('like_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute("""
+        UPDATE movies SET like_count = (
+            SELECT COUNT(*) FROM likes WHERE likes.movie_id = movies.id
+        )
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.drop_column('like_count')
@@ -0,0 +1,26 @@
+"""compteur de marquages des voisins
+
+Revision ID: 6e3a9c1d7b48
+Revises: 1b7d4e9a6c35
+Create Date: 2026-10-20 10:27:31.904415
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e3a9c1d7b48'
+down_revision = '1b7d4e9a6c35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user_neighbors_dirty', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('mark_count', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    with op.batch_alter_table('user_neighbors_dirty', schema=None) as batch_op:
+        batch_op.drop_column('mark_count')
@@ -0,0 +1,26 @@
+"""version du role des utilisateurs
+
+Revision ID: 7b3e5f1c9a20
+Revises: c6f19a3e5d27
+Create Date: 2026-10-19 17:12:45.530184
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b3e5f1c9a20'
+down_revision = 'c6f19a3e5d27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('role_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('role_version')
@@ -0,0 +1,92 @@
+"""index des chemins de lecture
+
+Revision ID: 8d41b6e0c3f2
+Revises: 3c9e1f7a2b04
+Create Date: 2026-10-19 10:04:17.552931
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d41b6e0c3f2'
+down_revision = '3c9e1f7a2b04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Suppression des doublons avant les contraintes d'unicité (on garde le plus récent)
+    for table in ('reviews', 'watchlists'):
+        op.execute(f"""
+            DELETE FROM {table} WHERE id NOT IN (
+                SELECT max_id FROM (
+                    SELECT MAX(id) AS max_id FROM {table} GROUP BY user_id, movie_id
+                ) AS latest
+            )
+        """)
+
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.create_unique_constraint('unique_user_movie_review', ['user_id', 'movie_id'])
+        batch_op.create_index('ix_reviews_movie_id', ['movie_id'], unique=False)
+
+    with op.batch_alter_table('watchlists', schema=None) as batch_op:
+        batch_op.create_unique_constraint('unique_user_movie_watchlist', ['user_id', 'movie_id'])
+        batch_op.create_index('ix_watchlists_movie_id', ['movie_id'], unique=False)
+
+    # (user_id, movie_id) est déjà couvert par les contraintes d'unicité existantes
+    with op.batch_alter_table('ratings', schema=None) as batch_op:
+        batch_op.create_index('ix_ratings_movie_id', ['movie_id'], unique=False)
+
+    with op.batch_alter_table('likes', schema=None) as batch_op:
+        batch_op.create_index('ix_likes_movie_id', ['movie_id'], unique=False)
+
+    with op.batch_alter_table('favorites', schema=None) as batch_op:
+        batch_op.create_index('ix_favorites_user_id_movie_id', ['user_id', 'movie_id'], unique=False)
+        batch_op.create_index('ix_favorites_movie_id', ['movie_id'], unique=False)
+
+    with op.batch_alter_table('recommendations', schema=None) as batch_op:
+        batch_op.create_index('ix_recommendations_user_id_score', ['user_id', 'score'], unique=False)
+
+    # La clé primaire (movie_id, ...) couvre déjà les recherches par film
+    with op.batch_alter_table('movie_genres', schema=None) as batch_op:
+        batch_op.create_index('ix_movie_genres_genre_id', ['genre_id'], unique=False)
+
+    with op.batch_alter_table('movie_actors', schema=None) as batch_op:
+        batch_op.create_index('ix_movie_actors_actor_id', ['actor_id'], unique=False)
+
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.create_index('ix_movies_director_id', ['director_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.drop_index('ix_movies_director_id')
+
+    with op.batch_alter_table('movie_actors', schema=None) as batch_op:
+        batch_op.drop_index('ix_movie_actors_actor_id')
+
+    with op.batch_alter_table('movie_genres', schema=None) as batch_op:
+        batch_op.drop_index('ix_movie_genres_genre_id')
+
+    with op.batch_alter_table('recommendations', schema=None) as batch_op:
+        batch_op.drop_index('ix_recommendations_user_id_score')
+
+    with op.batch_alter_table('favorites', schema=None) as batch_op:
+        batch_op.drop_index('ix_favorites_movie_id')
+        batch_op.drop_index('ix_favorites_user_id_movie_id')
+
+    with op.batch_alter_table('likes', schema=None) as batch_op:
+        batch_op.drop_index('ix_likes_movie_id')
+
+    with op.batch_alter_table('ratings', schema=None) as batch_op:
+        batch_op.drop_index('ix_ratings_movie_id')
+
+    with op.batch_alter_table('watchlists', schema=None) as batch_op:
+        batch_op.drop_index('ix_watchlists_movie_id')
+        batch_op.drop_constraint('unique_user_movie_watchlist', type_='unique')
+
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.drop_index('ix_reviews_movie_id')
+        batch_op.drop_constraint('unique_user_movie_review', type_='unique')
@@ -0,0 +1,30 @@
+"""date de changement des emails
+
+Revision ID: 8f1e6b3d2a74
+Revises: 5d2c8a7f3e91
+Create Date: 2026-10-19 23:48:05.602934
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f1e6b3d2a74'
+down_revision = '5d2c8a7f3e91'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Utilisateurs existants : déjà intégrés au filtre construit au démarrage
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('email_changed_at', sa.DateTime(), nullable=False,
+                                      server_default=sa.func.current_timestamp()))
+        batch_op.create_index('ix_users_email_changed_at', ['email_changed_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_email_changed_at')
+        batch_op.drop_column('email_changed_at')
@@ -0,0 +1,30 @@
+"""note du catalogue
+
+Revision ID: 9e4a7c2f1b60
+Revises: 6c0d2b8e4a17
+Create Date: 2026-10-19 22:05:31.274418
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e4a7c2f1b60'
+down_revision = '6c0d2b8e4a17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('catalog_rating', sa.Float(), nullable=True))
+
+    # Sans avis, la note actuelle est celle saisie à la création ou importée ;
+    # pour les autres films elle a déjà été remplacée par la moyenne des avis
+    op.execute("UPDATE movies SET catalog_rating = rating WHERE rating_count = 0")
+
+
+def downgrade():
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.drop_column('catalog_rating')
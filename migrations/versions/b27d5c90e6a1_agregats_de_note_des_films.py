@@ -0,0 +1,40 @@
+"""agregats de note des films
+
+Revision ID: b27d5c90e6a1
+Revises: 8d41b6e0c3f2
+Create Date: 2026-10-19 11:21:03.640117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b27d5c90e6a1'
+down_revision = '8d41b6e0c3f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rating_sum', sa.Float(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute("""
+        UPDATE movies SET
+            rating_sum = agg.rating_sum,
+            rating_count = agg.rating_count,
+            rating = ROUND(CAST(agg.rating_sum AS NUMERIC) / agg.rating_count, 2)
+        FROM (
+            SELECT movie_id, COALESCE(SUM(rating), 0) AS rating_sum, COUNT(id) AS rating_count
+            FROM reviews GROUP BY movie_id
+        ) AS agg
+        WHERE movies.id = agg.movie_id
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.drop_column('rating_count')
+        batch_op.drop_column('rating_sum')
@@ -0,0 +1,28 @@
+"""date de modification des films
+
+Revision ID: c6f19a3e5d27
+Revises: 4f6a2e9d8b13
+Create Date: 2026-10-19 16:40:12.208731
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6f19a3e5d27'
+down_revision = '4f6a2e9d8b13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False))
+        batch_op.create_index('ix_movies_updated_at', ['updated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.drop_index('ix_movies_updated_at')
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,99 @@
+"""cle de nom normalisee pour directors, actors et genres
+
+Revision ID: e5a0d8c4719b
+Revises: b27d5c90e6a1
+Create Date: 2026-10-19 13:40:52.207714
+
+"""
+import re
+import unicodedata
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a0d8c4719b'
+down_revision = 'b27d5c90e6a1'
+branch_labels = None
+depends_on = None
+
+
+def _name_key(value):
+    # Copie figée de app.utils.text.name_key au moment de la migration
+    decomposed = unicodedata.normalize('NFKD', value or '')
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return re.sub(r'\s+', '', stripped).upper()
+
+
+def _backfill(bind, table, association=None, column=None, exact=False):
+    """
+    Remplit name_key et fusionne les doublons sur l'identifiant le plus ancien.
+
+    Genres : même clé normalisée. Réalisateurs et acteurs (`exact`) : seules les
+    copies exactes (même nom, même biographie) sont fusionnées ; des homonymes
+    distincts restent deux lignes.
+    """
+    keep = {}
+    columns = "id, name, bio" if exact else "id, name"
+    rows = bind.execute(sa.text(f"SELECT {columns} FROM {table} ORDER BY id")).fetchall()
+    for row in rows:
+        id, name = row[0], row[1]
+        key = _name_key(name)
+        duplicate_of = (name, row[2]) if exact else key
+        if duplicate_of in keep:
+            params = {'keep': keep[duplicate_of], 'duplicate': id}
+            if association:
+                bind.execute(sa.text(
+                    f"DELETE FROM {association} WHERE {column} = :duplicate AND movie_id IN "
+                    f"(SELECT movie_id FROM {association} WHERE {column} = :keep)"
+                ), params)
+                bind.execute(sa.text(
+                    f"UPDATE {association} SET {column} = :keep WHERE {column} = :duplicate"
+                ), params)
+            else:
+                bind.execute(sa.text(
+                    "UPDATE movies SET director_id = :keep WHERE director_id = :duplicate"
+                ), params)
+            bind.execute(sa.text(f"DELETE FROM {table} WHERE id = :duplicate"), params)
+        else:
+            keep[duplicate_of] = id
+            bind.execute(sa.text(f"UPDATE {table} SET name_key = :key WHERE id = :id"), {'key': key, 'id': id})
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    for table, length in (('directors', 255), ('actors', 255), ('genres', 100)):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('name_key', sa.String(length=length), nullable=True))
+
+    _backfill(bind, 'directors', exact=True)
+    _backfill(bind, 'actors', 'movie_actors', 'actor_id', exact=True)
+    _backfill(bind, 'genres', 'movie_genres', 'genre_id')
+
+    # Clé unique pour les genres uniquement : deux personnes peuvent être homonymes
+    for table, length in (('directors', 255), ('actors', 255)):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column('name_key', existing_type=sa.String(length=length), nullable=False)
+            batch_op.create_index(f'ix_{table}_name_key', ['name_key'], unique=False)
+    with op.batch_alter_table('genres', schema=None) as batch_op:
+        batch_op.alter_column('name_key', existing_type=sa.String(length=100), nullable=False)
+        batch_op.create_index('ix_genres_name_key', ['name_key'], unique=True,
+                              postgresql_ops={'name_key': 'varchar_pattern_ops'})
+
+    # Recherche par sous-chaîne des réalisateurs et acteurs (LIKE '%CLE%')
+    if bind.dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for table in ('directors', 'actors'):
+            op.create_index(f'ix_{table}_name_key_trgm', table, ['name_key'], postgresql_using='gin',
+                            postgresql_ops={'name_key': 'gin_trgm_ops'})
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        for table in ('actors', 'directors'):
+            op.drop_index(f'ix_{table}_name_key_trgm', table_name=table)
+    for table in ('genres', 'actors', 'directors'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(f'ix_{table}_name_key')
+            batch_op.drop_column('name_key')
@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.extensions import db
+from app.models import Role, User
+from app.utils.security import role_cache, role_claims
+
+
+@pytest.fixture
+def app(tmp_path):
+    # Base SQLite dans un fichier : partagée entre les threads des tests de concurrence
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+        'JWT_SECRET_KEY': 'test-secret-key-with-enough-bytes-for-hs256'
+    })
+    role_cache._known.clear()
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    def make_user(username='alice', role='user'):
+        role_row = Role.query.filter_by(name=role).first()
+        if role_row is None:
+            role_row = Role(name=role)
+            db.session.add(role_row)
+            db.session.flush()
+        user = User(username=username, email=f'{username}@example.com', role_id=role_row.id)
+        user.set_password('secret')
+        db.session.add(user)
+        db.session.commit()
+        return user
+    return make_user
+
+
+@pytest.fixture
+def auth_headers(app):
+    def auth_headers(user):
+        return {'Authorization': f'Bearer {create_access_token(identity=str(user.id), additional_claims=role_claims(user))}'}
+    return auth_headers
+
+
+@pytest.fixture
+def count_queries(app):
+    queries = []
+
+    def record(conn, cursor, statement, *args):
+        queries.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    yield queries
+    event.remove(db.engine, 'before_cursor_execute', record)
@@ -0,0 +1,44 @@
+from app.services.autocomplete_service import AutocompleteIndex, autocomplete_index
+
+
+def labels(suggestions):
+    return [suggestion['label'] for suggestion in suggestions]
+
+
+def test_prefix_lookup_ranks_label_start_before_word_start():
+    index = AutocompleteIndex()
+    index.add('actor', 1, 'Jean Gabin')
+    index.add('director', 2, 'Gabriel Axel')
+    index.add('movie', 3, 'Gabrielle')
+    index.add('movie', 4, 'Le Quai des brumes')
+
+    # Début du libellé (le plus court d'abord), puis début d'un mot ; accents ignorés
+    assert labels(index.suggest('gab')) == ['Gabrielle', 'Gabriel Axel', 'Jean Gabin']
+    assert labels(index.suggest('GÂB', limit=1)) == ['Gabrielle']
+    assert labels(index.suggest('gab', kinds={'actor'})) == ['Jean Gabin']
+    assert index.suggest('zzz') == []
+
+
+def test_trigrams_tolerate_typos():
+    index = AutocompleteIndex()
+    index.add('movie', 1, 'Casablanca')
+    index.add('movie', 2, 'Metropolis')
+
+    assert labels(index.suggest('casablanka')) == ['Casablanca']
+
+
+def test_catalog_writes_update_the_index(client):
+    autocomplete_index.build()
+
+    response = client.post('/movies/full', data={
+        'title': 'Pépé le Moko', 'director': 'Julien Duvivier', 'actors': ['Jean Gabin']
+    })
+    assert response.status_code == 201
+    movie_id = response.get_json()['id']
+
+    suggestions = client.get('/movies/autocomplete?q=pepe').get_json()['suggestions']
+    assert suggestions == [{'type': 'movie', 'id': movie_id, 'label': 'Pépé le Moko'}]
+    assert labels(client.get('/movies/autocomplete?q=duviv').get_json()['suggestions']) == ['Julien Duvivier']
+
+    assert client.delete(f'/movies/{movie_id}').status_code == 200
+    assert client.get('/movies/autocomplete?q=pepe').get_json()['suggestions'] == []
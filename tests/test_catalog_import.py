@@ -0,0 +1,63 @@
+from app.extensions import db
+from app.models import Movie
+from app.services.catalog_import_service import CatalogImporter
+from app.utils import recompute_movie_ratings
+
+
+def import_catalog(tmp_path, content):
+    path = tmp_path / 'catalog.csv'
+    path.write_text(content, encoding='utf-8')
+    return CatalogImporter(batch_size=2).import_file(str(path))
+
+
+def test_import_creates_people_once(app, tmp_path):
+    stats = import_catalog(tmp_path, (
+        'title,director,actors,genres,rating\n'
+        'Quai des brumes,Marcel Carné,Jean Gabin|Michèle Morgan,Drame,4.2\n'
+        'Le Jour se lève,marcel carne,Jean Gabin,drame,\n'
+        'Sans réalisateur,,,,\n'
+    ))
+
+    assert (stats['imported'], stats['skipped']) == (2, 1)
+    first, second = Movie.query.order_by(Movie.id).all()
+    assert first.director_id == second.director_id
+    assert [actor.name for actor in second.actors] == ['Jean Gabin']
+    assert first.genres == second.genres
+
+
+def test_imported_rating_survives_reviews(client, tmp_path, make_user, auth_headers):
+    import_catalog(tmp_path, 'title,director,rating\nQuai des brumes,Marcel Carné,4.2\n')
+    movie_id = Movie.query.one().id
+    headers = auth_headers(make_user())
+
+    def rating():
+        db.session.expire_all()
+        return db.session.get(Movie, movie_id).rating
+
+    assert rating() == 4.2
+
+    client.post('/reviews/', json={'movie_id': movie_id, 'review_text': 'Bien', 'rating': 2}, headers=headers)
+    assert rating() == 2
+
+    # Sans avis, la note importée revient, y compris après un recalcul complet
+    client.delete(f'/reviews/{movie_id}', headers=headers)
+    assert rating() == 4.2
+    recompute_movie_ratings()
+    assert rating() == 4.2
+
+
+def test_names_without_key_are_skipped_not_fatal(app, tmp_path):
+    path = tmp_path / 'catalog.jsonl'
+    path.write_text('\n'.join([
+        '{"title": "Quai des brumes", "director": "Marcel Carné", "actors": ["Jean Gabin"]}',
+        # Accent combinant seul : clé normalisée vide
+        '{"title": "Sans clé", "director": "\\u0301"}',
+        '{"title": "Acteur vide", "director": "Marcel Carné", "genres": ["Drame", "\\u0301\\u0301"]}',
+        '{"title": "Liste invalide", "director": "Marcel Carné", "actors": [42]}',
+        '{"title": "Le Jour se lève", "director": "Marcel Carné"}'
+    ]), encoding='utf-8')
+
+    stats = CatalogImporter(batch_size=2).import_file(str(path))
+
+    assert (stats['imported'], stats['skipped']) == (2, 3)
+    assert [movie.title for movie in Movie.query.order_by(Movie.id)] == ['Quai des brumes', 'Le Jour se lève']
@@ -0,0 +1,32 @@
+from app.extensions import db
+from app.services.email_filter_service import EmailBloomFilter
+
+
+def test_changes_from_other_workers_are_synced(app, make_user):
+    user = make_user('alice')
+    app.config['EMAIL_FILTER_SYNC_SECONDS'] = 0
+    email_filter = EmailBloomFilter()
+    email_filter.build()
+    assert not email_filter.email_taken('nouvelle@example.com')
+
+    # Écritures faites par un autre processus : ce filtre n'en est pas informé
+    user.email = 'nouvelle@example.com'
+    db.session.commit()
+    make_user('bob')
+
+    assert email_filter.email_taken('nouvelle@example.com')
+    assert email_filter.email_taken('bob@example.com')
+    # Recouvrement entre synchronisations : chaque changement n'est compté qu'une fois
+    count = email_filter.stats()['emails']
+    email_filter.email_taken('autre@example.com')
+    assert email_filter.stats()['emails'] == count == 3
+
+
+def test_unchanged_email_keeps_its_marker(app, make_user):
+    user = make_user('alice')
+    changed_at = user.email_changed_at
+
+    user.email = 'alice@example.com'
+    db.session.commit()
+
+    assert user.email_changed_at == changed_at
@@ -0,0 +1,60 @@
+from app.extensions import db
+from app.models import Actor, Director, Genre, Movie, Review
+
+
+def add_movie():
+    movie = Movie(title='Quai des brumes', director=Director(name='Marcel Carné'))
+    db.session.add(movie)
+    movie.actors = [Actor(name='Jean Gabin')]
+    movie.genres = [Genre(name='Drame')]
+    db.session.commit()
+    return movie.id
+
+
+def revalidate(client, url, etag):
+    return client.get(url, headers={'If-None-Match': etag}).status_code
+
+
+def test_catalog_etag_follows_names_and_composition(client):
+    movie_id = add_movie()
+    url = '/movies/search?actor=gabin'
+    etag = client.get(url).headers['ETag']
+    assert revalidate(client, url, etag) == 304
+
+    # Chaque modification affichée avec le film change l'ETag, même dans la même seconde
+    changes = [
+        lambda movie: setattr(movie.director, 'name', 'M. Carné'),
+        lambda movie: setattr(movie.actors[0], 'name', 'Jean Gabin (Jean Moncorgé)'),
+        lambda movie: setattr(movie.genres[0], 'name', 'Drame romantique'),
+        lambda movie: movie.actors.append(Actor(name='Michèle Morgan')),
+        lambda movie: movie.genres.remove(movie.genres[0])
+    ]
+    for change in changes:
+        change(db.session.get(Movie, movie_id))
+        db.session.commit()
+        assert revalidate(client, url, etag) == 200
+        etag = client.get(url).headers['ETag']
+
+
+def test_review_etag_follows_author_username(client, make_user, auth_headers):
+    movie_id = add_movie()
+    user = make_user()
+    db.session.add(Review(user_id=user.id, movie_id=movie_id, review_text='Superbe', rating=5))
+    db.session.commit()
+    url = f'/reviews/{movie_id}'
+    etag = client.get(url).headers['ETag']
+
+    client.put('/auth/update_profile', json={'username': 'alice2'}, headers=auth_headers(user))
+
+    assert revalidate(client, url, etag) == 200
+
+
+def test_only_the_etag_validates(client):
+    add_movie()
+    response = client.get('/movies/search?q=')
+
+    assert 'Last-Modified' not in response.headers
+    # If-Modified-Since seul : jamais de 304 sur une date à la seconde près
+    assert client.get('/movies/search?q=', headers={
+        'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT'
+    }).status_code == 200
@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import func
+from app.extensions import db
+from app.models import Favorite, Like, Movie, Rating, Recommendation, Review, Watchlist
+from app.models.actor import movie_actors
+from app.models.genre import movie_genres
+
+
+def query_plan(statement):
+    """Détail de EXPLAIN QUERY PLAN (SQLite) pour une requête SQLAlchemy"""
+    sql = str(statement.compile(db.engine, compile_kwargs={'literal_binds': True}))
+    return ' | '.join(row[-1] for row in db.session.execute(db.text(f'EXPLAIN QUERY PLAN {sql}')))
+
+
+# Requêtes des routes like, rating, review, watchlist, favorite et des agrégats par film
+USER_MOVIE_MODELS = [Rating, Like, Review, Watchlist, Favorite]
+
+
+@pytest.mark.parametrize('model', USER_MOVIE_MODELS, ids=lambda model: model.__tablename__)
+def test_user_movie_lookup_uses_index(app, model):
+    plan = query_plan(db.select(model.id).where(model.user_id == 1, model.movie_id == 2))
+    assert 'USING INDEX' in plan or 'USING COVERING INDEX' in plan, plan
+    assert 'user_id=? AND movie_id=?' in plan, plan
+
+
+@pytest.mark.parametrize('model', USER_MOVIE_MODELS, ids=lambda model: model.__tablename__)
+def test_movie_aggregate_uses_index(app, model):
+    plan = query_plan(db.select(func.count(model.id)).where(model.movie_id == 2))
+    assert f'ix_{model.__tablename__}_movie_id' in plan, plan
+
+
+def test_recommendations_by_user_are_read_in_score_order(app):
+    plan = query_plan(
+        db.select(Recommendation.movie_id)
+        .where(Recommendation.user_id == 1)
+        .order_by(Recommendation.score.desc())
+    )
+    assert 'ix_recommendations_user_id_score' in plan, plan
+    assert 'TEMP B-TREE' not in plan, plan
+
+
+@pytest.mark.parametrize('table, column, index', [
+    (movie_genres, 'genre_id', 'ix_movie_genres_genre_id'),
+    (movie_actors, 'actor_id', 'ix_movie_actors_actor_id'),
+    (Movie.__table__, 'director_id', 'ix_movies_director_id'),
+])
+def test_foreign_key_lookup_uses_index(app, table, column, index):
+    plan = query_plan(db.select(func.count()).select_from(table).where(table.c[column] == 1))
+    assert index in plan, plan
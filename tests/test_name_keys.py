@@ -0,0 +1,35 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db
+from app.models import Actor, Director, Genre, Movie
+from app.services.catalog_import_service import CatalogImporter
+
+
+def test_homonyms_can_coexist(app):
+    db.session.add_all([Actor(name='Michel Simon'), Actor(name='Michel  Simon', bio='Homonyme')])
+    db.session.add_all([Director(name='Jean Renoir'), Director(name='jean renoir')])
+    db.session.commit()
+
+    assert Actor.query.filter_by(name_key='MICHELSIMON').count() == 2
+    assert Director.query.filter_by(name_key='JEANRENOIR').count() == 2
+
+
+def test_genre_keys_stay_unique(app):
+    db.session.add_all([Genre(name='Drame'), Genre(name='drame')])
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
+
+
+def test_import_reuses_oldest_homonym(app, tmp_path):
+    oldest = Director(name='Jean Renoir')
+    db.session.add(oldest)
+    db.session.commit()
+    db.session.add(Director(name='Jean Renoir', bio='Homonyme'))
+    db.session.commit()
+
+    path = tmp_path / 'catalog.csv'
+    path.write_text('title,director\nLa Règle du jeu,Jean Renoir\n', encoding='utf-8')
+    CatalogImporter().import_file(str(path))
+
+    assert Movie.query.one().director_id == oldest.id
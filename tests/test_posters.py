@@ -0,0 +1,32 @@
+import os
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+
+
+@pytest.fixture
+def posters(app, tmp_path, monkeypatch):
+    # Dossier des affiches relatif au répertoire courant, comme en production
+    monkeypatch.chdir(tmp_path)
+    folder = tmp_path / 'static' / 'posters'
+    folder.mkdir(parents=True)
+    Image.new('RGB', (1000, 1500)).save(folder / 'a1b2c3d4e5f6_affiche.jpg')
+    return folder
+
+
+def test_variant_is_created_on_demand(client, posters):
+    response = client.get('/static/posters/a1b2c3d4e5f6_affiche.jpg?w=200')
+
+    assert response.status_code == 200
+    assert (posters / 'a1b2c3d4e5f6_affiche.w342.jpg').is_file()
+    assert Image.open(posters / 'a1b2c3d4e5f6_affiche.w342.jpg').width == 342
+
+
+def test_path_traversal_is_refused_without_writing(client, posters, tmp_path):
+    outside = tmp_path / 'secret.jpg'
+    Image.new('RGB', (1000, 1500)).save(outside)
+    before = sorted(os.listdir(tmp_path))
+
+    for url in ('/static/posters/..%2F..%2Fsecret.jpg?w=200', '/static/posters/../../secret.jpg?w=200'):
+        assert client.get(url).status_code == 404
+    assert sorted(os.listdir(tmp_path)) == before
@@ -0,0 +1,170 @@
+import pytest
+from app.extensions import db
+from app.models import Director, Genre, Like, Movie, Rating, Review, UserNeighborDirty, UserProfile
+from app.services.recommendation_service import RecommendationService
+
+
+@pytest.fixture
+def catalog(app, make_user):
+    director = Director(name='Jacques Tati')
+    movies = [Movie(title=title, director=director) for title in ('Playtime', 'Mon oncle', 'Trafic')]
+    db.session.add_all(movies)
+    fan = make_user('fan')
+    # Popularité décroissante : Playtime, Mon oncle, Trafic
+    for movie, rating in zip(movies, (5, 4, 3)):
+        db.session.add(Rating(user_id=fan.id, movie_id=movie.id, rating=rating))
+    db.session.add(Like(user_id=fan.id, movie_id=movies[0].id))
+    db.session.commit()
+    return [movie.id for movie in movies]
+
+
+def test_cold_start_fallback_skips_seen_movies(catalog, make_user):
+    user = make_user('newcomer')
+    service = RecommendationService()
+    assert [movie_id for movie_id, _ in service.recommend(user.id, n_recommendations=2)] == catalog[:2]
+
+    db.session.add(Rating(user_id=user.id, movie_id=catalog[0], rating=4))
+    db.session.commit()
+
+    # Liste de repli servie depuis le cache, filtrée par utilisateur
+    assert service.is_cold_start(user.id)
+    assert [movie_id for movie_id, _ in service.recommend(user.id, n_recommendations=2)] == catalog[1:]
+
+
+def test_cold_start_fallback_on_snapshot_skips_seen_movies(catalog, make_user):
+    user = make_user('newcomer')
+    db.session.add(Like(user_id=user.id, movie_id=catalog[0]))
+    db.session.commit()
+    service = RecommendationService()
+
+    recommendations = service.recommend(user.id, n_recommendations=3, data=service.load_data())
+    assert [movie_id for movie_id, _ in recommendations] == catalog[1:]
+
+
+def test_preferences_read_does_not_persist_missing_profile(client, make_user, auth_headers):
+    movie = Movie(title='Les Vacances de M. Hulot', director=Director(name='Jacques Tati'))
+    movie.genres = [Genre(name='Comédie')]
+    user = make_user('hulot')
+    db.session.add(movie)
+    db.session.flush()
+    db.session.add(Rating(user_id=user.id, movie_id=movie.id, rating=5))
+    db.session.add(Review(user_id=user.id, movie_id=movie.id, review_text='Délicieux', rating=5))
+    db.session.commit()
+    movie_id, headers = movie.id, auth_headers(user)
+
+    body = client.get('/recommendations/user-preferences', headers=headers).get_json()
+    assert body['preferences']['top_genres'] == {'Comédie': 0.7}
+    assert body['total_interactions'] == 1
+    assert UserProfile.query.count() == 0
+
+    # Le chemin d'écriture enregistre le profil
+    assert client.post(f'/likes/{movie_id}', headers=headers).status_code == 201
+    assert UserProfile.query.count() == 1
+
+
+def add_movies(count, director, genre, title='Film'):
+    movies = [Movie(title=f'{title} {index}', director=director) for index in range(count)]
+    for movie in movies:
+        movie.genres = [genre]
+    db.session.add_all(movies)
+    db.session.flush()
+    return [movie.id for movie in movies]
+
+
+def add_fan(make_user, username, movie_ids):
+    user = make_user(username)
+    for movie_id in movie_ids:
+        db.session.add(Rating(user_id=user.id, movie_id=movie_id, rating=5))
+        db.session.add(Like(user_id=user.id, movie_id=movie_id))
+    return user.id
+
+
+def test_pipeline_queries_do_not_grow_with_catalog_or_interactions(app, make_user, count_queries):
+    director, genre = Director(name='Jean Renoir'), Genre(name='Drame')
+    seen = add_movies(3, director, genre)
+    other = add_movies(1, Director(name='Marcel Carné'), genre, 'Autre')
+    user_id = add_fan(make_user, 'alice', seen)
+    add_fan(make_user, 'bob', seen + other)
+    db.session.commit()
+    service = RecommendationService()
+    service.profiles.rebuild(user_id)
+    service.refresh_user_neighbors(all_users=True)
+
+    def run():
+        count_queries.clear()
+        recommendations = service.recommend(user_id)
+        return recommendations, list(count_queries)
+
+    recommendations, small = run()
+    assert recommendations[0][0] == other[0]
+
+    # Catalogue et interactions bien plus grands : même nombre de requêtes, aucune lecture complète
+    more = add_movies(200, director, genre, 'Nouveau')
+    for index in range(20):
+        add_fan(make_user, f'user{index}', more[index::20])
+    db.session.commit()
+    recommendations, large = run()
+
+    assert len(recommendations) == 10
+    assert len(large) == len(small)
+    for statement in large:
+        if any(f'FROM {table}' in statement for table in ('ratings', 'reviews', 'likes')):
+            assert 'WHERE' in statement, statement
+
+
+def test_mark_written_during_neighbor_refresh_is_kept(client, catalog, make_user, auth_headers):
+    user = make_user('latecomer')
+    user_id, headers = user.id, auth_headers(user)
+    client.post(f'/likes/{catalog[0]}', headers=headers)
+    service = RecommendationService()
+    load_data = service.load_data
+
+    def load_data_during_new_like():
+        # Marquage lu, puis nouvelle interaction avant le chargement des données
+        client.post(f'/likes/{catalog[1]}', headers=headers)
+        return load_data()
+
+    service.load_data = load_data_during_new_like
+    service.refresh_user_neighbors()
+    db.session.expire_all()
+    assert db.session.get(UserNeighborDirty, user_id).mark_count == 2
+
+    service.load_data = load_data
+    service.refresh_user_neighbors()
+    assert db.session.get(UserNeighborDirty, user_id) is None
+
+
+def stored_profile(user_id):
+    db.session.expire_all()
+    profile = db.session.get(UserProfile, user_id)
+    return profile.genre_weights, profile.keyword_counts
+
+
+def built_profile(user_id):
+    profile = RecommendationService().profiles._build(user_id)
+    return ({genre: weight for genre, weight in profile['genres'].items() if weight},
+            {word: count for word, count in profile['keywords'].items() if count})
+
+
+def test_incremental_profile_removes_what_the_movie_added(client, make_user, auth_headers):
+    movie = Movie(title='Le Jour se lève', director=Director(name='Marcel Carné'))
+    movie.genres = [Genre(name='Drame')]
+    db.session.add(movie)
+    db.session.commit()
+    user = make_user()
+    movie_id, user_id, headers = movie.id, user.id, auth_headers(user)
+
+    client.post(f'/likes/{movie_id}', headers=headers)
+    client.post('/ratings/', json={'movie_id': movie_id, 'rating': 5}, headers=headers)
+    client.post('/reviews/', json={'movie_id': movie_id, 'review_text': 'great film', 'rating': 5}, headers=headers)
+    assert stored_profile(user_id)[1] == {'great': 1, 'film': 1}
+
+    client.put(f'/reviews/{movie_id}', json={'review_text': 'boring', 'rating': 5}, headers=headers)
+    assert stored_profile(user_id) == built_profile(user_id) == ({'Drame': 1.0}, {'boring': 1})
+
+    # Genre modifié puis avis supprimé : la contribution enregistrée est retirée, pas l'actuelle
+    db.session.get(Movie, movie_id).genres[0].name = 'Drame romantique'
+    db.session.commit()
+    client.delete(f'/reviews/{movie_id}', headers=headers)
+    assert stored_profile(user_id) == built_profile(user_id)
+    assert stored_profile(user_id)[0] == {'Drame romantique': 0.7}
@@ -0,0 +1,95 @@
+import pytest
+from app.extensions import db
+from app.models import Role, User
+from app.utils.security import RoleClaimsCache, role_cache
+
+
+@pytest.fixture
+def admin_headers(make_user, auth_headers):
+    return auth_headers(make_user('root', role='admin'))
+
+
+def assign(client, headers, user_id, role):
+    response = client.post('/roles/assign', json={'user_id': user_id, 'role': role}, headers=headers)
+    assert response.status_code == 200
+
+
+def test_demoted_admin_is_refused_on_every_worker(client, make_user, auth_headers, admin_headers):
+    make_user('nobody')  # crée le rôle 'user'
+    promoted = make_user('bob', role='admin')
+    old_headers = auth_headers(promoted)
+    assert client.get('/recommendations/admin/stats', headers=old_headers).status_code == 200
+
+    assign(client, admin_headers, promoted.id, 'user')
+    assert client.get('/recommendations/admin/stats', headers=old_headers).status_code == 403
+
+    # Autre processus : rien n'est connu de la rétrogradation
+    role_cache._known.clear()
+    assert client.get('/recommendations/admin/stats', headers=old_headers).status_code == 403
+
+
+def test_other_worker_applies_demotion_within_max_age(app, make_user, count_queries):
+    make_user('nobody')
+    admin = make_user('bob', role='admin')
+    admin_id = admin.id
+    claims = {'sub': str(admin_id), 'role': 'admin', 'role_version': 0}
+    cache = RoleClaimsCache()
+    assert cache.current_role(claims) == 'admin'
+
+    # Rétrogradation faite par un autre processus
+    admin.role = Role.query.filter_by(name='user').one()
+    admin.role_version = 1
+    db.session.commit()
+
+    count_queries.clear()
+    assert cache.current_role(claims) == 'admin'  # version connue encore fraîche
+    assert count_queries == []
+    app.config['ROLE_CLAIMS_MAX_AGE'] = 0
+    assert cache.current_role(claims) == 'user'
+
+
+def test_repromoted_user_with_new_token_is_accepted(client, make_user, auth_headers, admin_headers):
+    make_user('nobody')
+    user = make_user('bob', role='admin')
+    assign(client, admin_headers, user.id, 'user')
+    assign(client, admin_headers, user.id, 'admin')
+
+    db.session.expire_all()
+    new_headers = auth_headers(db.session.get(User, user.id))
+    assert client.get('/recommendations/admin/stats', headers=new_headers).status_code == 200
+
+
+def test_token_at_known_version_needs_no_query(app, make_user, count_queries):
+    user = make_user('bob')
+    cache = RoleClaimsCache()
+    cache.remember(user.id, 3, 'user')
+    count_queries.clear()
+
+    assert cache.current_role({'sub': str(user.id), 'role': 'editor', 'role_version': 4}) == 'editor'
+    assert cache.current_role({'sub': str(user.id), 'role': 'user', 'role_version': 3}) == 'user'
+    # Rôle privilégié : même règle, pas de lecture par requête
+    assert cache.current_role({'sub': str(user.id), 'role': 'admin', 'role_version': 4}) == 'admin'
+    assert count_queries == []
+    # Token antérieur à la version connue : le rôle connu l'emporte
+    assert cache.current_role({'sub': str(user.id), 'role': 'editor', 'role_version': 2}) == 'user'
+
+
+def test_unknown_user_version_is_read_from_database(app, make_user, count_queries):
+    user = make_user('bob')
+    user.role_version = 5
+    db.session.commit()
+    user_id = user.id
+    cache = RoleClaimsCache()
+    count_queries.clear()
+
+    # Token antérieur au dernier changement de rôle (version 5 en base)
+    assert cache.current_role({'sub': str(user_id), 'role': 'editor', 'role_version': 4}) == 'user'
+    assert len(count_queries) == 1
+
+
+def test_cache_is_bounded(app):
+    app.config['ROLE_CLAIMS_CACHE_SIZE'] = 2
+    cache = RoleClaimsCache()
+    for user_id in (1, 2, 3):
+        cache.remember(user_id, 0, 'user')
+    assert list(cache._known) == [2, 3]
@@ -0,0 +1,137 @@
+import os
+import pytest
+from sqlalchemy import inspect
+from app import create_app
+from app.extensions import db
+from app.models import Actor, Director, Genre, Movie
+from app.services.search_service import SearchService
+
+
+def add_movie(title, description='', director='Jean Renoir', genres=(), actors=()):
+    director_row = Director.query.filter_by(name=director).first() or Director(name=director)
+    movie = Movie(title=title, description=description, director=director_row)
+    db.session.add(movie)
+    movie.genres = [Genre.query.filter_by(name=name).first() or Genre(name=name) for name in genres]
+    movie.actors = [Actor.query.filter_by(name=name).first() or Actor(name=name) for name in actors]
+    db.session.flush()
+    return movie
+
+
+def fts_exists():
+    return SearchService.FTS_TABLE in inspect(db.engine).get_table_names()
+
+
+def test_fts_table_created_on_first_use(app):
+    service = SearchService()
+    assert not fts_exists()
+
+    service.search('anything')
+    db.session.commit()
+    assert fts_exists()
+
+
+def test_fts_table_recreated_after_external_drop(app):
+    service = SearchService()
+    movie = add_movie('Toni')
+    service.index_movie_ids([movie.id])
+    db.session.commit()
+
+    # Table supprimée par un autre processus : recréée au prochain usage
+    db.session.execute(db.text(f"DROP TABLE {SearchService.FTS_TABLE}"))
+    db.session.commit()
+    assert service.search('toni').total == 0
+    service.index_movie_ids([movie.id])
+    db.session.commit()
+    assert service.search('toni').total == 1
+
+
+def test_search_ranks_title_matches_first(app):
+    service = SearchService()
+    in_description = add_movie('La Chienne', description='Un caissier et un voyou')
+    in_title = add_movie('Le Voyou')
+    add_movie('Toni', description='Un drame paysan')
+    service.index_movie_ids([in_description.id, in_title.id])
+    db.session.commit()
+
+    results = service.search('voyou')
+    # Le titre, plus court que la description, l'emporte au classement BM25
+    assert [movie.id for movie in results.items] == [in_title.id, in_description.id]
+
+
+def test_search_matches_people_prefixes_and_accents(app):
+    service = SearchService()
+    movie = add_movie('La Grande Illusion', genres=['Guerre'], actors=['Jean Gabin'])
+    add_movie('Boudu sauvé des eaux', actors=['Michel Simon'])
+    service.index_movie_ids([movie.id])
+    db.session.commit()
+
+    assert [m.id for m in service.search('gab').items] == [movie.id]
+    assert [m.id for m in service.search('guérre').items] == [movie.id]
+    # Syntaxe FTS5 saisie par l'utilisateur : jamais interprétée
+    assert service.search('gabin" (*').total == 1
+    assert service.search('!!!').total == 0
+
+
+def test_search_endpoint_is_paginated(client):
+    service = SearchService()
+    movies = [add_movie(f'Western {index}') for index in range(5)]
+    service.index_movie_ids([movie.id for movie in movies])
+    db.session.commit()
+
+    response = client.get('/movies/search?q=western&page=2&per_page=2')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['pagination'] == {'total': 5, 'pages': 3, 'current_page': 2, 'per_page': 2}
+    assert [movie['title'] for movie in body['movies']] == ['Western 2', 'Western 3']
+
+    last = client.get('/movies/search?q=western&page=3&per_page=2').get_json()
+    assert [movie['title'] for movie in last['movies']] == ['Western 4']
+
+
+def test_search_filters_without_text(client):
+    add_movie('French Cancan', director='Jean Renoir', genres=['Comédie musicale'], actors=['Jean Gabin'])
+    add_movie('Les Enfants du paradis', director='Marcel Carné', genres=['Drame'], actors=['Arletty'])
+    db.session.commit()
+
+    # Sous-chaîne du nom, sans tenir compte des accents, de la casse ni des espaces
+    for director in ('renoir', 'jean ren', 'noi'):
+        body = client.get(f'/movies/search?director={director}').get_json()
+        assert [movie['title'] for movie in body['movies']] == ['French Cancan']
+    body = client.get('/movies/search?director=carne').get_json()
+    assert [movie['title'] for movie in body['movies']] == ['Les Enfants du paradis']
+    body = client.get('/movies/search?director=renoir jean').get_json()
+    assert body['movies'] == []
+    body = client.get('/movies/search?actor=gabin').get_json()
+    assert [movie['title'] for movie in body['movies']] == ['French Cancan']
+    body = client.get('/movies/search?genre=drame').get_json()
+    assert [movie['title'] for movie in body['movies']] == ['Les Enfants du paradis']
+
+
+@pytest.fixture
+def postgresql_app():
+    url = os.getenv('TEST_POSTGRESQL_URL')
+    if not url:
+        pytest.skip("TEST_POSTGRESQL_URL non défini (chemin tsvector)")
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': url})
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_tsvector_search_ranks_and_paginates(postgresql_app):
+    service = SearchService()
+    in_description = add_movie('La Chienne', description='Un caissier et un voyou')
+    in_title = add_movie('Le Voyou')
+    others = [add_movie(f'Voyou {index}', description='voyou voyou') for index in range(3)]
+    for movie in [in_description, in_title, *others]:
+        service.index_movie(movie)
+    db.session.commit()
+
+    results = service.search('voyou', per_page=2)
+    assert results.total == 5
+    # Poids A (titre) avant C (description)
+    assert in_description.id not in [movie.id for movie in results.items]
+    assert service.search('voyou', page=3, per_page=2).items[-1].id == in_description.id
@@ -0,0 +1,46 @@
+import pytest
+
+CONTENT = bytes(range(100))
+
+
+@pytest.fixture
+def video(app, tmp_path):
+    folder = tmp_path / 'videos'
+    folder.mkdir()
+    (folder / 'a1b2c3d4e5f6_film.mp4').write_bytes(CONTENT)
+    app.config['VIDEO_UPLOAD_FOLDER'] = str(folder)
+    return '/static/videos/a1b2c3d4e5f6_film.mp4'
+
+
+def test_videos_are_served_from_the_configured_folder(client, video):
+    response = client.get(video)
+
+    assert response.status_code == 200
+    assert response.data == CONTENT
+    assert response.headers['Accept-Ranges'] == 'bytes'
+    assert 'immutable' in response.headers['Cache-Control']
+    assert client.get('/static/videos/absent.mp4').status_code == 404
+
+
+def test_range_requests_return_the_requested_bytes(client, video):
+    response = client.get(video, headers={'Range': 'bytes=10-19'})
+    assert response.status_code == 206
+    assert response.headers['Content-Range'] == 'bytes 10-19/100'
+    assert response.data == CONTENT[10:20]
+
+    # Déplacement vers la fin de la vidéo
+    tail = client.get(video, headers={'Range': 'bytes=-5'})
+    assert (tail.status_code, tail.headers['Content-Range'], tail.data) == (206, 'bytes 95-99/100', CONTENT[95:])
+
+    assert client.get(video, headers={'Range': 'bytes=200-'}).status_code == 416
+
+
+def test_conditional_and_if_range_requests(client, video):
+    etag = client.get(video).headers['ETag']
+
+    assert client.get(video, headers={'If-None-Match': etag}).status_code == 304
+    # If-Range périmé : fichier complet plutôt qu'une plage incohérente
+    stale = client.get(video, headers={'Range': 'bytes=0-9', 'If-Range': '"autre"'})
+    assert (stale.status_code, stale.data) == (200, CONTENT)
+    fresh = client.get(video, headers={'Range': 'bytes=0-9', 'If-Range': etag})
+    assert (fresh.status_code, fresh.data) == (206, CONTENT[:10])
@@ -0,0 +1,141 @@
+import hashlib
+import io
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+import pytest
+from app.extensions import db
+from app.models import VideoUpload
+from app.services.upload_service import upload_service
+
+CONTENT = b'0123456789'
+
+
+@pytest.fixture
+def folder(app, tmp_path):
+    folder = tmp_path / 'videos'
+    app.config['VIDEO_UPLOAD_FOLDER'] = str(folder)
+    return folder
+
+
+@pytest.fixture
+def headers(make_user, auth_headers):
+    return auth_headers(make_user())
+
+
+def initiate(client, headers, size=len(CONTENT)):
+    return client.post('/uploads/', json={'filename': 'film.mp4', 'size': size}, headers=headers)
+
+
+def put(client, headers, upload_id, offset, data):
+    return client.put(f'/uploads/{upload_id}?offset={offset}', data=data,
+                      headers={**headers, 'Content-Type': 'application/octet-stream'})
+
+
+def test_resumable_upload_is_hashed_and_moved(client, folder, headers):
+    upload_id = initiate(client, headers).get_json()['upload_id']
+
+    assert put(client, headers, upload_id, 0, CONTENT[:6]).get_json()['received_size'] == 6
+    conflict = put(client, headers, upload_id, 0, CONTENT[:6])
+    assert (conflict.status_code, conflict.get_json()['expected_offset']) == (409, 6)
+    put(client, headers, upload_id, 6, CONTENT[6:])
+
+    body = client.post(f'/uploads/{upload_id}/complete', headers=headers).get_json()
+    assert body['status'] == 'completed'
+    assert body['sha256'] == hashlib.sha256(CONTENT).hexdigest()
+    assert (folder / os.path.basename(body['video_path'])).read_bytes() == CONTENT
+    assert not (folder / f'{upload_id}.part').exists()
+
+
+def test_size_must_be_a_real_integer(client, folder, headers):
+    assert initiate(client, headers, size=True).status_code == 400
+    assert initiate(client, headers, size='10').status_code == 400
+
+
+class BlockingStream(io.BytesIO):
+    """Flux de requête qui s'arrête après le premier bloc jusqu'à `release`"""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def _wait(self):
+        if self.tell():
+            self.started.set()
+            self.release.wait(5)
+
+    def read(self, size=-1):
+        self._wait()
+        return super().read(3 if size < 0 else min(size, 3))
+
+    def readinto(self, buffer):
+        self._wait()
+        return super().readinto(memoryview(buffer)[:3])
+
+
+def test_part_in_progress_holds_no_row_lock(app, client, folder, headers):
+    upload_id = initiate(client, headers).get_json()['upload_id']
+    stream = BlockingStream(CONTENT)
+    responses = []
+
+    def send():
+        with app.app_context():
+            responses.append(app.test_client().put(
+                f'/uploads/{upload_id}?offset=0', input_stream=stream,
+                headers={**headers, 'Content-Type': 'application/octet-stream',
+                         'Content-Length': str(len(CONTENT))}
+            ))
+
+    writer = threading.Thread(target=send)
+    writer.start()
+    assert stream.started.wait(5)
+
+    # Pendant la copie : lecture et écriture possibles, second morceau refusé
+    assert client.get(f'/uploads/{upload_id}', headers=headers).get_json()['received_size'] == 0
+    db.session.execute(db.update(VideoUpload).where(VideoUpload.id == upload_id).values(filename='film.mp4'))
+    db.session.commit()
+    concurrent = put(client, headers, upload_id, 0, CONTENT)
+    assert concurrent.status_code == 409
+
+    stream.release.set()
+    writer.join(5)
+    assert responses[0].get_json()['received_size'] == len(CONTENT)
+
+
+def test_interrupted_move_is_finished_on_retry(app, client, folder, headers, monkeypatch):
+    upload_id = initiate(client, headers).get_json()['upload_id']
+    put(client, headers, upload_id, 0, CONTENT)
+    user_id = VideoUpload.query.get(upload_id).user_id
+
+    def failing_replace(source, target):
+        raise OSError("disque plein")
+
+    monkeypatch.setattr(os, 'replace', failing_replace)
+    with pytest.raises(OSError):
+        upload_service.complete(upload_id, user_id)
+    monkeypatch.undo()
+
+    # L'envoi est validé ; un nouvel appel termine le renommage
+    db.session.expire_all()
+    assert VideoUpload.query.get(upload_id).status == 'completed'
+    upload = upload_service.complete(upload_id, user_id)
+    assert (folder / os.path.basename(upload.video_path)).read_bytes() == CONTENT
+
+
+def test_purge_removes_stale_uploads_and_orphan_parts(app, client, folder, headers):
+    stale_id = initiate(client, headers).get_json()['upload_id']
+    fresh_id = initiate(client, headers).get_json()['upload_id']
+    db.session.execute(db.update(VideoUpload).where(VideoUpload.id == stale_id)
+                       .values(updated_at=datetime.utcnow() - timedelta(days=2)))
+    db.session.commit()
+    old = time.time() - 2 * 24 * 3600
+    os.utime(folder / f'{stale_id}.part', (old, old))
+    orphan = folder / 'orphelin.part'
+    orphan.write_bytes(b'x')
+    os.utime(orphan, (old, old))
+
+    assert upload_service.purge_stale() == {'uploads': 1, 'files': 2}
+    assert [upload.id for upload in VideoUpload.query] == [fresh_id]
+    assert sorted(os.listdir(folder)) == [f'{fresh_id}.part']
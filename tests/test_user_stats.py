@@ -0,0 +1,72 @@
+from app.extensions import db
+from app.models import Director, Movie, UserStats
+from app.services.user_stats_service import user_stats_service
+
+
+def make_movies(count):
+    director = Director(name='Jean Renoir')
+    movies = [Movie(title=f'Film {index}', director=director) for index in range(count)]
+    db.session.add_all(movies)
+    db.session.commit()
+    return [movie.id for movie in movies]
+
+
+def stored_counters(user_id):
+    db.session.expire_all()
+    stats = db.session.get(UserStats, user_id)
+    return stats.rating_count, stats.rating_sum, stats.like_count, stats.review_count
+
+
+def test_counters_follow_each_write_and_match_a_full_recount(client, make_user, auth_headers):
+    user = make_user()
+    user_id, headers = user.id, auth_headers(user)
+    first, second, third = make_movies(3)
+
+    client.post('/ratings/', json={'movie_id': first, 'rating': 4}, headers=headers)
+    assert stored_counters(user_id) == (1, 4, 0, 0)
+
+    # Nouvelle note sur le même film : seul l'écart est ajouté à la somme
+    client.post('/ratings/', json={'movie_id': first, 'rating': 2}, headers=headers)
+    assert stored_counters(user_id) == (1, 2, 0, 0)
+
+    client.post(f'/likes/{second}', headers=headers)
+    client.post(f'/likes/{second}', headers=headers)  # déjà liké : rien ne change
+    assert stored_counters(user_id) == (1, 2, 1, 0)
+    client.delete(f'/likes/{second}', headers=headers)
+    assert stored_counters(user_id) == (1, 2, 0, 0)
+
+    client.post('/reviews/', json={'movie_id': third, 'review_text': 'Superbe', 'rating': 5}, headers=headers)
+    client.put(f'/reviews/{third}', json={'review_text': 'Très beau', 'rating': 4}, headers=headers)
+    assert stored_counters(user_id) == (1, 2, 0, 1)
+
+    client.post('/interactions/batch', json={'interactions': [
+        {'type': 'rating', 'movie_id': first, 'rating': 5},
+        {'type': 'rating', 'movie_id': second, 'rating': 3},
+        {'type': 'like', 'movie_id': third}
+    ]}, headers=headers)
+    assert stored_counters(user_id) == (2, 8, 1, 1)
+
+    client.delete(f'/reviews/{third}', headers=headers)
+    counters = stored_counters(user_id)
+    assert counters == (2, 8, 1, 0)
+
+    user_stats_service.recount(user_id)
+    db.session.commit()
+    assert stored_counters(user_id) == counters
+
+
+def test_stats_read_does_not_create_the_row(client, make_user, auth_headers):
+    user = make_user()
+    user_id, headers = user.id, auth_headers(user)
+    movie_id, = make_movies(1)
+    client.post('/ratings/', json={'movie_id': movie_id, 'rating': 3}, headers=headers)
+    db.session.delete(db.session.get(UserStats, user_id))
+    db.session.commit()
+
+    response = client.get('/recommendations/stats', headers=headers)
+
+    assert response.json['stats'] == {
+        'total_ratings': 1, 'total_likes': 0, 'total_reviews': 0, 'avg_rating_given': 3.0
+    }
+    db.session.expire_all()
+    assert db.session.get(UserStats, user_id) is None